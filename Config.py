@@ -35,6 +35,14 @@ class Bot():
     def max_cached_users():
         return 1000
 
+    # File where users locales are stored between restarts (SQLite)
+    def locales_db():
+        return "./locales.db"
+
+    # How often (in seconds) changed users locales are written to the locales file
+    def locales_flush_interval():
+        return 60
+
     # 0 - No actions will be logged
     # 1 - Actions will be logged to console only
     # 2 - Actions will be logged to txt file in ./logs/{time}.txt
@@ -42,40 +50,62 @@ class Bot():
     def logs_lvl():
         return 3
 
-    # Descriptions for all commands (Displayed in help command)
+    # Format of the logs file. Can be set to text (text) or json lines (json).
+    # Only json logs can be searched with the "logs" owner command.
+    def logs_format():
+        return "text"
+
+    # Max amount of log lines which are kept in memory before being written to the logs file
+    def logs_buffer_size():
+        return 100
+
+    # Max time (in seconds) log lines can stay in memory before being written to the logs file
+    def logs_flush_interval():
+        return 2
+
+    # Share of logs (from 0 to 1) which will be written for "{module}/{type}" category.
+    # Categories which are not listed are always written. Errors and tracebacks are never sampled.
+    def logs_sampling():
+        return {
+            "MUSIC/COMMAND": 1,
+            "MUSIC/SLASH-COMMAND": 1,
+            "MUSIC/INTERACTION": 1
+        }
+
+    # Max amount of logs per second and burst size for "{module}/{type}" category.
+    # Categories which are not listed are not limited. Errors and tracebacks are never limited.
+    def logs_rate_limits():
+        return {
+            "MUSIC/COMMAND": [20, 100],
+            "MUSIC/SLASH-COMMAND": [20, 100],
+            "MUSIC/INTERACTION": [10, 50]
+        }
+
+    # How often (in seconds) summary of repeated tracebacks and suppressed logs is written to the logs
+    def logs_summary_interval():
+        return 300
+
+    # Logs file is closed and compressed when it becomes bigger than this size (in bytes). 0 - never
+    def logs_max_file_size():
+        return 5000000
+
+    # Logs file is closed and compressed when it becomes older than this time (in seconds). 0 - never
+    def logs_rotate_interval():
+        return 86400
+
+    # Max amount of compressed logs files stored in ./logs. 0 - unlimited
+    def logs_keep_files():
+        return 30
+
+    # Max total size of compressed logs files stored in ./logs (in bytes). 0 - unlimited
+    def logs_keep_bytes():
+        return 100000000
+
+    # Descriptions for all commands (Displayed in help command).
+    # Stored in the localization catalog - Data/Localizations/Catalog/{language}.json
     def commands(language: str):
-        if language == "ru":
-            return [
-                ["ping", "Текущий пинг бота"],
-                ["help", "Вы сейчас тут"],
-                ["play", "Включить или добавить трек в очередь"],
-                ["stop", "Остановить плеер, отключить бота от ГК"],
-                ["loop", "Зациклить текущий трек"],
-                ["skip", "Пропустить трек"],
-                ["queue", "Просмотр очереди треков"],
-                ["pause", "Остановить проигрывание"],
-                ["status", "Информация о текущем статусе бота"],
-                ["volume", "Изменить громкость плеера"],
-                ["resume", "Возобновить проигрывание"],
-                ["replay", "Проиграть текущий трек заново"],
-                ["previous", "Включить предыдущий трек"]
-            ]
-        else:
-            return [
-                ["ping", "Current Sanya's ping"],
-                ["help", "You are here right now"],
-                ["play", "Play or add track to the queue"],
-                ["stop", "Stop player, disconnect bot from VC"],
-                ["loop", "Loop current track"],
-                ["skip", "Skip track"],
-                ["queue", "View current tracks queue"],
-                ["pause", "Pause playback"],
-                ["status", "Info about current bot status"],
-                ["volume", "Change player volume"],
-                ["resume", "Resume playback"],
-                ["replay", "Replay track"],
-                ["previous", "Play previous track"]
-            ]
+        from Data.Localizations import Catalog
+        return Catalog.commands(language)
 
     # You can change bot prefix here.
     def prefix():
@@ -91,6 +121,88 @@ class Icons():
     def empty():
         return "https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=439&height=439"
 
+
+class Music():
+    # Max amount of search results which are stored in cache at the same time
+    def search_cache_size():
+        return 2000
+
+    # The time (in seconds) that search result will be stored in cache
+    def search_cache_time():
+        return 3600
+
+    # How many next tracks of the queue are loaded again while current track is playing
+    def prefetch_tracks():
+        return 2
+
+    # Max amount of played tracks which are remembered for the "previous" command
+    def history_size():
+        return 25
+
+    # Max amount of tracks in the queue of one guild
+    def queue_max_tracks():
+        return 1000
+
+    # Max memory (in bytes) which can be taken by the queue of one guild
+    def queue_max_bytes():
+        return 2000000
+
+    # Max amount of queries (or playlist pages) which are resolved at the same time during import
+    def import_concurrency():
+        return 8
+
+    # Max amount of tracks which can be added by one import (playlist or list of queries)
+    def import_max_tracks():
+        return 200
+
+    # How often (in seconds) import progress message is updated
+    def import_progress_interval():
+        return 2
+
+    # Max amount of recently found tracks which are suggested in /music play
+    def suggestions_size():
+        return 5000
+
+    # File where players (queue, current track and position) are saved to be restored after restart
+    def snapshot_path():
+        return "./players.log"
+
+    # How often (in seconds) players state is saved
+    def snapshot_interval():
+        return 5
+
+    # Size (in bytes) of the players file after which it is compacted
+    def snapshot_compact_size():
+        return 1000000
+
+    # Players saved more than this time (in seconds) ago are not restored
+    def snapshot_max_age():
+        return 900
+
+    # Settings of guilds without player are forgotten after this time (in seconds) of inactivity
+    def state_idle_time():
+        return 600
+
+    # How often (in seconds) idle guild settings are looked for
+    def state_sweep_interval():
+        return 60
+
+    # Player is destroyed after this time (in seconds) when the queue has ended
+    def idle_timeout():
+        return 30
+
+    # Player is destroyed after this time (in seconds) when there are no users in its voice channel
+    def empty_channel_timeout():
+        return 10
+
+    # Player is destroyed after this time (in seconds) on pause
+    def inactivity_timeout():
+        return 600
+
+    # Player message is edited not more often than once in this time (in seconds), later edits are merged
+    def player_edit_interval():
+        return 1
+
   
 # This is used for music to work.
 #
@@ -106,3 +218,27 @@ class Lavalink():
     
     def password():
         return os.environ.get("LAVALINK_PWD")
+
+    # All nodes the bot connects to. New players are placed on the least loaded node.
+    # Add more dictionaries here to use several Lavalink servers
+    def nodes():
+        return [
+            {
+                "identifier": "MAIN",
+                "host": Lavalink.host(),
+                "port": Lavalink.port(),
+                "password": Lavalink.password(),
+                "https": True
+            }
+        ]
+
+    # How often (in seconds) connection of every node is checked
+    def health_check_interval():
+        return 5
+
+    # Lost node is reconnected after random delay up to base * 2^attempt seconds, but not more than max
+    def reconnect_base_delay():
+        return 1
+
+    def reconnect_max_delay():
+        return 60
@@ -0,0 +1,96 @@
+"""Localization catalog. Strings of every language are stored in ./Catalog/{language}.json
+and compiled into lookup tables on the first use of the language."""
+
+import json, os, string
+
+DIRECTORY = os.path.join(os.path.dirname(__file__), "Catalog")
+
+# Used when there is no catalog for the requested language.
+DEFAULT = "en"
+
+# Compiled catalogs by language. Languages are loaded lazily.
+catalogs = {}
+
+# Languages which have a catalog file.
+languages = {name[:-5] for name in os.listdir(DIRECTORY) if name.endswith(".json")}
+
+
+# Format string parsed once, so rendering is just a join of literals and values.
+class Template():
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = None
+        parts = tuple(
+            (literal, field, spec) for literal, field, spec, _ in string.Formatter().parse(text)
+        )
+        if any(field is not None for _, field, _ in parts):
+            self.parts = parts
+
+    def render(self, values: dict) -> str:
+        if self.parts is None:
+            return self.text
+        return "".join(
+            literal + (format(values[field], spec) if field is not None else "")
+            for literal, field, spec in self.parts
+        )
+
+
+def compile_embed(data: dict) -> dict:
+    return {
+        "color": int(data["color"].lstrip("#"), 16),
+        "title": Template(data["title"]) if "title" in data else None,
+        "description": Template(data["description"]) if "description" in data else None,
+        "timestamp": data.get("timestamp", False),
+        "author": (Template(data["author"]["name"]), Template(data["author"]["icon_url"])) if "author" in data else None,
+        "footer": Template(data["footer"]["text"]) if "footer" in data else None,
+        "image": Template(data["image"]) if "image" in data else None,
+        "thumbnail": Template(data["thumbnail"]) if "thumbnail" in data else None,
+        "fields": [
+            (Template(field["name"]), Template(field["value"]), field.get("inline", True))
+            for field in data.get("fields", [])
+        ]
+    }
+
+
+def load(language: str) -> dict:
+    with open(os.path.join(DIRECTORY, f"{language}.json"), "r", encoding="utf-8") as catalog_file:
+        data = json.load(catalog_file)
+    return {
+        "commands": [tuple(command) for command in data["commands"]],
+        "messages": {key: Template(text) for key, text in data["messages"].items()},
+        "fields": {
+            key: (Template(field["name"]), Template(field["value"]), field.get("inline", True))
+            for key, field in data["fields"].items()
+        },
+        "embeds": {key: compile_embed(embed) for key, embed in data["embeds"].items()}
+    }
+
+
+def resolve(language: str) -> str:
+    return language if language in languages else DEFAULT
+
+
+def get(language: str) -> dict:
+    language = resolve(language)
+    catalog = catalogs.get(language)
+    if catalog is None:
+        catalog = catalogs[language] = load(language)
+    return catalog
+
+
+def embed(language: str, key: str) -> dict:
+    return get(language)["embeds"][key]
+
+
+def field(language: str, key: str) -> tuple:
+    return get(language)["fields"][key]
+
+
+def message(language: str, key: str, **values) -> str:
+    return get(language)["messages"][key].render(values)
+
+
+def commands(language: str) -> list:
+    return get(language)["commands"]
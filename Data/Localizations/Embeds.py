@@ -1,1227 +1,338 @@
-"""All Bot Embeds."""
+"""All Bot Embeds. Texts are stored in the localization catalog (./Catalog/{language}.json)."""
 
 from discord.ext import commands
-import datetime, wavelink, discord
+import datetime, itertools, wavelink, discord
 from datetime import datetime as dt
 
 import Config
+from Data.Localizations import Catalog
+
+
+# Build embed from the catalog entry, filling templates with values.
+def build(key: str, language: str, **values):
+    entry = Catalog.embed(language, key)
+    embed = discord.Embed(
+        color=entry["color"],
+        title=entry["title"].render(values) if entry["title"] else None,
+        description=entry["description"].render(values) if entry["description"] else None
+    )
+    if entry["timestamp"]:
+        embed.timestamp = dt.now()
+    if entry["author"]:
+        embed.set_author(
+            name=entry["author"][0].render(values),
+            icon_url=entry["author"][1].render(values)
+        )
+    if entry["footer"]:
+        embed.set_footer(
+            text=entry["footer"].render(values)
+        )
+    if entry["image"]:
+        embed.set_image(url=entry["image"].render(values))
+    if entry["thumbnail"]:
+        embed.set_thumbnail(url=entry["thumbnail"].render(values))
+    for name, value, inline in entry["fields"]:
+        embed.add_field(
+            name=name.render(values),
+            value=value.render(values),
+            inline=inline
+        )
+    return embed
+
+
+# Embeds which depend only on language are built once per language, callers get a copy.
+def cached(build):
+    templates = {}
+    def wrapper(language: str):
+        embed = templates.get(language)
+        if embed is None:
+            embed = templates[language] = build(language)
+        return embed.copy()
+    wrapper.__name__ = build.__name__
+    return wrapper
+
+
+# Static part of dynamic embeds. Built once per key, per-call fields are set on a copy.
+skeletons = {}
+
+def skeleton(key: tuple, build):
+    embed = skeletons.get(key)
+    if embed is None:
+        embed = skeletons[key] = build()
+    return embed.copy()
+
+
+def avatar(user: discord.User):
+    if user.avatar is not None:
+        return user.avatar.url
+    return "https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
+
+
+def track_values(song: wavelink.YouTubeTrack):
+    return {
+        "title": song.title,
+        "author": song.author,
+        "uri": song.uri,
+        "thumbnail": song.thumbnail,
+        "duration": str(datetime.timedelta(seconds=song.duration))
+    }
+
 
 class ErrorHandler():
+    @cached
     def dm_not_supported(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Не-а",
-                description="Эта команда не может быть использована в личных сообщениях."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="DM not supported",
-                description="This command can't be used in private messages."
-            )
-        return embed
+        return build("ErrorHandler.dm_not_supported", language)
 
 class BotInfo():
     def help(language: str, bot: commands.Bot):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Помощь",
-                description=f"**Описание бота:** Саня стал кошкодевочкой-диджеем и теперь включает вам музыку с ютуба.\n\n**Репозиторий с исходным кодом:**\nhttps://github.com/RealSosiso4ka/Sanya-Nya",
-                timestamp=dt.now()
-            )
-            cmds = ""
-            for command in Config.Bot.commands("ru"):
-                cmds += "`" + command[0] + "`" + " - " + command[1] + "\n"
-            embed.add_field(
-                name="Команды",
-                value=cmds,
-                inline=False
-            )
-            embed.add_field(
-                name="Префикс",
-                value="`" + bot.command_prefix + "`",
-                inline=False
-            )
-            embed.add_field(
-                name="Слэш команды",
-                value="Все префиксовые команды сани портированы в слэш команды, как и эта - </help:1028273439439589376>",
-                inline=False
-            )
-            embed.set_footer(
-                text="Все права ̶з̶а̶щ̶и̶щ̶е̶н̶ы̶  съедены"
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Help",
-                description=f"**Bot description:** Sanya became neko girl DJ and now plays music from YouTube for you.\n\n**Source code:**\nhttps://github.com/RealSosiso4ka/Sanya-Nya",
-                timestamp=dt.now()
-            )
-            cmds = ""
-            for command in Config.Bot.commands("en"):
-                cmds += "`" + command[0] + "`" + " - " + command[1] + "\n"
-            embed.add_field(
-                name="Commands",
-                value=cmds,
-                inline=False
-            )
-            embed.add_field(
-                name="Prefix",
-                value="`" + bot.command_prefix + "`",
-                inline=False
-            )
-            embed.add_field(
-                name="Slash commands",
-                value="All prefix commands ported to slash commands, like this one - </help:1028273439439589376>",
-                inline=False
-            )
-            embed.set_footer(
-                text="All rights eaten"
-            )
-        embed.set_image(
-            url="https://media.tenor.com/images/9c93248d94cfc9fb4a6895f6f08c7b61/tenor.gif"
-        )
+        embed = skeleton(("help", Catalog.resolve(language), bot.command_prefix), lambda: build(
+            "BotInfo.help", language,
+            commands="".join("`" + command[0] + "`" + " - " + command[1] + "\n" for command in Config.Bot.commands(language)),
+            prefix=bot.command_prefix
+        ))
+        embed.timestamp = dt.now()
         return embed
 
     def status(
         language: str,
-        uptime_days: int, 
-        uptime_hours: int, 
-        os_name: str, 
-        used_ram: str, 
-        max_ram: str, 
-        cpu_load: str, 
-        python_version: str, 
-        os_version: str, 
-        users: int, 
-        guilds: int, 
+        uptime_days: int,
+        uptime_hours: int,
+        os_name: str,
+        used_ram: str,
+        max_ram: str,
+        cpu_load: str,
+        python_version: str,
+        os_version: str,
+        users: int,
+        guilds: int,
         channels: int
         ):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Статус - Няяя",
-                description="Информация о текущем статусе бота.",
-                timestamp=dt.now()
-            )
-            embed.add_field(
-                name="Аптайм:",
-                value=f"```{uptime_days} дней, {uptime_hours} часов```",
-                inline=False
-            )
-            embed.add_field(
-                name="ОС:",
-                value=f"```{os_name}, {os_version}```",
-                inline=False
-            )
-            embed.add_field(
-                name="Использование ОЗУ:",
-                value=f"```{used_ram} / {max_ram} MB```",
-                inline=False
-            )
-            embed.add_field(
-                name="Нагрузка процессора:",
-                value=f"```{cpu_load}%```",
-                inline=False
-            )
-            embed.add_field(
-                name="Версия Python:",
-                value=f"```{python_version}```",
-                inline=False
-            )
-            embed.add_field(
-                name="Статистика в дискорде:",
-                value=f"```{users} пользователей / {guilds} серверов / {channels} каналов```",
-                inline=False
-            )
-            embed.set_footer(
-                text="Довольно интересная книга, не так ли?"
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Status - Nyaaa",
-                description="Information about current bot status.",
-                timestamp=dt.now()
-            )
-            embed.add_field(
-                name="Uptime:",
-                value=f"```{uptime_days} days, {uptime_hours} hours```",
-                inline=False
-            )
-            embed.add_field(
-                name="OS:",
-                value=f"```{os_name}, {os_version}```",
-                inline=False
-            )
-            embed.add_field(
-                name="RAM Usage:",
-                value=f"```{used_ram} / {max_ram} MB```",
-                inline=False
-            )
-            embed.add_field(
-                name="CPU Usage:",
-                value=f"```{cpu_load}%```",
-                inline=False
-            )
-            embed.add_field(
-                name="Python version:",
-                value=f"```{python_version}```",
-                inline=False
-            )
-            embed.add_field(
-                name="Discord stats:",
-                value=f"```{users} users / {guilds} guilds / {channels} channels```",
-                inline=False
-            )
-            embed.set_footer(
-                text="Quite an interesting book, isn't it?"
-            )
-        embed.set_image(
-            url="https://raw.githubusercontent.com/cat-milk/Anime-Girls-Holding-Programming-Books/master/Python/Elaina_With_Effective_Python.png"
+        return build(
+            "BotInfo.status", language,
+            uptime_days=uptime_days,
+            uptime_hours=uptime_hours,
+            os_name=os_name,
+            used_ram=used_ram,
+            max_ram=max_ram,
+            cpu_load=cpu_load,
+            python_version=python_version,
+            os_version=os_version,
+            users=users,
+            guilds=guilds,
+            channels=channels
         )
-        return embed
-        
+
 
 class Music():
+    @cached
     def song_is_none(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Укажите название трека",
-                description="Вам необходимо указать название трека, который вы хотите включить в голосовом канале."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Specify song name",
-                description="You need to specify the name of the track you want to play in voice channel."
-            )
-        return embed
+        return build("Music.song_is_none", language)
 
+    @cached
     def join_vc(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Подключитесь к голосовому каналу",
-                description="Вы должны быть в голосовом канале, чтобы использовать эту команду."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Connect to voice channel first",
-                description="You need to be in a voice channel to use this command."
-            )
-        return embed
+        return build("Music.join_vc", language)
 
+    @cached
     def pause_player_only(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Невозможно выполнить команду",
-                description="Эту команду можно выполнить, используйте плеер, чтобы поставить трек на паузу."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Can not process command",
-                description="This command can not be processed, you must use player to pause track playback."
-            )
-        return embed
+        return build("Music.pause_player_only", language)
 
+    @cached
     def song_not_found(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Трек не найден",
-                description="Не удалось найти трек по вашему запросу."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Track Not Found",
-                description="Can't find track with your query."
-            )
-        return embed
-    
+        return build("Music.song_not_found", language)
+
+    @cached
     def resume_player_only(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Невозможно выполнить команду",
-                description="Эту команду можно выполнить, используйте плеер, чтобы возобновить проигрывание трека."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Can not process command",
-                description="This command can not be processed, you must use player to resume track playback."
-            )
-        return embed
+        return build("Music.resume_player_only", language)
 
-    def music_player_connected(language: str, song: wavelink.YouTubeTrack, ctx: commands.Context):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=f"{song.title}",
-                description=f"[Открыть Трек]({song.uri}) - `{str(datetime.timedelta(seconds=song.duration))}`\n\n**Подключено пользователем {ctx.author.name}**"
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=f"{song.title}",
-                description=f"[Open Track]({song.uri}) - `{str(datetime.timedelta(seconds=song.duration))}`\n\n**Player connected by: {ctx.author.name}**"
-            )
-        embed.set_author(
-            name=f"{song.author}",
-            icon_url="https://rataku.com/images/2022/10/08/av_play.png"
-        )
-        embed.set_thumbnail(
-            url="https://rataku.com/images/2022/10/08/av_note.png"
-        )
-        embed.set_image(url=song.thumbnail)
-        return embed
+    def music_player_connected(language: str, song: wavelink.YouTubeTrack, user: str):
+        return build("Music.music_player_connected", language, user=user, **track_values(song))
 
+    @cached
     def nothing_is_playing(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Ничего не играет",
-                description="Вы не можете поставить проигрывание на паузу, сейчас ничего не играет."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Nothing is playing",
-                description="You can not pause player because nothing is playing right now."
-            )
-        return embed
+        return build("Music.nothing_is_playing", language)
 
+    @cached
     def loop_nothing_playing(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Ничего не играет",
-                description="Вы не можете зациклить проигрывание трека, сейчас ничего не играет."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Nothing is playing",
-                description="You can not loop track because nothing is playing right now."
-            )
-        return embed
+        return build("Music.loop_nothing_playing", language)
 
     def paused(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание остановлено",
-                    description=f"Пользователь **{r.user.name}** остановил проигрывание трека."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание остановлено",
-                    description=f"Трек успешно поставлен на паузу."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player paused",
-                    description=f"**{r.user.name}** paused playing track."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player paused",
-                    description=f"Current track was successfully paused."
-                )
-        return embed
-    
+        return build("Music.paused.self" if is_self else "Music.paused", language, user=r.user.name)
+
     def paused_ctx(language: str, ctx: commands.Context, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание остановлено",
-                    description=f"Пользователь **{ctx.author.name}** остановил проигрывание трека."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание остановлено",
-                    description=f"Трек успешно поставлен на паузу."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player paused",
-                    description=f"**{ctx.author.name}** paused playing track."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player paused",
-                    description=f"Current track was successfully paused."
-                )
-        return embed
-    
+        return build("Music.paused_ctx.self" if is_self else "Music.paused_ctx", language, user=ctx.author.name)
+
+    @cached
     def already_paused(language: str, ):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xe79940,
-                title="Ничего не изменилось",
-                description="Трек уже поставлен на паузу."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xe79940,
-                title="Nothing changed",
-                description="Track is already paused."
-            )
-        return embed
+        return build("Music.already_paused", language)
 
     def resumed(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание возобновлено",
-                    description=f"Пользователь **{r.user.name}** возобновил проигрывание трека."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание возобновлено",
-                    description=f"Проигрывание трека возобновлено."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player resumed",
-                    description=f"**{r.user.name}** resumed playing track."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player resumed",
-                    description=f"Track playback resumed."
-                )
-        return embed
-    
+        return build("Music.resumed.self" if is_self else "Music.resumed", language, user=r.user.name)
+
     def resumed_ctx(language: str, ctx: commands.Context, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание возобновлено",
-                    description=f"Пользователь **{ctx.author.name}** возобновил проигрывание трека."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Проигрывание возобновлено",
-                    description=f"Проигрывание трека возобновлено."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player resumed",
-                    description=f"**{ctx.author.name}** resumed playing track."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player resumed",
-                    description=f"Track playback resumed."
-                )
-        return embed
-    
+        return build("Music.resumed_ctx.self" if is_self else "Music.resumed_ctx", language, user=ctx.author.name)
+
+    @cached
     def already_resumed(language: str, ):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xe79940,
-                title="Ничего не изменилось",
-                description="Трек уже играет."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xe79940,
-                title="Nothing changed",
-                description="Track is already playing."
-            )
-        return embed
+        return build("Music.already_resumed", language)
 
     def loop_enabled(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Повторение трека включено",
-                    description=f"Пользователь **{r.user.name}** включил повторение трека."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Повторение трека включено",
-                    description=f"Текущий трек успешно зациклен."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Loop enabled",
-                    description=f"**{r.user.name}** enabled track loop."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Loop enabled",
-                    description=f"Track loop is now enabled."
-                )
-        return embed
-    
+        return build("Music.loop_enabled.self" if is_self else "Music.loop_enabled", language, user=r.user.name)
+
+    @cached
     def loop_enabled_ctx(language: str, ):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Повторение трека включено",
-                description="Текущий трек успешно зациклен."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Loop enabled",
-                description="Track loop is now enabled."
-            )
-        return embed
+        return build("Music.loop_enabled_ctx", language)
 
     def loop_disabled(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Повторение трека отключено",
-                    description=f"Пользователь **{r.user.name}** отключил повторение трека."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Повторение трека отключено",
-                    description="Повторение трека успешно отключено."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Loop disabled",
-                    description=f"**{r.user.name}** disabled track loop."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Loop disabled",
-                    description=f"Track loop is now disabled."
-                )
-        return embed
+        return build("Music.loop_disabled.self" if is_self else "Music.loop_disabled", language, user=r.user.name)
 
+    @cached
     def loop_disabled_ctx(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Повторение трека отключено",
-                description="Повторение трека успешно отключено."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Loop disabled",
-                description="Track loop is now disabled."
-            )
-        return embed
+        return build("Music.loop_disabled_ctx", language)
 
     def track_added(language: str, r: discord.Interaction, song: wavelink.YouTubeTrack):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Автор: {song.author}\nДлительность: `{str(datetime.timedelta(seconds=song.duration))}`\nСсылка: [Перейти]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name=f"{r.user.name} добавил трек в очередь:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name=f"{r.user.name} добавил трек в очередь:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Author: {song.author}\nDuration: `{str(datetime.timedelta(seconds=song.duration))}`\nLink: [Open]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name=f"{r.user.name} added track to queue:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name=f"{r.user.name} added track to queue:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        embed.set_image(
-            url=song.thumbnail
-        )
-        return embed
-    
+        return build("Music.track_added", language, user=r.user.name, avatar=avatar(r.user), **track_values(song))
+
     def track_added_ctx(language: str, ctx: commands.Context, song: wavelink.YouTubeTrack):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Автор: {song.author}\nДлительность: `{str(datetime.timedelta(seconds=song.duration))}`\nСсылка: [Перейти]({song.uri})"
-            )
-            
-            if ctx.author.avatar is not None:
-                embed.set_author(
-                    name=f"{ctx.author.name} добавил трек в очередь:",
-                    icon_url=ctx.author.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name=f"{ctx.author.name} добавил трек в очередь:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Author: {song.author}\nDuration: `{str(datetime.timedelta(seconds=song.duration))}`\nLink: [Open]({song.uri})"
-            )
+        return build("Music.track_added_ctx", language, user=ctx.author.name, avatar=avatar(ctx.author), **track_values(song))
 
-            if ctx.author.avatar is not None:
-                embed.set_author(
-                    name=f"{ctx.author.name} added track to queue:",
-                    icon_url=ctx.author.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name=f"{ctx.author.name} added track to queue:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        embed.set_image(
-            url=song.thumbnail
-        )
-        return embed
-    
     def track_added_to_play(language: str, r: discord.Interaction, song: wavelink.YouTubeTrack):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Автор: {song.author}\nДлительность: `{str(datetime.timedelta(seconds=song.duration))}`\nСсылка: [Перейти]({song.uri})"
-            )
-            if r.user.avatar is not None: 
-                embed.set_author(
-                    name=f"{r.user.name} включил трек:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name=f"{r.user.name} включил трек:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Author: {song.author}\nDuration: `{str(datetime.timedelta(seconds=song.duration))}`\nLink: [Open]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name=f"{r.user.name} set track:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name=f"{r.user.name} set track:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        embed.set_image(
-            url=song.thumbnail
-        )
-        return embed
-    
+        return build("Music.track_added_to_play", language, user=r.user.name, avatar=avatar(r.user), **track_values(song))
+
     def self_track_added(language: str, r: discord.Interaction, song: wavelink.YouTubeTrack):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Автор: {song.author}\nДлительность: `{str(datetime.timedelta(seconds=song.duration))}`\nСсылка: [Перейти]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name="Трек добавлен в очередь:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name="Трек добавлен в очередь:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Author: {song.author}\nDuration: `{str(datetime.timedelta(seconds=song.duration))}`\nLink: [Open]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name="Track added to the queue:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name="Track added to the queue:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        embed.set_image(
-            url=song.thumbnail
-        )
-        return embed
+        return build("Music.self_track_added", language, avatar=avatar(r.user), **track_values(song))
 
     def self_track_added_to_play(language: str, r: discord.Interaction, song: wavelink.YouTubeTrack):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Автор: {song.author}\nДлительность: `{str(datetime.timedelta(seconds=song.duration))}`\nСсылка: [Перейти]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name="Трек включён:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name="Трек включён:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title=song.title,
-                description=f"Author: {song.author}\nDuration: `{str(datetime.timedelta(seconds=song.duration))}`\nLink: [Open]({song.uri})"
-            )
-            if r.user.avatar is not None:
-                embed.set_author(
-                    name="Track set:",
-                    icon_url=r.user.avatar.url
-                )
-            else:
-                embed.set_author(
-                    name="Track set:",
-                    icon_url="https://media.discordapp.net/attachments/929093869394591754/977136974567710790/empty_avatar.png?width=438&height=438"
-                )
-        embed.set_image(
-            url=song.thumbnail
-        )
-        return embed
-    
+        return build("Music.self_track_added_to_play", language, avatar=avatar(r.user), **track_values(song))
+
+    @cached
     def looped(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Зацикливание трека включено",
-                description="Вам необходимо отключить зацикливание трека перед использованием этой команды."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Loop is enabled",
-                description="You need to diable track loop before using this command."
-            )
-        return embed
+        return build("Music.looped", language)
 
+    @cached
     def error(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Ошибка",
-                description="При обработке запроса произошла ошибка. Разработчик оповещён."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Error",
-                description="Error occured while processing your request. Developers were notified."
-            )
-        return embed
-        
+        return build("Music.error", language)
+
     def stopped(language: str, r: discord.Interaction):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Плеер Отключён",
-                description=f"**{r.user.name}** выключил музыкальный плеер. Проигрывание музыки остановлено, бот отключён от голосового канала."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Player Destroyed",
-                description=f"**{r.user.name}** destroyed music player. Music playback was stopped, the bot was disconnected from the voice channel."
-            )
-        return embed
-    
+        return build("Music.stopped", language, user=r.user.name)
+
     def ctx_stopped(language: str, ctx: commands.Context):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Плеер Отключён",
-                description=f"**{ctx.author.name}** выключил музыкальный плеер. Проигрывание музыки остановлено, бот отключён от голосового канала."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Player Destroyed",
-                description=f"**{ctx.author.name}** destroyed music player. Music playback was stopped, the bot was disconnected from the voice channel."
-            )
-        return embed
+        return build("Music.ctx_stopped", language, user=ctx.author.name)
 
     def replay(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Воспроизведение повторено",
-                    description=f"**{r.user.name}** отмотал воспроизведение текущего трека на его начало."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Воспроизведение повторено",
-                    description=f"Воспроизведение текущего трека отмотано на его начало."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Track replayed",
-                    description=f"**{r.user.name}** rewind the playback of the current track to its beginning."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Track replayed",
-                    description=f"Current track playback rewinded to its beginning."
-                )
-        return embed
-    
+        return build("Music.replay.self" if is_self else "Music.replay", language, user=r.user.name)
+
+    @cached
     def replay_ctx(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Воспроизведение повторено",
-                description=f"Воспроизведение текущего трека отмотано на его начало."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Track replayed",
-                description=f"Current track playback rewinded to its beginning."
-            )
-        return embed
-    
+        return build("Music.replay_ctx", language)
+
+    @cached
     def queue_is_empty_(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Очередь пуста",
-                description="В очереди нету никаких треков."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Queue is empty",
-                description="There are no tracks in the queue."
-            )
-        return embed
+        return build("Music.queue_is_empty_", language)
 
     def queue(language: str, queue: wavelink.queue.Queue):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Очередь Треков"
-            )
-            embed.set_thumbnail(
-                url="https://rataku.com/images/2022/10/08/av_note.png"
-            )
-            song_count = 1
-            for song in queue:
-                embed.add_field(
-                    name=f"{song_count}. {song.title}", 
-                    value=f"Автор: {song.author}\nДлительность: `{str(datetime.timedelta(seconds=song.duration))}`",
-                    inline=False
-                    )
-                song_count += 1
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Player Queue"
-            )
-            embed.set_thumbnail(
-                url="https://rataku.com/images/2022/10/08/av_note.png"
+        embed = skeleton(("queue", Catalog.resolve(language)), lambda: build("Music.queue", language))
+        name, value, inline = Catalog.field(language, "Music.queue")
+        song_count = 1
+        # Embed can't have more than 25 fields
+        for song in itertools.islice(queue, 25):
+            values = {"position": song_count, **track_values(song)}
+            embed.add_field(
+                name=name.render(values),
+                value=value.render(values),
+                inline=inline
             )
-            song_count = 1
-            for song in queue:
-                embed.add_field(
-                    name=f"{song_count}. {song.title}",
-                    value=f"Author: {song.author}\nDuration: `{str(datetime.timedelta(seconds=song.duration))}`",
-                    inline=False
-                )
-                song_count += 1
+            song_count += 1
         return embed
 
+    @cached
     def song_is_too_long(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Трек слишком длинный",
-                description="Запрошенный вами трек должен быть не дольше `1 часа`. Если это ошибка, пожалуйста, укажите точное название видеоролика."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Track is too long",
-                description="The track you requested must be no longer than `1 hour`. If this is a mistake, please provide the exact title of the video."
-            )
-        return embed
+        return build("Music.song_is_too_long", language)
 
+    @cached
     def player_destroyed(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Плеер Отключён",
-                description="Этот музыкальный плеер был отключён из-за неактивности."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Player Destroyed",
-                description="Player was destroyed because of inactivity."
-            )
-        return embed
+        return build("Music.player_destroyed", language)
 
+    @cached
     def queue_is_empty(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Очередь пуста",
-                description="Невозможно пропустить трек и перейти к следующему, очередь пуста."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Queue is empty",
-                description="Can not skip this track and play next song because queue is emtpy."
-            )
-        return embed
+        return build("Music.queue_is_empty", language)
 
+    @cached
     def channel_is_empty(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Плеер отключён",
-                description="Все пользователи покинули голосовой канал. Плеер отключён."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Player destroyed",
-                description="All users left voice channel. Player destroyed."
-            )
-        return embed
+        return build("Music.channel_is_empty", language)
 
-    def player_waiting(language: str, ctx: commands.Context, prefix: str, bot: commands.Bot):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xa66f8b,
-                title=f"Музыкальный Плеер",
-                description=f"Сейчас ничего не играет. Вы можете включить трек, используя кнопки под этим сообщением, или введя в чат следующую команду:```{prefix}play <Песня/Ссылка в YouTube>```\n**Подключено пользователем {ctx.author.name}**"
-            ).set_image(url="https://media.discordapp.net/attachments/929093869394591754/965350757165580318/anime_girld_sleeping.gif")
-            embed.set_author(
-                name="Плеер неактивен",
-                icon_url="https://rataku.com/images/2022/04/18/ari_timer_.png"
-            )
-        else:
-            embed = discord.Embed(
-                color=0xa66f8b,
-                title=f"Music Player",
-                description=f"Nothing is playing now. You can play track by pressing buttons under this message, or with this command:```{prefix}play <Song/Link on YouTube>```\n**Player connected by: {ctx.author.name}**"
-            ).set_image(url="https://media.discordapp.net/attachments/929093869394591754/965350757165580318/anime_girld_sleeping.gif")
-            embed.set_author(
-                name="Player is inactive",
-                icon_url="https://rataku.com/images/2022/04/18/ari_timer_.png"
-            )
-        return embed
+    def player_waiting(language: str, user: str, prefix: str, bot: commands.Bot):
+        return build("Music.player_waiting", language, user=user, prefix=prefix)
 
     def returned(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Включён предыдущий трек",
-                    description=f"**{r.user.name}** включил предыдущий трек."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Предыдущий трек включён",
-                    description=f"Проигрывание возвращено к предыдущему треку."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Previous track is playing",
-                    description=f"**{r.user.name}** returned playback to the previous track."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Previous track is playing",
-                    description=f"Playback returned to the previous track."
-                )
-        return embed
-    
+        return build("Music.returned.self" if is_self else "Music.returned", language, user=r.user.name)
+
+    @cached
     def returned_ctx(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Предыдущий трек включён",
-                description=f"Проигрывание возвращено к предыдущему треку."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Previous track is playing",
-                description=f"Playback returned to the previous track."
-            )
-        return embed
-    
+        return build("Music.returned_ctx", language)
+
+    @cached
     def previous_track_is_none(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Предыдущего трека нету",
-                description="Данные о предыдущих треках отсутствуют."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Previous track undefined",
-                description="There is no data about previous tracks."
-            )
-        return embed
+        return build("Music.previous_track_is_none", language)
 
+    @cached
     def stop_not_connected(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Плеер не подключён",
-                description="Вы не можете отключить плеер, он и так выключен."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Player is already disabled",
-                description="Can not destroy the player as it is already disabled."
-            )
-        return embed
+        return build("Music.stop_not_connected", language)
 
     def skipped(language: str, r: discord.Interaction, is_self: bool):
-        if language == "ru":
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Трек пропущен",
-                    description=f"**{r.user.name}** пропустил этот трек."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Трек пропущен",
-                    description=f"Трек был успешно пропущен."
-                )
-        else:
-            if is_self is False:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Track skipped",
-                    description=f"**{r.user.name}** skipped track."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Track skipped",
-                    description=f"Track was successfully skipped."
-                )
-        return embed
-        
+        return build("Music.skipped.self" if is_self else "Music.skipped", language, user=r.user.name)
+
+    @cached
     def ctx_skipped(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Трек пропущен",
-                description=f"Трек был успешно пропущен."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Track skipped",
-                description=f"Track was successfully skipped."
-            )
-        return embed
+        return build("Music.ctx_skipped", language)
 
+    @cached
     def voice_client_not_connected(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Плеер не подключён",
-                description="Бот не подключён к голосовому каналу, выполнить эту команду невозможно."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Player is not connected",
-                description="Can not process your request. Bot is not connected to voice channel."
-            )
-        return embed
+        return build("Music.voice_client_not_connected", language)
 
+    @cached
     def invalid_volume(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Неверное значение",
-                description="Значение громкости должно быть целым числом от `1` до `200`."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xdd5f65,
-                title="Invalid volume value",
-                description="The volume value must be an integer between `1` and `200`."
-            )
-        return embed
-    
+        return build("Music.invalid_volume", language)
+
     def volume_set(language: str, r: discord.Interaction, volume):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Громкость изменена",
-                description=f"**{r.user.name}** изменил громкость плеера на `{volume}%`."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Volume changed",
-                description=f"**{r.user.name}** set player volume to `{volume}%`."
-            )
-        return embed
-    
+        return build("Music.volume_set", language, user=r.user.name, volume=volume)
+
     def volume_set_ctx(language: str, volume):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Громкость изменена",
-                description=f"Громкость плеера успешно установлена на `{volume}%`."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Volume changed",
-                description=f"Player volume successfully changed to `{volume}%`."
-            )
-        return embed
-    
+        return build("Music.volume_set_ctx", language, volume=volume)
+
     def self_volume_set(language: str, volume):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Громкость изменена",
-                description=f"Громкость плеера успешно изменена на `{volume}%`."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xebd8c3,
-                title="Volume changed",
-                description=f"Player volume set to `{volume}%`."
-            )
-        return embed
+        return build("Music.self_volume_set", language, volume=volume)
 
     def notifications(language: str, r: discord.Interaction, level: int):
-        if language == "ru":
-            if level == 0:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Настройки уведомлений плеера обновлены",
-                    description=f"**{r.user.name}** изменил уровень уведомлений плеера на `0`. Теперь вы не будете получать никаких сообщений при добавлении треков, изменении уровня громкости и т.п."
-                )
-            elif level == 1:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Настройки уведомлений плеера обновлены",
-                    description=f"**{r.user.name}** изменил уровень уведомлений плеера на `1`. Теперь, при изменении настроек плеера, только тот, кто выполнил действие, будет видеть результат."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Настройки уведомлений плеера обновлены",
-                    description=f"**{r.user.name}** изменил уровень уведомлений плеера на `2`. Теперь, при изменении настроек плеера, в чат будет отправлено сообщение, отображаемое всем пользователям."
-                )
-        else:
-            if level == 0:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player notifications settings updated",
-                    description=f"**{r.user.name}** set player notifications level to `0`. Now you will not receive any messages when adding tracks, changing the volume level, etc."
-                )
-            elif level == 1:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player notifications settings updated",
-                    description=f"**{r.user.name}** set player notifications level to `1`. Now, when changing the player settings, only the one who performed the action will see the result."
-                )
-            else:
-                embed = discord.Embed(
-                    color=0xebd8c3,
-                    title="Player notifications settings updated",
-                    description=f"**{r.user.name}** set player notifications level to `2`. Now, when changing the settings of the player, a message will be sent to the chat, displayed to all users."
-                )
-        return embed
-    
+        return build(f"Music.notifications.{level if level in [0, 1] else 2}", language, user=r.user.name)
+
+    @cached
     def queue_is_full(language: str):
-        if language == "ru":
-            embed = discord.Embed(
-                color=0xb74e4e,
-                title="Очередь заполнена",
-                description="Достигнут лимит количества треков в очереди."
-            )
-        else:
-            embed = discord.Embed(
-                color=0xb74e4e,
-                title="Queue is full",
-                description="Limit for the number of tracks in the queue has been reached."
-            )
-        return embed
+        return build("Music.queue_is_full", language)
+
+    def track_removed(language: str, song):
+        return build("Music.track_removed", language, title=song.title)
+
+    @cached
+    def track_not_in_queue(language: str):
+        return build("Music.track_not_in_queue", language)
+
+    def invalid_position(language: str, count: int):
+        return build("Music.invalid_position", language, count=count)
+
+    def track_moved(language: str, song, position: int):
+        return build("Music.track_moved", language, title=song.title, position=position)
+
+    def jumped(language: str, song, count: int):
+        return build("Music.jumped", language, title=song.title, count=count)
+
+    def queue_deduplicated(language: str, count: int):
+        return build("Music.queue_deduplicated", language, count=count)
+
+    def queue_shuffled(language: str, count: int):
+        return build("Music.queue_shuffled", language, count=count)
+
+    def import_progress(language: str, total: int, resolved: int, added: int, failed: int, skipped: int):
+        return build("Music.import_progress", language, total=total, resolved=resolved, added=added, failed=failed, skipped=skipped)
+
+    def import_finished(language: str, total: int, resolved: int, added: int, failed: int, skipped: int):
+        return build("Music.import_finished", language, total=total, resolved=resolved, added=added, failed=failed, skipped=skipped)
@@ -2,9 +2,8 @@
 
 import discord
 
+from Data.Localizations import Catalog
+
 class BotInfo():
     def ping(language: str, bot: discord.Bot):
-        if language == "ru":
-            return f"Понг! Текущий пинг - `{int(bot.latency * 1000)}ms`"
-        else:
-            return f"Pong! Current ping - `{int(bot.latency * 1000)}ms`"
\ No newline at end of file
+        return Catalog.message(language, "BotInfo.ping", latency=int(bot.latency * 1000))
@@ -1,15 +1,22 @@
 from typing import Literal
+from datetime import datetime
 import discord, Config
 from cachetools import TTLCache
 from discord.ext import commands
 
 def update_cache(bot: discord.Bot, user: discord.User, locale: str) -> None:
     bot.users_cache[user.id] = locale
+    bot.locale_store.set(user.id, locale)
     return
 
 def get_cache(bot: discord.Bot, user: discord.User) -> str:
     cache: TTLCache = bot.users_cache
-    return cache.get(user.id)
+    locale = cache.get(user.id)
+    if locale is None:
+        locale = bot.locale_store.get(user.id)
+        if locale is not None:
+            cache[user.id] = locale
+    return locale
 
 def get_locale(bot: discord.Bot, ctx) -> Literal["ru", "en"]:
     if Config.Bot.language() != "auto":
@@ -31,3 +38,7 @@ def get_locale(bot: discord.Bot, ctx) -> Literal["ru", "en"]:
 
 def get_guild_locale(guild: discord.Guild):
     return "ru" if guild.preferred_locale == "ru" else "en"
+
+# Time in ms passed since the message or interaction was created.
+def get_latency(created_at: datetime) -> int:
+    return int((discord.utils.utcnow() - created_at).total_seconds() * 1000)
@@ -0,0 +1,78 @@
+"""Persistent storage of users locales. TTLCache in bot.users_cache stays in front of it."""
+
+import sqlite3, asyncio, atexit, threading, Config
+from Utils.Bot import Logger
+
+
+class LocaleStore():
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+
+        # All known locales are kept in memory, so lookups never touch the disk.
+        # Locales of a batch stay here while it is written and after its write has failed.
+        self.locales = {}
+
+        # Locales changed since the last flush. Written to the disk in batches.
+        self.pending = {}
+
+        self.load()
+        atexit.register(self.flush)
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE IF NOT EXISTS locales (user_id INTEGER PRIMARY KEY, locale TEXT NOT NULL)")
+        return connection
+
+    def load(self):
+        try:
+            connection = self.connect()
+            self.locales = dict(connection.execute("SELECT user_id, locale FROM locales"))
+            connection.close()
+            Logger.log("SANYA", "INFO", f"Loaded {len(self.locales)} users locales.")
+        except sqlite3.Error as error:
+            Logger.log("SANYA", "ERROR", f"Failed to load users locales: {error}")
+
+    def get(self, user_id: int):
+        return self.locales.get(user_id)
+
+    def set(self, user_id: int, locale: str):
+        if self.locales.get(user_id) == locale:
+            return
+        self.locales[user_id] = locale
+        self.pending[user_id] = locale
+
+    def take_pending(self):
+        pending = self.pending
+        self.pending = {}
+        return pending
+
+    # Failed batch is written with the next one. Locales changed since then are newer, they are kept.
+    def requeue(self, pending: dict):
+        for user_id, locale in pending.items():
+            self.pending.setdefault(user_id, locale)
+
+    # Blocking, run it in executor.
+    def write(self, pending: dict):
+        if not pending:
+            return
+        with self.lock:
+            try:
+                connection = self.connect()
+                try:
+                    with connection:
+                        connection.executemany("INSERT OR REPLACE INTO locales (user_id, locale) VALUES (?, ?)", pending.items())
+                finally:
+                    connection.close()
+            except sqlite3.Error as error:
+                Logger.log("SANYA", "ERROR", f"Failed to save {len(pending)} users locales: {error}")
+                self.requeue(pending)
+
+    def flush(self):
+        self.write(self.take_pending())
+
+    async def run(self, bot):
+        await bot.wait_until_ready()
+        while not bot.is_closed():
+            await asyncio.sleep(Config.Bot.locales_flush_interval())
+            await bot.loop.run_in_executor(None, self.write, self.take_pending())
@@ -1,9 +1,52 @@
 """Events and errors Logger. Logs errors and tracebacks."""
 
-import traceback, json, Config
+import traceback, json, threading, queue, time, atexit, gzip, shutil, hashlib, random, sys, os, Config
 from datetime import datetime
 
 
+# Logs settings. Loaded once in on_ready(), so log() never touches settings.json.
+settings = {
+    "logs_lvl": Config.Bot.logs_lvl(),
+    "logs_file": None
+}
+
+# Log records waiting to be written by the background writer.
+records = queue.SimpleQueue()
+writer: threading.Thread = None
+
+# Opened logs file of the current segment. Owned by the writer thread.
+segment = {
+    "file": None,
+    "size": 0,
+    "opened": 0,
+    "index": None,
+    "index_saved": 0
+}
+
+# Used so archiving threads don't prune ./logs at the same time.
+archive_lock = threading.Lock()
+
+# Used so search() can read index of the current segment while writer updates it.
+index_lock = threading.Lock()
+
+# How often (in seconds) index of the current segment is saved to the disk.
+INDEX_SAVE_INTERVAL = 60
+
+# Every N-th record of the segment is added to the time index.
+INDEX_TIME_STEP = 50
+
+# Tracebacks by fingerprint (hash of the exception type and frames).
+errors = {}
+errors_lock = threading.Lock()
+
+# Token buckets and counters of suppressed logs by category ("{module}/{type}").
+buckets = {}
+suppressed = {}
+limits_lock = threading.Lock()
+
+_STOP = object()
+
+
 # This is executed when bot starts.
 def on_ready():
 
@@ -13,47 +56,493 @@ def on_ready():
     # Create file {current time}.txt where all logs for this session will be stored.
     create_logs_file(datetime.now())
 
-       
+    # Compress logs files left by previous sessions and remove the oldest archives.
+    threading.Thread(target=archive_old_logs, name="SanyaLoggerArchive", daemon=True).start()
+
+    # Start background thread which writes buffered logs to the console and logs file.
+    start_writer()
+
+
+def is_structured():
+    return Config.Bot.logs_format() == "json"
+
+
 def update_logs_lvl(now):
-    with open("./logs/settings.json", "r", encoding="utf-8") as settings:
-        data = json.load(settings)
+    with open("./logs/settings.json", "r", encoding="utf-8") as settings_file:
+        data = json.load(settings_file)
         data["logs_lvl"] = Config.Bot.logs_lvl()
-    with open("./logs/settings.json", "w", encoding="utf-8") as settings:
-        json.dump(data, settings, sort_keys=True, indent=4, ensure_ascii=False)
+    with open("./logs/settings.json", "w", encoding="utf-8") as settings_file:
+        json.dump(data, settings_file, sort_keys=True, indent=4, ensure_ascii=False)
         print(f"[{now.strftime('%m/%d/%Y, %H:%M:%S')}] [SANYA/INFO]: Logs level updated according to config.")
+    settings["logs_lvl"] = data["logs_lvl"]
 
 
 def create_logs_file(now):
-    with open(file=f"./logs/{now.strftime('%m-%d-%Y-%H-%M-%S')}.txt", mode="w", encoding="utf-8") as logs:
-        logs.write(f"[{now.strftime(f'%m/%d/%Y, %H:%M:%S')}] [SANYA/LOGS]: Logs file created.")
-    with open("./logs/settings.json", "r", encoding="utf-8") as settings:
-        data = json.load(settings)
-    with open("./logs/settings.json", "w", encoding="utf-8") as settings:
-        data["logs_file"] = f"{now.strftime('%m-%d-%Y-%H-%M-%S')}.txt"
-        json.dump(data, settings, sort_keys=True, indent=4, ensure_ascii=False)
-
-
-def log(module: str, logs_type: str, text: str):
-    with open("./logs/settings.json", "r", encoding="utf-8") as settings:
-        data = json.load(settings)
-        logs_lvl = data["logs_lvl"]
-        logs_file = data["logs_file"]
-    if logs_lvl in [2, 3]:
-        with open(file=f"./logs/{logs_file}", mode="a", encoding="utf-8") as logs:
-            logs.write(f"\n[{datetime.now().strftime(f'%m/%d/%Y, %H:%M:%S')}] [{module}/{logs_type}]: {text}")
-    if logs_lvl in [1, 3]:
-        print(f"[{datetime.now().strftime(f'%m/%d/%Y, %H:%M:%S')}] [{module}/{logs_type}]:", text)
-        
+    extension = ".jsonl" if is_structured() else ".txt"
+
+    # Several rotations can happen within one second, don't overwrite the previous segment.
+    name = f"{now.strftime('%m-%d-%Y-%H-%M-%S')}{extension}"
+    index = 1
+    while os.path.exists(f"./logs/{name}") or os.path.exists(f"./logs/{name}.gz"):
+        name = f"{now.strftime('%m-%d-%Y-%H-%M-%S')}-{index}{extension}"
+        index += 1
+
+    with open(file=f"./logs/{name}", mode="w", encoding="utf-8") as logs:
+        if is_structured():
+            logs.write(json.dumps({"time": round(now.timestamp(), 3), "module": "SANYA", "type": "LOGS", "text": "Logs file created."}) + "\n")
+        else:
+            logs.write(f"[{now.strftime(f'%m/%d/%Y, %H:%M:%S')}] [SANYA/LOGS]: Logs file created.")
+    with open("./logs/settings.json", "r", encoding="utf-8") as settings_file:
+        data = json.load(settings_file)
+    with open("./logs/settings.json", "w", encoding="utf-8") as settings_file:
+        data["logs_file"] = name
+        json.dump(data, settings_file, sort_keys=True, indent=4, ensure_ascii=False)
+    settings["logs_file"] = data["logs_file"]
+
+
+def start_writer():
+    global writer
+    if writer is not None and writer.is_alive():
+        return
+    writer = threading.Thread(target=write_loop, name="SanyaLogger", daemon=True)
+    writer.start()
+
+
+def stop_writer():
+    if writer is None or not writer.is_alive():
+        return
+    records.put(_STOP)
+    writer.join(timeout=5)
+
+
+# Flush everything which is still in memory when the process exits.
+atexit.register(stop_writer)
+
+
+def write_loop():
+    buffer = []
+    last_flush = time.monotonic()
+    last_summary = time.monotonic()
+    while True:
+        if time.monotonic() - last_summary >= Config.Bot.logs_summary_interval():
+            for console_line, file_line in errors_summary() + suppressed_summary():
+                if console_line is not None:
+                    print(console_line)
+                if file_line is not None:
+                    buffer.append(file_line)
+            last_summary = time.monotonic()
+
+        timeout = Config.Bot.logs_flush_interval() - (time.monotonic() - last_flush)
+        try:
+            record = records.get(timeout=max(timeout, 0.01))
+        except queue.Empty:
+            record = None
+
+        if record is _STOP:
+            buffer.extend(file_line for _, file_line in errors_summary() + suppressed_summary() if file_line is not None)
+            flush(buffer)
+            close_segment()
+            return
+
+        if record is not None:
+            console_line, file_line = record
+            if console_line is not None:
+                print(console_line)
+            if file_line is not None:
+                buffer.append(file_line)
+
+        if len(buffer) >= Config.Bot.logs_buffer_size() or time.monotonic() - last_flush >= Config.Bot.logs_flush_interval():
+            flush(buffer)
+            buffer.clear()
+            last_flush = time.monotonic()
+
+
+def flush(buffer: list):
+    if not buffer or settings["logs_file"] is None:
+        return
+    try:
+        if segment["file"] is None:
+            open_segment()
+        for entry in buffer:
+            if isinstance(entry, dict):
+                line = json.dumps(entry, ensure_ascii=False) + "\n"
+                index_record(entry, segment["size"])
+            else:
+                line = entry
+            segment["file"].write(line)
+            segment["size"] += len(line.encode("utf-8"))
+        segment["file"].flush()
+
+        if time.monotonic() - segment["index_saved"] >= INDEX_SAVE_INTERVAL:
+            save_index()
+        if should_rotate():
+            rotate()
+    except OSError as error:
+        print(f"[{datetime.now().strftime('%m/%d/%Y, %H:%M:%S')}] [SANYA/ERROR]: Failed to write logs: {error}")
+
+
+def append(lines: list):
+    if not lines or settings["logs_file"] is None:
+        return
+    with open(file=f"./logs/{settings['logs_file']}", mode="a", encoding="utf-8") as logs:
+        for line in lines:
+            logs.write(json.dumps(line, ensure_ascii=False) + "\n" if isinstance(line, dict) else line)
+
+
+def open_segment():
+    path = f"./logs/{settings['logs_file']}"
+    segment["file"] = open(file=path, mode="a", encoding="utf-8")
+    segment["size"] = os.path.getsize(path)
+    segment["opened"] = time.time()
+    segment["index_saved"] = time.monotonic()
+    with index_lock:
+        segment["index"] = {
+            "file": settings["logs_file"],
+            "start": segment["opened"],
+            "end": segment["opened"],
+            "count": 0,
+            "guilds": {},
+            "users": {},
+            "times": []
+        }
+
+
+def close_segment():
+    if segment["file"] is not None:
+        segment["file"].close()
+        segment["file"] = None
+        save_index()
+
+
+def should_rotate():
+    max_size = Config.Bot.logs_max_file_size()
+    interval = Config.Bot.logs_rotate_interval()
+    if max_size and segment["size"] >= max_size:
+        return True
+    if interval and time.time() - segment["opened"] >= interval:
+        return True
+    return False
+
+
+# Close current logs file, start a new one and compress the closed one in the background.
+def rotate():
+    closed = settings["logs_file"]
+    close_segment()
+    create_logs_file(datetime.now())
+    open_segment()
+    threading.Thread(target=archive, args=(closed,), name="SanyaLoggerArchive", daemon=True).start()
+
 
+def archive(name: str):
+    path = f"./logs/{name}"
+    try:
+        with open(path, "rb") as source, gzip.open(f"{path}.gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.remove(path)
+    except OSError as error:
+        print(f"[{datetime.now().strftime('%m/%d/%Y, %H:%M:%S')}] [SANYA/ERROR]: Failed to archive logs file {name}: {error}")
+    prune_archives()
+
+
+def archive_old_logs():
+    for name in os.listdir("./logs"):
+        if name.endswith((".txt", ".jsonl")) and name != settings["logs_file"]:
+            archive(name)
+    prune_archives()
+
+
+# Remove the oldest archives until retention limits from config are satisfied.
+def prune_archives():
+    with archive_lock:
+        archives = []
+        for name in os.listdir("./logs"):
+            if name.endswith((".txt.gz", ".jsonl.gz")):
+                path = f"./logs/{name}"
+                try:
+                    archives.append((os.path.getmtime(path), os.path.getsize(path), path))
+                except OSError:
+                    continue
+        archives.sort(reverse=True)
+
+        keep_files = Config.Bot.logs_keep_files()
+        keep_bytes = Config.Bot.logs_keep_bytes()
+        total = 0
+        for count, (_, size, path) in enumerate(archives, start=1):
+            total += size
+            if (keep_files and count > keep_files) or (keep_bytes and total > keep_bytes):
+                try:
+                    os.remove(path)
+                    if os.path.exists(f"{path[:-3]}.idx"):
+                        os.remove(f"{path[:-3]}.idx")
+                except OSError:
+                    pass
+
+
+# Sidecar index of the segment. Stores byte offsets of records for every guild and user
+# and offset of every INDEX_TIME_STEP-th record, so search() doesn't scan whole files.
+def index_record(record: dict, offset: int):
+    with index_lock:
+        index = segment["index"]
+        if index is None:
+            return
+        if record.get("guild_id") is not None:
+            index["guilds"].setdefault(str(record["guild_id"]), []).append(offset)
+        if record.get("user_id") is not None:
+            index["users"].setdefault(str(record["user_id"]), []).append(offset)
+        if index["count"] % INDEX_TIME_STEP == 0:
+            index["times"].append([record["time"], offset])
+        index["count"] += 1
+        index["end"] = record["time"]
+
+
+def save_index():
+    with index_lock:
+        index = segment["index"]
+        if index is None or index["count"] == 0:
+            return
+        data = json.dumps(index)
+    try:
+        with open(f"./logs/{index['file']}.idx", "w", encoding="utf-8") as index_file:
+            index_file.write(data)
+    except OSError as error:
+        print(f"[{datetime.now().strftime('%m/%d/%Y, %H:%M:%S')}] [SANYA/ERROR]: Failed to save logs index: {error}")
+    segment["index_saved"] = time.monotonic()
+
+
+def load_indexes():
+    indexes = {}
+    for name in os.listdir("./logs"):
+        if name.endswith(".idx"):
+            try:
+                with open(f"./logs/{name}", "r", encoding="utf-8") as index_file:
+                    index = json.load(index_file)
+                indexes[index["file"]] = index
+            except (OSError, ValueError, KeyError):
+                continue
+    with index_lock:
+        if segment["index"] is not None:
+            indexes[segment["index"]["file"]] = json.loads(json.dumps(segment["index"]))
+    return sorted(indexes.values(), key=lambda index: index["start"], reverse=True)
+
+
+def open_logs_file(name: str):
+    if os.path.exists(f"./logs/{name}"):
+        return open(f"./logs/{name}", "rb")
+    if os.path.exists(f"./logs/{name}.gz"):
+        return gzip.open(f"./logs/{name}.gz", "rb")
+    return None
+
+
+def read_records(logs, offsets: list):
+    for offset in offsets:
+        logs.seek(offset)
+        try:
+            yield json.loads(logs.readline())
+        except ValueError:
+            continue
+
+
+def scan_records(logs, offset: int):
+    logs.seek(offset)
+    for line in logs:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+# Search structured logs by guild, user and time range. Newest records go first.
+# Blocking, run it in executor.
+def search(guild_id: int = None, user_id: int = None, since: float = None, until: float = None, limit: int = 20):
+    results = []
+    for index in load_indexes():
+        if len(results) >= limit:
+            break
+        if since is not None and index["end"] < since:
+            continue
+        if until is not None and index["start"] > until:
+            continue
+
+        offsets = None
+        if guild_id is not None:
+            offsets = set(index["guilds"].get(str(guild_id), []))
+        if user_id is not None:
+            user_offsets = set(index["users"].get(str(user_id), []))
+            offsets = user_offsets if offsets is None else offsets & user_offsets
+        if offsets is not None and not offsets:
+            continue
+
+        # Skip the part of the segment which is older than `since`.
+        start = 0
+        for record_time, offset in index["times"]:
+            if since is not None and record_time <= since:
+                start = offset
+
+        logs = open_logs_file(index["file"])
+        if logs is None:
+            continue
+        with logs:
+            # Offsets are read in ascending order, seeking backwards in gzip archives is expensive.
+            if offsets is not None:
+                found = reversed(list(read_records(logs, sorted(offset for offset in offsets if offset >= start))))
+            else:
+                found = reversed(list(scan_records(logs, start)))
+
+            for record in found:
+                if since is not None and record["time"] < since:
+                    continue
+                if until is not None and record["time"] > until:
+                    continue
+                results.append(record)
+                if len(results) >= limit:
+                    break
+    return results
+
+
+def emit(console_line, file_line):
+    # Writer isn't running yet (e.g. logs before on_ready), write synchronously.
+    if writer is None or not writer.is_alive():
+        if console_line is not None:
+            print(console_line)
+        if file_line is not None:
+            append([file_line])
+        return
+    records.put((console_line, file_line))
+
+
+def build_record(module: str, logs_type: str, text: str, now: datetime, **fields):
+    logs_lvl = settings["logs_lvl"]
+    line = f"[{now.strftime(f'%m/%d/%Y, %H:%M:%S')}] [{module}/{logs_type}]: {text}"
+    if logs_lvl in [2, 3] and is_structured():
+        file_line = {
+            "time": round(now.timestamp(), 3),
+            "module": module,
+            "type": logs_type,
+            "text": text,
+            **fields
+        }
+    else:
+        file_line = f"\n{line}" if logs_lvl in [2, 3] else None
+    return line if logs_lvl in [1, 3] else None, file_line
+
+
+# Sampling and rate limits for high-volume logs. Errors and warnings are never dropped,
+# neither are logs of the ERROR module (failed commands are logged as ERROR/COMMAND)
+def is_allowed(module: str, logs_type: str):
+    if module == "ERROR" or logs_type in ["ERROR", "WARNING"]:
+        return True
+    category = f"{module}/{logs_type}"
+    rate = Config.Bot.logs_sampling().get(category, 1)
+    limit = Config.Bot.logs_rate_limits().get(category)
+    if rate >= 1 and limit is None:
+        return True
+
+    with limits_lock:
+        if rate < 1 and random.random() >= rate:
+            suppressed.setdefault(category, [0, 0])[0] += 1
+            return False
+        if limit is not None:
+            per_second, burst = limit
+            now = time.monotonic()
+            tokens, last = buckets.get(category, (burst, now))
+            tokens = min(burst, tokens + (now - last) * per_second)
+            if tokens < 1:
+                buckets[category] = (tokens, now)
+                suppressed.setdefault(category, [0, 0])[1] += 1
+                return False
+            buckets[category] = (tokens - 1, now)
+    return True
+
+
+def log(module: str, logs_type: str, text: str, guild_id: int = None, user_id: int = None, command: str = None, latency: int = None):
+    if settings["logs_lvl"] not in [1, 2, 3]:
+        return
+    if not is_allowed(module, logs_type):
+        return
+    emit(*build_record(module, logs_type, text, datetime.now(), guild_id=guild_id, user_id=user_id, command=command, latency=latency))
+
+
+def get_fingerprint(error_type: type, frames: traceback.StackSummary):
+    data = error_type.__qualname__ + "".join(f"|{frame.filename}:{frame.name}:{frame.lineno}" for frame in frames)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:12]
+
+
+# Full traceback is written only on the first occurrence of the fingerprint,
+# repeated ones are only counted and reported in the periodic summary.
 def log_traceback():
-    with open("./logs/settings.json", "r", encoding="utf-8") as settings:
-        data = json.load(settings)
-        logs_lvl = data["logs_lvl"]
-        logs_file = data["logs_file"]
-    if logs_lvl in [2, 3]:
-        with open(file=f"./logs/{logs_file}", mode="a", encoding="utf-8") as logs:
-            logs.write(f"\n{traceback.format_exc()}")
-    if logs_lvl == 1:
-        print(f"[{datetime.now().strftime(f'%m/%d/%Y, %H:%M:%S')}] Critical error in the application. Trackeback was saved to the logs.")
-    if logs_lvl == 3:
-        print(f"[{datetime.now().strftime(f'%m/%d/%Y, %H:%M:%S')}] Critical error in the application. Trackeback was saved to the logs.")
+    logs_lvl = settings["logs_lvl"]
+    if logs_lvl not in [1, 2, 3]:
+        return
+    error_type, error, error_traceback = sys.exc_info()
+    if error_type is None:
+        return
+
+    now = datetime.now()
+    fingerprint = get_fingerprint(error_type, traceback.extract_tb(error_traceback))
+    with errors_lock:
+        entry = errors.get(fingerprint)
+        if entry is not None:
+            entry["count"] += 1
+            entry["last"] = now.timestamp()
+            entry["message"] = str(error)
+            return
+        errors[fingerprint] = {
+            "type": error_type.__qualname__,
+            "message": str(error),
+            "count": 1,
+            "reported": 1,
+            "first": now.timestamp(),
+            "last": now.timestamp()
+        }
+
+    if logs_lvl in [2, 3] and is_structured():
+        file_line = {
+            "time": round(now.timestamp(), 3),
+            "module": "SANYA",
+            "type": "TRACEBACK",
+            "fingerprint": fingerprint,
+            "text": traceback.format_exc()
+        }
+    else:
+        file_line = f"\nTraceback fingerprint: {fingerprint}\n{traceback.format_exc()}" if logs_lvl in [2, 3] else None
+    emit(
+        f"[{now.strftime(f'%m/%d/%Y, %H:%M:%S')}] Critical error in the application. Trackeback was saved to the logs ({fingerprint})." if logs_lvl in [1, 3] else None,
+        file_line
+    )
+
+
+# Summary of tracebacks which were repeated since the previous summary.
+def errors_summary():
+    now = datetime.now()
+    lines = []
+    with errors_lock:
+        for fingerprint, entry in errors.items():
+            if entry["count"] == entry["reported"]:
+                continue
+            lines.append(build_record(
+                "SANYA", "ERRORS",
+                f"Traceback {fingerprint} ({entry['type']}) repeated {entry['count'] - entry['reported']} times, "
+                f"{entry['count']} in total. Last: {datetime.fromtimestamp(entry['last']).strftime('%m/%d/%Y, %H:%M:%S')}",
+                now, fingerprint=fingerprint, count=entry["count"]
+            ))
+            entry["reported"] = entry["count"]
+    return lines
+
+
+# Rollup of logs dropped by sampling and rate limits since the previous summary.
+def suppressed_summary():
+    with limits_lock:
+        counters = dict(suppressed)
+        suppressed.clear()
+    if not counters:
+        return []
+    text = ", ".join(f"{category} - {sampled + limited} (sampled {sampled}, rate limited {limited})" for category, (sampled, limited) in counters.items())
+    return [build_record("SANYA", "SUPPRESSED", f"Suppressed logs: {text}", datetime.now(), suppressed=counters)]
+
+
+# Most frequent tracebacks since the bot start.
+def top_errors(limit: int = 10):
+    with errors_lock:
+        entries = [(fingerprint, dict(entry)) for fingerprint, entry in errors.items()]
+    entries.sort(key=lambda item: item[1]["count"], reverse=True)
+    return entries[:limit]
@@ -0,0 +1,251 @@
+"""Benchmark of the music module against MockLavalink. Measures search, play, skip
+and track end (next track start) paths. Lavalink events are handled by the Music cog
+itself, Discord is replaced by a stand-in client, so only the bot <-> Lavalink part
+is measured.
+
+    python -m Utils.DevStuff.Benchmark --players 50 --queries 500 --latency 30
+
+Pass --host/--port of a running MockLavalink to use it instead of the bundled one."""
+
+import wavelink, asyncio, argparse, random, statistics, time
+
+from Utils.DevStuff.MockLavalink import MockLavalink
+from Utils.Music import Nodes, Search, Prefetch, Queue, Mailbox
+from cogs import MusicModule
+
+
+class BenchmarkUser():
+    def __init__(self, id: int):
+        self.id = id
+
+
+class BenchmarkGuild():
+    def __init__(self, id: int):
+        self.id = id
+        self.preferred_locale = "en"
+        self.voice_client = None
+
+    async def change_voice_state(self, **kwargs):
+        pass
+
+    # There are no text channels, so the player message is never edited
+    def get_channel(self, id: int):
+        return None
+
+    def get_channel_or_thread(self, id: int):
+        return None
+
+
+class BenchmarkChannel():
+    def __init__(self, guild: BenchmarkGuild):
+        self.id = guild.id
+        self.guild = guild
+        self.members = []
+
+
+# Stand-in for discord.Client: only what wavelink and the music cog use (user, guilds and event dispatch).
+# Lavalink events are handled by the real Music cog, the bot only watches them to measure
+class BenchmarkBot():
+    def __init__(self):
+        self.user = BenchmarkUser(1)
+        self.guilds = {}
+        # Futures which are resolved on the next track start by guild ID
+        self.waiters = {}
+        # Guilds which played their whole queue
+        self.finished = {}
+        # Nodes are created by the benchmark, so the cog never gets ready to connect its own
+        self.ready = asyncio.Event()
+        self.cog = MusicModule.Music(self)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_event_loop()
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def wait_until_ready(self):
+        await self.ready.wait()
+
+    def get_guild(self, id: int):
+        return self.guilds.get(id)
+
+    def dispatch(self, event: str, *args, **kwargs):
+        handler = getattr(self, f"on_{event}", None)
+        if handler is None:
+            handler = getattr(self.cog, f"on_{event}", None)
+        if handler is not None:
+            asyncio.ensure_future(handler(*args, **kwargs))
+
+    def wait_start(self, guild_id: int) -> asyncio.Future:
+        future = self.waiters[guild_id] = asyncio.get_event_loop().create_future()
+        return future
+
+    async def on_wavelink_track_start(self, player: wavelink.Player, track: wavelink.Track):
+        await self.cog.on_wavelink_track_start(player, track)
+        waiter = self.waiters.pop(player.guild.id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(time.perf_counter())
+
+    async def on_wavelink_track_end(self, player: wavelink.Player, track: wavelink.Track, reason):
+        await self.cog.on_wavelink_track_end(player, track, reason)
+        if player.queue.is_empty and not player.is_playing():
+            finished = self.finished.get(player.guild.id)
+            if finished is not None and not finished.done():
+                finished.set_result(time.perf_counter())
+
+
+def summary(name: str, values: list, elapsed: float = None) -> str:
+    if not values:
+        return f"{name}: no data"
+    values = sorted(values)
+    line = (
+        f"{name}: n={len(values)} "
+        f"p50={values[len(values) // 2]:.1f}ms "
+        f"p95={values[int(len(values) * 0.95) - 1 if len(values) > 1 else 0]:.1f}ms "
+        f"max={values[-1]:.1f}ms mean={statistics.mean(values):.1f}ms"
+    )
+    if elapsed:
+        line += f" throughput={len(values) / elapsed:.1f}/s"
+    return line
+
+
+async def bench_search(queries: int, distinct: int, concurrency: int) -> str:
+    semaphore = asyncio.Semaphore(concurrency)
+    pool = [f"benchmark song {index}" for index in range(distinct)]
+    latencies = []
+
+    async def one(query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await Search.search(query)
+            except Exception:
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(random.choice(pool)) for _ in range(queries)])
+    return summary("search", latencies, time.perf_counter() - started)
+
+
+async def create_players(bot: BenchmarkBot, amount: int) -> list:
+    players = []
+    for index in range(amount):
+        guild = bot.guilds[1000 + index] = BenchmarkGuild(1000 + index)
+        player = guild.voice_client = Nodes.player()(bot, BenchmarkChannel(guild))
+        await player.connect(timeout=0, reconnect=False)
+        players.append(player)
+    return players
+
+
+async def bench_play(bot: BenchmarkBot, players: list) -> str:
+    latencies = []
+
+    async def one(player: wavelink.Player):
+        track = await Search.search(f"benchmark play {player.guild.id}")
+        waiter = bot.wait_start(player.guild.id)
+        started = time.perf_counter()
+        await player.play(track)
+        latencies.append((await waiter - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(player) for player in players])
+    return summary("play -> track start", latencies, time.perf_counter() - started)
+
+
+# Skip seeks past the end of the track, like the skip command does
+async def bench_skip(bot: BenchmarkBot, players: list, skips: int) -> str:
+    latencies = []
+
+    async def one(player: wavelink.Player):
+        for index in range(skips):
+            await player.queue.put_wait(await Search.search(f"benchmark skip {player.guild.id} {index}"))
+        for _ in range(skips):
+            if player.track is None:
+                return
+            waiter = bot.wait_start(player.guild.id)
+            started = time.perf_counter()
+            await player.seek(position=int(player.track.length) * 10000)
+            try:
+                latencies.append((await asyncio.wait_for(waiter, timeout=10) - started) * 1000)
+            except asyncio.TimeoutError:
+                return
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(player) for player in players])
+    return summary("skip -> next track start", latencies, time.perf_counter() - started)
+
+
+# Tracks end by themselves (mock plays them faster), transitions are measured by Prefetch
+async def bench_track_end(bot: BenchmarkBot, players: list, tracks: int) -> str:
+    transitions = Prefetch.get_stats()["transitions"]
+    finished = []
+    for player in players:
+        for index in range(tracks):
+            await player.queue.put_wait(await Search.search(f"benchmark end {player.guild.id} {index}"))
+        finished.append(bot.finished.setdefault(player.guild.id, asyncio.get_event_loop().create_future()))
+        # Players which have already played their queue are started again
+        if not player.is_playing():
+            await player.play(Queue.hydrate(player.queue.get()))
+
+    started = time.perf_counter()
+    await asyncio.wait(finished, timeout=max(60, tracks * 10))
+    elapsed = time.perf_counter() - started
+    stats = Prefetch.get_stats()
+    return (
+        f"track end -> next track start: n={stats['transitions'] - transitions} "
+        f"mean={stats['average_time']}ms max={stats['max_time']}ms "
+        f"prefetched={stats['prefetched']} unplayable={stats['unplayable']} ({elapsed:.1f}s)"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Music module benchmark")
+    parser.add_argument("--host", default=None, help="Host of running mock (bundled mock is started if not set)")
+    parser.add_argument("--port", type=int, default=2333)
+    parser.add_argument("--password", default="youshallnotpass")
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=100, help="Amount of different queries among --queries")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--skips", type=int, default=5)
+    parser.add_argument("--tracks", type=int, default=5, help="Tracks per player for the track end benchmark")
+    parser.add_argument("--latency", type=float, default=20, help="REST latency of the bundled mock (ms)")
+    parser.add_argument("--track-length", type=float, default=2, help="Track length of the bundled mock (s)")
+    args = parser.parse_args()
+
+    server = None
+    host = args.host
+    if host is None:
+        host = "127.0.0.1"
+        server = MockLavalink(password=args.password, latency=args.latency, jitter=args.latency / 2, track_length=args.track_length)
+        await server.start(host, args.port)
+
+    bot = BenchmarkBot()
+    await Nodes.create(bot, {
+        "identifier": "BENCHMARK",
+        "host": host,
+        "port": args.port,
+        "password": args.password,
+        "https": False
+    })
+
+    try:
+        print(await bench_search(args.queries, args.distinct, args.concurrency))
+        print(f"search cache: {Search.get_stats()}")
+        players = await create_players(bot, args.players)
+        print(await bench_play(bot, players))
+        print(await bench_skip(bot, players, args.skips))
+        print(await bench_track_end(bot, players, args.tracks))
+        print(f"mailboxes: {Mailbox.get_stats()}")
+    finally:
+        for node in Nodes.get_nodes():
+            node._players.clear()
+            await node.disconnect(force=True)
+        if server is not None:
+            await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
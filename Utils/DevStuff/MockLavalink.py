@@ -0,0 +1,382 @@
+"""Local stand-in for Lavalink server (v3 protocol, which wavelink 1.3 uses).
+
+Returns synthetic tracks instead of YouTube ones and emits player events over the
+websocket, so the music module can be tested and benchmarked without Lavalink and
+YouTube. Latency, failures and stuck tracks can be injected on start or at runtime:
+
+    python -m Utils.DevStuff.MockLavalink --port 2333 --latency 50 --failure-rate 0.05
+
+Runtime control (Authorization header is required):
+    GET /mock/settings, PATCH /mock/settings - read or change settings (json)
+    GET /mock/stats - counters of requests and events
+    POST /mock/close - drop all websocket connections (to test node recovery)"""
+
+from aiohttp import web
+import asyncio, argparse, base64, hashlib, json, random, time
+
+
+DEFAULT_SETTINGS = {
+    "password": "youshallnotpass",
+    # Delay of every REST response (milliseconds) and random addition to it
+    "latency": 0.0,
+    "jitter": 0.0,
+    # Share of REST requests which fail (half with HTTP 500, half with LOAD_FAILED)
+    "failure_rate": 0.0,
+    # Share of played tracks which get stuck or fail with exception
+    "stuck_rate": 0.0,
+    "exception_rate": 0.0,
+    # Length of every track (seconds) and playback speed (10 - track ends 10 times faster)
+    "track_length": 180.0,
+    "speed": 1.0,
+    # Amount of tracks in search results and playlists
+    "search_results": 5,
+    "playlist_size": 100,
+    # How often (in seconds) stats and player updates are sent
+    "stats_interval": 60.0,
+    "update_interval": 5.0,
+    # Values reported in stats, used by node penalty
+    "system_load": 0.1,
+    "frames_deficit": 0,
+    "frames_nulled": 0
+}
+
+
+def video_id(seed: str) -> str:
+    return base64.urlsafe_b64encode(hashlib.sha1(seed.encode()).digest()).decode()[:11]
+
+
+# Real Lavalink tracks are binary, here they are just encoded track info
+def encode(info: dict) -> str:
+    return base64.b64encode(json.dumps(info).encode()).decode()
+
+
+def decode(track: str) -> dict:
+    return json.loads(base64.b64decode(track))
+
+
+class MockLavalink():
+    def __init__(self, **settings):
+        self.settings = {**DEFAULT_SETTINGS, **settings}
+        self.started = time.time()
+        self.sockets = set()
+        # Players by guild ID
+        self.players = {}
+        self.stats = {
+            "loadtracks": 0,
+            "decodetrack": 0,
+            "failures": 0,
+            "plays": 0,
+            "events": 0,
+            "connections": 0
+        }
+
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get("/", self.websocket),
+            web.get("/loadtracks", self.loadtracks),
+            web.get("/decodetrack", self.decodetrack),
+            web.post("/decodetracks", self.decodetracks),
+            web.get("/mock/settings", self.get_settings),
+            web.patch("/mock/settings", self.update_settings),
+            web.get("/mock/stats", self.get_stats),
+            web.post("/mock/close", self.close)
+        ])
+        self.runner = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 2333):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+
+    async def stop(self):
+        for ws in list(self.sockets):
+            await ws.close()
+        for player in self.players.values():
+            self.cancel(player)
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def authorized(self, request: web.Request) -> bool:
+        return request.headers.get("Authorization") == self.settings["password"]
+
+    async def delay(self):
+        latency = self.settings["latency"] + random.uniform(0, self.settings["jitter"])
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def track(self, identifier: str, title: str) -> dict:
+        info = {
+            "identifier": identifier,
+            "isSeekable": True,
+            "author": "Mock Artist",
+            "length": int(self.settings["track_length"] * 1000),
+            "isStream": False,
+            "position": 0,
+            "title": title,
+            "uri": f"https://www.youtube.com/watch?v={identifier}",
+            "sourceName": "youtube"
+        }
+        return {"track": encode(info), "info": info}
+
+    # REST
+
+    async def loadtracks(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        self.stats["loadtracks"] += 1
+        await self.delay()
+
+        if random.random() < self.settings["failure_rate"]:
+            self.stats["failures"] += 1
+            if random.random() < 0.5:
+                return web.json_response({"error": "Mock failure"}, status=500)
+            return web.json_response({
+                "loadType": "LOAD_FAILED",
+                "playlistInfo": {},
+                "tracks": [],
+                "exception": {"message": "Mock failure", "severity": "COMMON"}
+            })
+
+        identifier = request.query.get("identifier", "")
+        result = {"loadType": "NO_MATCHES", "playlistInfo": {}, "tracks": []}
+
+        if identifier.startswith("ytsearch:"):
+            query = identifier[len("ytsearch:"):]
+            if "nomatch" not in query:
+                result["loadType"] = "SEARCH_RESULT"
+                result["tracks"] = [
+                    self.track(video_id(f"{query}/{index}"), f"{query} #{index + 1}")
+                    for index in range(self.settings["search_results"])
+                ]
+        elif "list=" in identifier and "v=" not in identifier:
+            playlist = identifier.split("list=")[1].split("&")[0]
+            result["loadType"] = "PLAYLIST_LOADED"
+            result["playlistInfo"] = {"name": f"Mock playlist {playlist}", "selectedTrack": -1}
+            result["tracks"] = [
+                self.track(video_id(f"{playlist}/{index}"), f"Playlist {playlist} track #{index + 1}")
+                for index in range(self.settings["playlist_size"])
+            ]
+        elif "v=" in identifier or "youtu.be/" in identifier:
+            if "v=" in identifier:
+                video = identifier.split("v=")[1].split("&")[0]
+            else:
+                video = identifier.split("youtu.be/")[1].split("?")[0]
+            result["loadType"] = "TRACK_LOADED"
+            result["tracks"] = [self.track(video, f"Video {video}")]
+
+        return web.json_response(result)
+
+    async def decodetrack(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        self.stats["decodetrack"] += 1
+        await self.delay()
+        try:
+            return web.json_response(decode(request.query["track"]))
+        except Exception:
+            return web.json_response({"error": "Invalid track"}, status=500)
+
+    async def decodetracks(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        await self.delay()
+        tracks = await request.json()
+        return web.json_response([{"track": track, "info": decode(track)} for track in tracks])
+
+    async def get_settings(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        return web.json_response(self.settings)
+
+    async def update_settings(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        changes = await request.json()
+        self.settings.update({key: value for key, value in changes.items() if key in DEFAULT_SETTINGS})
+        return web.json_response(self.settings)
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        return web.json_response({**self.stats, "players": len(self.players)})
+
+    async def close(self, request: web.Request) -> web.Response:
+        if not self.authorized(request):
+            return web.Response(status=401)
+        for ws in list(self.sockets):
+            await ws.close()
+        return web.json_response({"closed": True})
+
+    # Websocket
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        if not self.authorized(request):
+            return web.Response(status=401)
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.add(ws)
+        self.stats["connections"] += 1
+        updater = asyncio.ensure_future(self.send_updates(ws))
+
+        try:
+            await self.send(ws, self.build_stats())
+            async for message in ws:
+                if message.type == web.WSMsgType.TEXT:
+                    await self.handle(ws, json.loads(message.data))
+        finally:
+            updater.cancel()
+            self.sockets.discard(ws)
+            for guild_id, player in list(self.players.items()):
+                if player["ws"] is ws:
+                    self.cancel(player)
+                    del self.players[guild_id]
+        return ws
+
+    async def send(self, ws: web.WebSocketResponse, data: dict):
+        if not ws.closed:
+            await ws.send_str(json.dumps(data))
+
+    async def event(self, player: dict, name: str, **data):
+        self.stats["events"] += 1
+        await self.send(player["ws"], {
+            "op": "event",
+            "type": name,
+            "guildId": player["guild_id"],
+            "track": player["track"],
+            **data
+        })
+
+    def build_stats(self) -> dict:
+        return {
+            "op": "stats",
+            "players": len(self.players),
+            "playingPlayers": sum(1 for player in self.players.values() if player["track"] and not player["paused"]),
+            "uptime": int((time.time() - self.started) * 1000),
+            "memory": {"free": 100000000, "used": 50000000, "allocated": 150000000, "reservable": 500000000},
+            "cpu": {"cores": 4, "systemLoad": self.settings["system_load"], "lavalinkLoad": self.settings["system_load"] / 2},
+            "frameStats": {"sent": 3000, "nulled": self.settings["frames_nulled"], "deficit": self.settings["frames_deficit"]}
+        }
+
+    async def send_updates(self, ws: web.WebSocketResponse):
+        last_stats = time.monotonic()
+        while not ws.closed:
+            await asyncio.sleep(self.settings["update_interval"])
+            for player in list(self.players.values()):
+                if player["ws"] is ws and player["track"]:
+                    await self.send(ws, {
+                        "op": "playerUpdate",
+                        "guildId": player["guild_id"],
+                        "state": {"time": int(time.time() * 1000), "position": int(self.position(player) * 1000), "connected": True}
+                    })
+            if time.monotonic() - last_stats >= self.settings["stats_interval"]:
+                last_stats = time.monotonic()
+                await self.send(ws, self.build_stats())
+
+    # Players
+
+    def position(self, player: dict) -> float:
+        if player["paused"] or player["started"] is None:
+            return player["position"]
+        return player["position"] + (time.monotonic() - player["started"]) * self.settings["speed"]
+
+    def cancel(self, player: dict):
+        if player["task"] is not None:
+            player["task"].cancel()
+            player["task"] = None
+
+    # Schedules end of the current track (and stuck/exception events) from the current position
+    def schedule(self, player: dict):
+        self.cancel(player)
+        if player["track"] and not player["paused"]:
+            left = max(decode(player["track"])["length"] / 1000 - player["position"], 0) / self.settings["speed"]
+            player["started"] = time.monotonic()
+            player["task"] = asyncio.ensure_future(self.finish(player, left))
+
+    async def finish(self, player: dict, left: float):
+        if random.random() < self.settings["stuck_rate"]:
+            await asyncio.sleep(left / 2)
+            await self.event(player, "TrackStuckEvent", thresholdMs=10000)
+        elif random.random() < self.settings["exception_rate"]:
+            await asyncio.sleep(left / 2)
+            await self.event(player, "TrackExceptionEvent", exception={"message": "Mock exception", "severity": "COMMON"})
+            return await self.end(player, "LOAD_FAILED")
+        else:
+            await asyncio.sleep(left)
+        await self.end(player, "FINISHED")
+
+    async def end(self, player: dict, reason: str):
+        player["task"] = None
+        if player["track"] is None:
+            return
+        await self.event(player, "TrackEndEvent", reason=reason)
+        player["track"] = None
+
+    async def handle(self, ws: web.WebSocketResponse, data: dict):
+        op = data.get("op")
+        guild_id = data.get("guildId")
+        if guild_id is None:
+            return
+
+        player = self.players.get(guild_id)
+        if player is None:
+            player = self.players[guild_id] = {
+                "ws": ws, "guild_id": guild_id, "track": None, "position": 0, "started": None,
+                "paused": False, "volume": 100, "task": None
+            }
+        player["ws"] = ws
+
+        if op == "play":
+            if player["track"] and data.get("noReplace"):
+                return
+            self.stats["plays"] += 1
+            if player["track"]:
+                self.cancel(player)
+                await self.event(player, "TrackEndEvent", reason="REPLACED")
+            player["track"] = data["track"]
+            player["position"] = int(data.get("startTime", 0)) / 1000
+            player["paused"] = bool(data.get("pause", player["paused"]))
+            player["volume"] = int(data.get("volume", player["volume"]))
+            await self.event(player, "TrackStartEvent")
+            self.schedule(player)
+        elif op == "stop":
+            self.cancel(player)
+            await self.end(player, "STOPPED")
+        elif op == "pause":
+            player["position"] = self.position(player)
+            player["paused"] = bool(data.get("pause"))
+            self.cancel(player)
+            self.schedule(player)
+        elif op == "seek":
+            player["position"] = int(data.get("position", 0)) / 1000
+            self.schedule(player)
+        elif op == "volume":
+            player["volume"] = int(data.get("volume", 100))
+        elif op == "destroy":
+            self.cancel(player)
+            del self.players[guild_id]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Mock Lavalink server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2333)
+    for key, value in DEFAULT_SETTINGS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+
+    server = MockLavalink(**args)
+    await server.start(host, port)
+    print(f"Mock Lavalink is listening on {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
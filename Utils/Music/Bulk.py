@@ -0,0 +1,126 @@
+"""Import of many tracks with one command: playlist links and lists of queries
+(separated by new lines or ";"). Queries are resolved concurrently, tracks are put
+into the queue in the original order, progress is shown in one message."""
+
+import discord, wavelink, asyncio, re, Config
+
+from Data.Localizations import Embeds
+from Utils.Bot import Logger
+from Utils.Music import Search, Prefetch, Nodes, Queue, Mailbox
+
+
+SEPARATOR_REGEX = re.compile(r"[\n;]")
+PLAYLIST_REGEX = re.compile(r"^https?://\S*[?&]list=[\w-]+", re.IGNORECASE)
+
+
+def split(query: str) -> list:
+    return [part.strip() for part in SEPARATOR_REGEX.split(query) if part.strip()]
+
+
+# Links to the video inside the playlist (with "v=" parameter) are played as a single video
+def is_playlist(query: str) -> bool:
+    return bool(PLAYLIST_REGEX.match(query)) and "v=" not in query
+
+
+def is_bulk(query: str) -> bool:
+    parts = split(query)
+    return len(parts) > 1 or (len(parts) == 1 and is_playlist(parts[0]))
+
+
+async def resolve(query: str, semaphore: asyncio.Semaphore) -> list:
+    async with semaphore:
+        if is_playlist(query):
+            playlist = await Nodes.best().get_playlist(wavelink.YouTubePlaylist, query)
+            return list(playlist.tracks) if playlist else []
+        return [await Search.search(query)]
+
+
+# Resolves all queries and puts found tracks into the queue of the player in order.
+# If {start} is passed and nothing is playing when the first track is found, the track is given to it
+# instead of the queue. Queries are resolved outside of the guild mailbox, only every insert goes through it
+async def run(player: wavelink.Player, query: str, message: discord.Message, language: str, start=None) -> dict:
+    queries = split(query)
+    semaphore = asyncio.Semaphore(Config.Music.import_concurrency())
+    tasks = [asyncio.ensure_future(resolve(part, semaphore)) for part in queries]
+
+    state = {
+        "total": len(queries),
+        "resolved": 0,
+        "added": 0,
+        # Queries which gave no tracks
+        "failed": 0,
+        # Found tracks which were not added: too long, queue is full or import limit is reached
+        "skipped": 0
+    }
+    finished = asyncio.Event()
+    reporter = asyncio.ensure_future(report(message, language, state, finished))
+
+    async def insert(track: wavelink.abc.Playable) -> bool:
+        nonlocal start
+        first, start = start, None
+        if first is not None and player.queue.is_empty and not player.is_playing():
+            await first(track)
+            return True
+        if Queue.is_full(player):
+            return False
+        await player.queue.put_wait(track)
+        return True
+
+    try:
+        for part, task in zip(queries, tasks):
+            try:
+                tracks = await task
+            except Exception as error:
+                Logger.log("MUSIC", "WARNING", f"Failed to import {part}: {error} (Guild ID: {player.guild.id})", guild_id=player.guild.id)
+                tracks = []
+
+            state["resolved"] += 1
+            if not tracks:
+                state["failed"] += 1
+
+            for track in tracks:
+                if (
+                    state["added"] >= Config.Music.import_max_tracks()
+                    or int(track.duration) > 3600
+                    or not await Mailbox.run(player.guild.id, insert, track)
+                ):
+                    state["skipped"] += 1
+                    continue
+                state["added"] += 1
+
+            # Next tracks are revalidated as soon as they appear at the head of the queue
+            if state["added"] and player.queue.count <= Config.Music.prefetch_tracks():
+                Prefetch.schedule(player)
+    finally:
+        for task in tasks:
+            task.cancel()
+        finished.set()
+        await reporter
+
+    return state
+
+
+# Edits progress message at most once per Config.Music.import_progress_interval,
+# only if something has changed. The last edit is always done after the import is finished
+async def report(message: discord.Message, language: str, state: dict, finished: asyncio.Event):
+    # Progress message is sent with zero progress
+    shown = (0, 0, 0, 0)
+    while True:
+        done = finished.is_set()
+        current = (state["resolved"], state["added"], state["failed"], state["skipped"])
+        if current != shown or done:
+            shown = current
+            try:
+                if done:
+                    await message.edit(embed=Embeds.Music.import_finished(language, **state))
+                else:
+                    await message.edit(embed=Embeds.Music.import_progress(language, **state))
+            except Exception as error:
+                Logger.log("MUSIC", "WARNING", f"Failed to update import progress: {error}")
+        if done:
+            return
+
+        try:
+            await asyncio.wait_for(finished.wait(), timeout=Config.Music.import_progress_interval())
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,101 @@
+"""Coalesced edits of player messages. Every message is edited not more often than once
+in Config.Music.player_edit_interval seconds: edits requested in between are merged,
+so only the latest embed and view are sent, and fields equal to the already sent
+ones are not sent at all. Edits are sent by a task of the message, callers don't wait for them."""
+
+import discord, asyncio, json, time, Config
+from cachetools import TTLCache
+from Utils.Bot import Logger
+
+# Message ID -> fields of the next edit
+pending = {}
+# Message ID -> message to edit
+messages = {}
+# Message ID -> task which sends edits of the message
+tasks = {}
+# Message ID -> {field: signature of the last sent value}
+sent = TTLCache(maxsize=10000, ttl=3600)
+# Message ID -> time of the last edit
+last_time = TTLCache(maxsize=10000, ttl=3600)
+
+stats = {
+    "requested": 0,
+    "sent": 0,
+    "merged": 0,
+    "skipped": 0,
+    "failed": 0
+}
+
+
+# Views are compared by object too: a new view has to be sent to handle interactions
+def signature(name: str, value) -> str:
+    if value is None:
+        return "null"
+    if name == "embed":
+        return json.dumps(value.to_dict(), sort_keys=True, default=str)
+    if name == "view":
+        return f"{id(value)}:{json.dumps(value.to_components(), sort_keys=True, default=str)}"
+    return repr(value)
+
+
+# Requests edit of the message. If an edit is already waiting, fields are merged into it
+def edit(message: discord.Message, **fields):
+    if message is None:
+        return
+
+    stats["requested"] += 1
+    if message.id in pending:
+        stats["merged"] += 1
+        pending[message.id].update(fields)
+    else:
+        pending[message.id] = fields
+    messages[message.id] = message
+
+    if message.id not in tasks:
+        tasks[message.id] = asyncio.ensure_future(flush(message.id))
+
+
+def forget(message_id: int):
+    pending.pop(message_id, None)
+    messages.pop(message_id, None)
+    sent.pop(message_id, None)
+    last_time.pop(message_id, None)
+
+
+async def flush(message_id: int):
+    try:
+        while message_id in pending:
+            delay = last_time.get(message_id, 0) + Config.Music.player_edit_interval() - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            fields = pending.pop(message_id, None)
+            message = messages.pop(message_id, None)
+            if fields is None or message is None:
+                return
+
+            signatures = sent.get(message_id, {})
+            changed = {name: value for name, value in fields.items() if signatures.get(name) != signature(name, value)}
+            if not changed:
+                stats["skipped"] += 1
+                continue
+
+            last_time[message_id] = time.monotonic()
+            try:
+                await message.edit(**changed)
+            except discord.NotFound:
+                forget(message_id)
+                return
+            except discord.HTTPException as error:
+                stats["failed"] += 1
+                Logger.log("MUSIC", "ERROR", f"Failed to edit player message {message_id}: {error}")
+                continue
+
+            stats["sent"] += 1
+            sent[message_id] = {**signatures, **{name: signature(name, value) for name, value in changed.items()}}
+    finally:
+        tasks.pop(message_id, None)
+
+
+def get_stats() -> dict:
+    return {**stats, "pending": len(pending), "tasks": len(tasks)}
@@ -0,0 +1,59 @@
+"""Playback history of every guild. Only encoded tracks are stored (bounded by
+Config.Music.history_size), tracks are built back by Lavalink when user returns to them."""
+
+import wavelink, asyncio, collections, Config
+
+
+# Encoded tracks by guild ID, oldest first
+histories = {}
+
+# Guilds where next track end is caused by return to the previous track,
+# so the ended track must not be added to the history
+returning = set()
+
+
+def push(guild_id: int, track: wavelink.Track):
+    if guild_id in returning:
+        returning.discard(guild_id)
+        return
+
+    history = histories.get(guild_id)
+    if history is None:
+        history = histories[guild_id] = collections.deque(maxlen=Config.Music.history_size())
+    history.append(track.id)
+
+
+def size(guild_id: int) -> int:
+    return len(histories.get(guild_id, ()))
+
+
+# Puts last {steps} tracks of the history (and the current one) at the front of the queue.
+# Returns the track which will be played next, or None if the history is empty.
+# If nothing is playing, the returned track is not queued: caller has to play it
+async def go_back(player: wavelink.Player, steps: int = 1):
+    history = histories.get(player.guild.id)
+    if not history:
+        return None
+
+    steps = max(1, min(steps, len(history)))
+    encoded = [history[-step] for step in range(1, steps + 1)]
+    tracks = await asyncio.gather(*[
+        player.node.build_track(cls=wavelink.YouTubeTrack, identifier=identifier) for identifier in encoded
+    ])
+    for _ in range(steps):
+        history.pop()
+
+    if player.track is not None:
+        player.queue.put_at_front(player.track)
+        returning.add(player.guild.id)
+        queued = tracks
+    else:
+        queued = tracks[:-1]
+    for track in queued:
+        player.queue.put_at_front(track)
+    return tracks[-1]
+
+
+def forget(guild_id: int):
+    histories.pop(guild_id, None)
+    returning.discard(guild_id)
@@ -0,0 +1,158 @@
+"""Serial execution of player operations. Commands, player buttons and Lavalink events
+of a guild are put into the mailbox of the guild and run one by one by its worker,
+so they never interleave on the same player. Guilds are processed concurrently,
+the worker of a guild exists only while its mailbox is not empty.
+Interactions are acknowledged before they get into the mailbox, and slow parts
+(searches, playlist imports) run outside of it: only player changes wait for their turn."""
+
+import asyncio, collections, contextlib, functools, time
+
+# Guild ID -> deque of (function, args, kwargs, future, time of submit)
+mailboxes = {}
+# Guild ID -> task which runs operations of the guild
+workers = {}
+# Guild ID -> task which holds the turn of the guild with hold()
+holders = {}
+
+stats = {
+    "submitted": 0,
+    "processed": 0,
+    "cancelled": 0,
+    "max_depth": 0,
+    "total_wait": 0,
+    "max_wait": 0
+}
+
+
+# True if the current task already has the turn of the guild
+def is_owner(guild_id: int) -> bool:
+    task = asyncio.current_task()
+    return workers.get(guild_id) is task or holders.get(guild_id) is task
+
+
+# Puts {function} into the mailbox of the guild. Returns future of its result
+def submit(guild_id: int, function, *args, **kwargs) -> asyncio.Future:
+    future = asyncio.get_event_loop().create_future()
+    mailbox = mailboxes.setdefault(guild_id, collections.deque())
+    mailbox.append((function, args, kwargs, future, time.perf_counter()))
+    stats["submitted"] += 1
+    stats["max_depth"] = max(stats["max_depth"], len(mailbox))
+
+    if guild_id not in workers:
+        workers[guild_id] = asyncio.ensure_future(work(guild_id))
+    return future
+
+
+# Runs {function} in the mailbox of the guild and returns its result.
+# Calls made by an operation of the same guild run in place, otherwise they would wait for themselves
+async def run(guild_id: int, function, *args, **kwargs):
+    if guild_id is None or is_owner(guild_id):
+        return await function(*args, **kwargs)
+    return await submit(guild_id, function, *args, **kwargs)
+
+
+async def work(guild_id: int):
+    mailbox = mailboxes[guild_id]
+    try:
+        while mailbox:
+            function, args, kwargs, future, submitted = mailbox.popleft()
+            # Caller doesn't wait anymore (interaction has expired, bot is closing...)
+            if future.done():
+                stats["cancelled"] += 1
+                continue
+
+            wait = (time.perf_counter() - submitted) * 1000
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+
+            try:
+                result = await function(*args, **kwargs)
+            except BaseException as error:
+                # Failure of one operation (cancellation too) goes to its caller only, the others still run
+                if not future.done():
+                    if isinstance(error, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
+                # Unless the worker itself is cancelled or the bot is shutting down
+                if isinstance(error, (KeyboardInterrupt, SystemExit)) or asyncio.current_task().cancelling():
+                    raise
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                stats["processed"] += 1
+    finally:
+        workers.pop(guild_id, None)
+        for *_, future, _ in mailboxes.pop(guild_id, ()):
+            future.cancel()
+
+
+# Takes the turn of the guild for the block: it waits for the earlier operations of the guild
+# and the later ones wait for it. Used for the part of a command which changes the player
+@contextlib.asynccontextmanager
+async def hold(guild_id: int):
+    if guild_id is None or is_owner(guild_id):
+        yield
+        return
+
+    loop = asyncio.get_event_loop()
+    entered = loop.create_future()
+    released = loop.create_future()
+
+    async def turn():
+        # Caller has left before its turn came
+        if entered.done():
+            return
+        entered.set_result(None)
+        await released
+
+    operation = submit(guild_id, turn)
+    task = asyncio.current_task()
+    try:
+        await asyncio.wait([entered, operation], return_when=asyncio.FIRST_COMPLETED)
+        if not entered.done():
+            # The worker was cancelled before the turn came
+            raise asyncio.CancelledError()
+        holders[guild_id] = task
+        yield
+    finally:
+        if holders.get(guild_id) is task:
+            del holders[guild_id]
+        if not entered.done():
+            entered.cancel()
+        if not released.done():
+            released.set_result(None)
+
+
+# Guild of the operation is taken from the first argument which has it: context, interaction, member or player
+def guild_id_of(args: tuple):
+    for arg in args:
+        guild = getattr(arg, "guild", None)
+        if guild is not None:
+            return guild.id
+    return None
+
+
+# Decorator for listeners which change the player of the guild. Commands and buttons use hold(),
+# their interactions have to be acknowledged before they wait for the turn
+def serial(function):
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        return await run(guild_id_of(args), function, *args, **kwargs)
+    return wrapper
+
+
+def depth(guild_id: int) -> int:
+    return len(mailboxes.get(guild_id, ()))
+
+
+def get_stats() -> dict:
+    return {
+        **stats,
+        "guilds": len(workers),
+        "queued": sum(len(mailbox) for mailbox in mailboxes.values()),
+        "total_wait": round(stats["total_wait"], 1),
+        "max_wait": round(stats["max_wait"], 1),
+        "average_wait": round(stats["total_wait"] / stats["processed"], 1) if stats["processed"] else 0
+    }
@@ -0,0 +1,208 @@
+"""Pool of Lavalink nodes (Config.Lavalink.nodes). New players and searches
+are placed on the connected node with the lowest penalty. Lost nodes are
+reconnected and their players are moved to a healthy node."""
+
+import discord, wavelink, asyncio, collections, functools, random, time, Config
+from Utils.Bot import Logger
+from Utils.Music import Queue
+
+
+# Connected nodes by identifier
+nodes = {}
+
+# Lost nodes by identifier: time (perf_counter) when the loss was detected
+down = {}
+
+# Last recoveries of lost nodes
+recoveries = collections.deque(maxlen=20)
+
+
+async def create(bot: discord.Bot, config: dict) -> wavelink.Node:
+    node = await wavelink.NodePool.create_node(
+        bot = bot,
+        host = config["host"],
+        port = config["port"],
+        password = config["password"],
+        https = config.get("https", True),
+        identifier = config["identifier"]
+    )
+    if not node.is_connected():
+        await node.disconnect(force=True)
+        raise ConnectionError(f"Node {config['identifier']} is not connected")
+    nodes[config["identifier"]] = node
+    return node
+
+
+async def connect(bot: discord.Bot):
+    for config in Config.Lavalink.nodes():
+        try:
+            await create(bot, config)
+        except Exception as error:
+            Logger.log("WAVELINK", "ERROR", f"Failed to connect node {config['identifier']}: {error}")
+
+
+def get_nodes() -> list:
+    return list(nodes.values())
+
+
+def is_available(node: wavelink.Node) -> bool:
+    return node.is_connected()
+
+
+def get_players(node: wavelink.Node) -> int:
+    return len(node.players)
+
+
+# Lavalink penalty (wavelink computes it from node stats): playing players,
+# exponential CPU penalty and penalties for deficit and nulled audio frames.
+# Until the first stats are received, the node is rated by amount of its players
+def get_penalty(node: wavelink.Node) -> float:
+    if node.stats is None:
+        return get_players(node)
+    return node.stats.penalty.total
+
+
+def get_healthy() -> list:
+    return [node for node in get_nodes() if is_available(node)]
+
+
+def best() -> wavelink.Node:
+    available = get_healthy()
+    if not available:
+        # Let wavelink raise its usual error about missing nodes
+        return wavelink.NodePool.get_node()
+    return min(available, key=get_penalty)
+
+
+# Used as cls in VoiceChannel.connect, so the player is created on the best node
+def player() -> functools.partial:
+    return functools.partial(Queue.Player, node=best())
+
+
+def get_metrics() -> list:
+    metrics = []
+    for node in get_nodes():
+        stats = node.stats
+        metrics.append({
+            "identifier": node.identifier,
+            "connected": is_available(node),
+            "players": get_players(node),
+            "playing": stats.playing_players if stats else None,
+            "cpu": round(stats.system_load * 100, 1) if stats else None,
+            "frames_deficit": stats.frames_deficit if stats else None,
+            "frames_nulled": stats.frames_nulled if stats else None,
+            "penalty": round(get_penalty(node), 1)
+        })
+    return metrics
+
+
+async def monitor(bot: discord.Bot):
+    while not bot.is_closed():
+        for identifier, node in list(nodes.items()):
+            if identifier in down or is_available(node):
+                continue
+            down[identifier] = time.perf_counter()
+            Logger.log("WAVELINK", "WARNING", f"Node {identifier} is lost. Players: {get_players(node)}")
+            asyncio.ensure_future(recover(bot, identifier, node))
+        await asyncio.sleep(Config.Lavalink.health_check_interval())
+
+
+# Moves players of the lost node to healthy nodes, then reconnects the lost node.
+# Players which had nowhere to go (no healthy nodes) are moved back to the reconnected node
+async def recover(bot: discord.Bot, identifier: str, node: wavelink.Node):
+    started = down[identifier]
+    record = {
+        "identifier": identifier,
+        "time": time.time(),
+        "players": get_players(node),
+        "migrated": 0,
+        "migration_time": None,
+        "reconnect_time": None
+    }
+    recoveries.append(record)
+
+    try:
+        waiting = []
+        for player in list(node.players):
+            healthy = get_healthy()
+            if not healthy:
+                waiting.append(player)
+                continue
+            if await migrate(player, min(healthy, key=get_penalty)):
+                record["migrated"] += 1
+        if not waiting:
+            record["migration_time"] = round((time.perf_counter() - started) * 1000, 1)
+
+        new_node = await reconnect(bot, identifier, node)
+        record["reconnect_time"] = round(time.perf_counter() - started, 1)
+
+        for player in waiting:
+            if await migrate(player, new_node):
+                record["migrated"] += 1
+        if waiting:
+            record["migration_time"] = round((time.perf_counter() - started) * 1000, 1)
+
+        Logger.log(
+            "WAVELINK", "INFO",
+            f"Node {identifier} recovered in {record['reconnect_time']}s. Moved players: {record['migrated']}/{record['players']}"
+        )
+    finally:
+        down.pop(identifier, None)
+
+
+# Reconnects until success, waiting random time up to exponentially growing delay (full jitter)
+async def reconnect(bot: discord.Bot, identifier: str, node: wavelink.Node) -> wavelink.Node:
+    config = next(config for config in Config.Lavalink.nodes() if config["identifier"] == identifier)
+    nodes.pop(identifier, None)
+    try:
+        # Players are not destroyed here, they were taken from the node already (or are waiting for it)
+        node._players.clear()
+        await node.disconnect(force=True)
+    except Exception:
+        pass
+
+    attempt = 0
+    while True:
+        delay = min(Config.Lavalink.reconnect_max_delay(), Config.Lavalink.reconnect_base_delay() * 2 ** attempt)
+        await asyncio.sleep(random.uniform(0, delay))
+        try:
+            return await create(bot, config)
+        except Exception as error:
+            attempt += 1
+            Logger.log("WAVELINK", "WARNING", f"Failed to reconnect node {identifier} (attempt {attempt}): {error}")
+
+
+# Position (in seconds) of the current track. It's unknown until the first player update from Lavalink after play
+def get_position(player: wavelink.Player) -> float:
+    return player.position if player.last_update and player.last_update.timestamp() > 0 else 0
+
+
+# wavelink 1.3 can't move a player to other node, so it's done by hand: voice state is sent
+# to the new node and the current track is started from the same position.
+# Queue, loop flag and other attributes stay on the same player object
+async def migrate(player: wavelink.Player, node: wavelink.Node) -> bool:
+    try:
+        track = player.track
+        position = get_position(player)
+        paused = player.is_paused()
+        volume = player.volume
+
+        if player in player.node._players:
+            player.node._players.remove(player)
+        player.node = node
+        node._players.append(player)
+        await player._dispatch_voice_update(player._voice_state)
+
+        if track is not None:
+            await player.play(track, start=int(min(position, track.length) * 1000), volume=volume, pause=paused)
+        else:
+            await player.set_volume(volume)
+        return True
+    except Exception as error:
+        Logger.log("WAVELINK", "ERROR", f"Failed to move player of guild {player.guild.id} to node {node.identifier}: {error}")
+        Logger.log_traceback()
+        return False
+
+
+def get_recoveries() -> list:
+    return list(recoveries)
@@ -0,0 +1,110 @@
+"""Ahead-of-time resolution of the next queued tracks. While the current track is playing,
+next entries of the queue are loaded again from Lavalink, so unplayable tracks are found
+before the current track ends and the next one can be played right away."""
+
+import wavelink, asyncio, time, Config
+from Utils.Bot import Logger
+from Utils.Music import Queue
+
+
+# Revalidated tracks by guild ID: {guild_id: {track_id: track or None if track is unplayable}}
+resolved = {}
+
+# Running prefetch tasks by guild ID
+tasks = {}
+
+# Track end time by guild ID, used to measure time until next track starts
+transitions = {}
+
+stats = {
+    "transitions": 0,
+    "total_time": 0,
+    "last_time": 0,
+    "max_time": 0,
+    "prefetched": 0,
+    "unplayable": 0
+}
+
+
+def schedule(player: wavelink.Player):
+    guild_id = player.guild.id
+    task = tasks.get(guild_id)
+    if task is not None and not task.done():
+        task.cancel()
+    tasks[guild_id] = asyncio.ensure_future(prefetch(player))
+
+
+async def prefetch(player: wavelink.Player):
+    ready = resolved.setdefault(player.guild.id, {})
+    upcoming = [track for track, _ in zip(player.queue, range(Config.Music.prefetch_tracks()))]
+
+    # Entries which left the head of the queue are not needed anymore
+    for track_id in set(ready) - {track.id for track in upcoming}:
+        ready.pop(track_id, None)
+
+    for track in upcoming:
+        if track.id not in ready:
+            ready[track.id] = await revalidate(player.node, track)
+
+
+# Loads track from its link again. Returns fresh track, or None if it can't be played anymore
+async def revalidate(node: wavelink.Node, track: wavelink.YouTubeTrack):
+    if not track.uri:
+        return track
+
+    try:
+        tracks = await node.get_tracks(wavelink.YouTubeTrack, track.uri)
+    except Exception as error:
+        # Lavalink is unavailable, so it's unknown if track is playable. It will be checked on play
+        Logger.log("MUSIC", "WARNING", f"Failed to prefetch track {track.uri}: {error}")
+        return track
+
+    if not tracks:
+        return None
+    return tracks[0]
+
+
+# Returns prefetched version of the track from the queue, or None if the track is unplayable
+def take(player: wavelink.Player, track: wavelink.YouTubeTrack):
+    ready = resolved.get(player.guild.id)
+    if ready is None or track.id not in ready:
+        return Queue.hydrate(track)
+
+    fresh = ready.pop(track.id)
+    if fresh is None:
+        stats["unplayable"] += 1
+        Logger.log("MUSIC", "WARNING", f"Track {track.uri} is unplayable and was skipped. Guild ID - {player.guild.id}")
+    else:
+        stats["prefetched"] += 1
+    return Queue.hydrate(fresh)
+
+
+def transition_started(guild_id: int):
+    transitions[guild_id] = time.perf_counter()
+
+
+def transition_finished(guild_id: int):
+    started = transitions.pop(guild_id, None)
+    if started is None:
+        return
+
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    stats["transitions"] += 1
+    stats["total_time"] += elapsed
+    stats["last_time"] = elapsed
+    stats["max_time"] = max(stats["max_time"], elapsed)
+
+
+def forget(guild_id: int):
+    task = tasks.pop(guild_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+    resolved.pop(guild_id, None)
+    transitions.pop(guild_id, None)
+
+
+def get_stats() -> dict:
+    return {
+        **stats,
+        "average_time": round(stats["total_time"] / stats["transitions"], 1) if stats["transitions"] else 0
+    }
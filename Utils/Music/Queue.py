@@ -0,0 +1,228 @@
+"""Compact player queue. Only the encoded track and the fields shown in embeds are
+kept for every queued track, full track is built back right before it is played.
+Size of every guild queue is limited by Config.Music.queue_max_tracks/queue_max_bytes."""
+
+import wavelink, collections, random, sys, Config
+
+
+class Entry(wavelink.abc.Playable):
+    __slots__ = ("id", "title", "author", "identifier", "uri", "length")
+
+    # Playable.__init__ is not called on purpose: raw track info is not stored
+    def __init__(self, id: str, title: str, author: str, identifier: str, uri: str, length: float):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.identifier = identifier
+        self.uri = uri
+        self.length = length
+
+    @classmethod
+    def from_track(cls, track: wavelink.abc.Playable):
+        if isinstance(track, Entry):
+            return track
+        return cls(
+            track.id,
+            getattr(track, "title", None),
+            getattr(track, "author", None),
+            getattr(track, "identifier", None),
+            getattr(track, "uri", None),
+            track.length
+        )
+
+    @property
+    def duration(self) -> float:
+        return self.length
+
+    @property
+    def thumbnail(self) -> str:
+        return f"https://img.youtube.com/vi/{self.identifier}/maxresdefault.jpg"
+
+    def __str__(self) -> str:
+        return self.title
+
+    # Encoded track is played by Lavalink, so the track is built from stored fields without requests
+    def hydrate(self) -> wavelink.YouTubeTrack:
+        return wavelink.YouTubeTrack(self.id, {
+            "title": self.title,
+            "author": self.author,
+            "identifier": self.identifier,
+            "uri": self.uri,
+            "length": int(self.length * 1000),
+            "isStream": False
+        })
+
+    # Fields in the order of __init__ arguments, used to store entry outside of memory
+    def dump(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + sum(sys.getsizeof(getattr(self, name)) for name in self.__slots__)
+
+
+# Player queue which stores compact entries, counts memory taken by them and keeps
+# an index of track IDs, so duplicates are known without scanning the whole queue
+class GuildQueue(wavelink.WaitQueue):
+    __slots__ = ("bytes", "ids", "duplicates", "listener")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bytes = 0
+        # Track ID -> amount of its entries in the queue
+        self.ids = collections.Counter()
+        # Amount of entries which are copies of an earlier entry
+        self.duplicates = 0
+        # Called with every change of the queue: (operation, *arguments)
+        self.listener = None
+
+    def _changed(self, *change):
+        if self.listener is not None:
+            self.listener(*change)
+
+    def _added(self, item: Entry):
+        self.bytes += item.size()
+        if self.ids[item.id]:
+            self.duplicates += 1
+        self.ids[item.id] += 1
+
+    def _removed(self, item: Entry):
+        self.bytes -= item.size()
+        self.ids[item.id] -= 1
+        if self.ids[item.id]:
+            self.duplicates -= 1
+        else:
+            del self.ids[item.id]
+
+    def _put(self, item: wavelink.abc.Playable):
+        item = Entry.from_track(item)
+        self._added(item)
+        super()._put(item)
+        self._changed("put", None, item)
+
+    def _insert(self, index: int, item: wavelink.abc.Playable):
+        item = Entry.from_track(item)
+        self._added(item)
+        super()._insert(index, item)
+        self._changed("put", index, item)
+
+    # WaitQueue._get is skipped: it keeps every played track in queue.history without a limit,
+    # the history of the guild is kept by History
+    def _get(self) -> Entry:
+        item = wavelink.Queue._get(self)
+        self._removed(item)
+        self._changed("delete", 0)
+        return item
+
+    def _drop(self) -> Entry:
+        item = super()._drop()
+        self._removed(item)
+        self._changed("delete", -1)
+        return item
+
+    def pop(self) -> Entry:
+        item = super().pop()
+        self._removed(item)
+        self._changed("delete", -1)
+        return item
+
+    def __delitem__(self, index: int):
+        self._removed(self._queue[index])
+        super().__delitem__(index)
+        self._changed("delete", index)
+
+    def __contains__(self, item: wavelink.abc.Playable) -> bool:
+        return item.id in self.ids
+
+    def copy(self) -> "GuildQueue":
+        queue = super().copy()
+        queue.bytes = self.bytes
+        queue.ids = self.ids.copy()
+        queue.duplicates = self.duplicates
+        return queue
+
+    def clear(self):
+        super().clear()
+        self.bytes = 0
+        self.ids.clear()
+        self.duplicates = 0
+        self._changed("reset")
+
+    # Returns index of the entry by its position (starting from 1) or by part of its title
+    def find(self, query: str):
+        query = query.strip()
+        if query.isdigit():
+            index = int(query) - 1
+            return index if 0 <= index < self.count else None
+
+        query = query.casefold()
+        for index, item in enumerate(self._queue):
+            if item.title and query in item.title.casefold():
+                return index
+        return None
+
+    def remove(self, index: int) -> Entry:
+        item = self._queue[index]
+        del self[index]
+        return item
+
+    def move(self, index: int, new_index: int) -> Entry:
+        item = self._queue[index]
+        del self._queue[index]
+        self._queue.insert(new_index, item)
+        self._changed("move", index, new_index)
+        return item
+
+    # Drops entries before {index}, so the entry at {index} becomes the next one
+    def jump(self, index: int) -> Entry:
+        for _ in range(index):
+            self._removed(self._queue.popleft())
+        self._changed("drop", index)
+        return self._queue[0]
+
+    # Removes repeated tracks, keeping their first entries. Returns amount of removed entries
+    def dedupe(self) -> int:
+        if not self.duplicates:
+            return 0
+
+        removed = self.duplicates
+        seen = set()
+        items = []
+        for item in self._queue:
+            if item.id in seen:
+                self.bytes -= item.size()
+                continue
+            seen.add(item.id)
+            items.append(item)
+
+        self._queue.clear()
+        self._queue.extend(items)
+        self.ids = collections.Counter(seen)
+        self.duplicates = 0
+        self._changed("reset")
+        return removed
+
+    def shuffle(self):
+        items = list(self._queue)
+        random.shuffle(items)
+        self._queue.clear()
+        self._queue.extend(items)
+        self._changed("reset")
+
+
+class Player(wavelink.Player):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queue = GuildQueue()
+
+
+def hydrate(track: wavelink.abc.Playable) -> wavelink.abc.Playable:
+    if isinstance(track, Entry):
+        return track.hydrate()
+    return track
+
+
+def is_full(player: wavelink.Player) -> bool:
+    return (
+        player.queue.count >= Config.Music.queue_max_tracks()
+        or getattr(player.queue, "bytes", 0) >= Config.Music.queue_max_bytes()
+    )
@@ -0,0 +1,122 @@
+"""Tracks search. Links and video IDs are loaded directly, free text is searched on YouTube.
+Results are shared between all guilds through LRU cache with TTL."""
+
+import wavelink, asyncio, re, Config
+from cachetools import TTLCache
+
+from Utils.Music import Suggestions, Nodes
+
+
+# Resolved tracks by normalized query.
+cache = TTLCache(maxsize=Config.Music.search_cache_size(), ttl=Config.Music.search_cache_time())
+
+# Searches which are running right now by normalized query.
+# Concurrent callers with the same query await one shared task.
+in_flight = {}
+
+stats = {
+    "hits": 0,
+    "misses": 0,
+    "coalesced": 0,
+    "direct": 0,
+    "text": 0
+}
+
+URL_REGEX = re.compile(r"^https?://\S+$", re.IGNORECASE)
+SHORT_LINK_REGEX = re.compile(r"^(?:https?://)?(?:www\.)?youtu\.be/([A-Za-z0-9_-]{11})", re.IGNORECASE)
+VIDEO_ID_REGEX = re.compile(r"^[A-Za-z0-9_-]{11}$")
+# Video link which can also point to a playlist (watch?v=X&list=Y), video ID is the first group
+WATCH_LINK_REGEX = re.compile(
+    r"^(?:https?://)?(?:www\.|m\.|music\.)?youtube\.com/watch\?\S*?(?<=[?&])v=([A-Za-z0-9_-]{11})", re.IGNORECASE
+)
+
+
+# Returns type of the query: url, short (youtu.be link), id (raw YouTube video ID) or text
+def classify(query: str) -> str:
+    if SHORT_LINK_REGEX.match(query):
+        return "short"
+    if URL_REGEX.match(query):
+        return "url"
+    if VIDEO_ID_REGEX.match(query):
+        return "id"
+    return "text"
+
+
+# Links are case-sensitive (video ids), so only free text is lowercased.
+# Video links lose playlist and other parameters: Lavalink loads watch?v=X&list=Y as a playlist
+def normalize(query: str) -> str:
+    query = " ".join(query.split())
+    kind = classify(query)
+    if kind == "short":
+        return "https://www.youtube.com/watch?v=" + SHORT_LINK_REGEX.match(query).group(1)
+    if kind == "url":
+        match = WATCH_LINK_REGEX.match(query)
+        return "https://www.youtube.com/watch?v=" + match.group(1) if match else query
+    if kind == "id":
+        return "https://www.youtube.com/watch?v=" + query
+    return query.lower()
+
+
+async def search(query: str) -> wavelink.YouTubeTrack:
+    key = normalize(query)
+    track = cache.get(key)
+    if track is not None:
+        stats["hits"] += 1
+        return track
+
+    task = in_flight.get(key)
+    if task is not None:
+        stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    stats["misses"] += 1
+    task = in_flight[key] = asyncio.ensure_future(fetch(key, query))
+    # Shielded, so cancelled caller does not cancel search for the others
+    return await asyncio.shield(task)
+
+
+async def fetch(key: str, query: str) -> wavelink.YouTubeTrack:
+    try:
+        track = await resolve(query)
+        cache[key] = track
+        # Autocomplete suggestions are given by link, so picked suggestion is found in cache too
+        if track.uri:
+            cache[normalize(track.uri)] = track
+        Suggestions.add(track)
+        return track
+    finally:
+        in_flight.pop(key, None)
+
+
+# Links and video IDs are loaded directly, only free text goes through YouTube search
+async def resolve(query: str) -> wavelink.YouTubeTrack:
+    query = " ".join(query.split())
+    kind = classify(query)
+    if kind != "text":
+        stats["direct"] += 1
+        tracks = await Nodes.best().get_tracks(wavelink.YouTubeTrack, normalize(query))
+        if tracks:
+            return tracks[0]
+        if kind != "id":
+            raise LookupError(f"Nothing was found by link: {query}")
+        # Text which only looks like video ID is searched as usual
+
+    stats["text"] += 1
+    return await wavelink.YouTubeTrack.search(query=query, node=Nodes.best(), return_first=True)
+
+
+def get_stats() -> dict:
+    total = stats["hits"] + stats["misses"]
+    return {
+        **stats,
+        "size": len(cache),
+        "in_flight": len(in_flight),
+        "max_size": cache.maxsize,
+        "hit_rate": round(stats["hits"] / total * 100, 1) if total else 0
+    }
+
+
+def clear():
+    cache.clear()
+    for name in stats:
+        stats[name] = 0
@@ -0,0 +1,277 @@
+"""Persistent snapshot of players, so playback continues after restart or redeploy.
+Changes are appended to the log (Config.Music.snapshot_path) as JSON lines: queue changes
+one by one as they happen, player state (track, position, volume...) every
+Config.Music.snapshot_interval seconds. When the log grows too big it is compacted
+to the current state of every guild. All disk work is done in executor."""
+
+import discord, wavelink, asyncio, atexit, json, os, threading, time, Config
+from Utils.Bot import Logger
+from Utils.Music import Nodes, Queue, State, Timers
+
+# Records which were not written yet
+pending = []
+# Guild ID -> last written player state, only changed states are written
+states = {}
+# Guild ID -> watched queue
+queues = {}
+lock = threading.Lock()
+# Size of the log after the last compaction
+compacted = {"size": 0}
+
+stats = {
+    "writes": 0,
+    "records": 0,
+    "compactions": 0,
+    "restored": 0
+}
+
+
+def record(guild_id: int, op: str, **values):
+    pending.append(json.dumps({"op": op, "guild": guild_id, **values}, ensure_ascii=False))
+
+
+# Queue changes are written as they are, so the log doesn't grow with the queue size
+def on_change(guild_id: int, op: str, *args):
+    if op == "put":
+        record(guild_id, "put", index=args[0], entry=args[1].dump())
+    elif op == "delete":
+        record(guild_id, "delete", index=args[0])
+    elif op == "move":
+        record(guild_id, "move", index=args[0], new_index=args[1])
+    elif op == "drop":
+        record(guild_id, "drop", count=args[0])
+    elif op == "reset":
+        queue = queues.get(guild_id)
+        record(guild_id, "queue", entries=[entry.dump() for entry in queue] if queue is not None else [])
+
+
+# The whole queue is written once, then only its changes
+def watch(player: wavelink.Player):
+    queue = player.queue
+    if queue.listener is not None:
+        return
+    guild_id = player.guild.id
+    queues[guild_id] = queue
+    queue.listener = lambda *change: on_change(guild_id, *change)
+    record(guild_id, "queue", entries=[entry.dump() for entry in queue])
+
+
+def get_state(player: wavelink.Player):
+    state = State.of(player)
+    track = player.track
+    return {
+        "channel": player.channel.id,
+        "channel_id": state.channel_id,
+        "message_id": state.message_id,
+        "user_name": state.user_name,
+        "track": Queue.Entry.from_track(track).dump() if track is not None else None,
+        "position": round(Nodes.get_position(player), 1) if track is not None else 0,
+        "volume": player.volume,
+        "paused": player.is_paused(),
+        "loop": state.loop,
+        "language": state.language,
+        "notifications_level": state.notifications_level
+    }
+
+
+# Writes state of every player which has changed and forgets guilds without player.
+# Nothing is captured while the bot is closing, so players are restored after restart
+def capture(bot: discord.Bot):
+    if bot.is_closed():
+        return
+
+    players = {player.guild.id: player for node in Nodes.get_nodes() for player in node.players}
+    for guild_id, player in players.items():
+        watch(player)
+        state = get_state(player)
+        if states.get(guild_id) != state:
+            states[guild_id] = state
+            record(guild_id, "player", time=time.time(), **state)
+
+    for guild_id in set(states) - set(players):
+        states.pop(guild_id, None)
+        queue = queues.pop(guild_id, None)
+        if queue is not None:
+            queue.listener = None
+        record(guild_id, "forget")
+
+
+def take_pending() -> list:
+    global pending
+    records, pending = pending, []
+    return records
+
+
+def apply(guilds: dict, data: dict):
+    guild_id = data.get("guild")
+    op = data.get("op")
+    if op == "forget":
+        guilds.pop(guild_id, None)
+        return
+
+    guild = guilds.setdefault(guild_id, {"player": None, "queue": []})
+    queue = guild["queue"]
+    if op == "player":
+        guild["player"] = data
+    elif op == "queue":
+        guild["queue"] = data["entries"]
+    elif op == "put":
+        if data["index"] is None:
+            queue.append(data["entry"])
+        else:
+            queue.insert(data["index"], data["entry"])
+    elif op == "delete":
+        if queue:
+            del queue[data["index"]]
+    elif op == "move":
+        queue.insert(data["new_index"], queue.pop(data["index"]))
+    elif op == "drop":
+        del queue[:data["count"]]
+
+
+# Blocking, run it in executor. Returns {guild_id: {"player": dict, "queue": list}}
+def load(path: str) -> dict:
+    guilds = {}
+    if not os.path.exists(path):
+        return guilds
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                apply(guilds, json.loads(line))
+            except (ValueError, KeyError, IndexError):
+                # The last line may be cut if the process was killed while writing
+                continue
+    return guilds
+
+
+# Blocking, run it in executor. The log is replaced atomically
+def compact(path: str):
+    guilds = load(path)
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        for guild_id, guild in guilds.items():
+            file.write(json.dumps({"op": "queue", "guild": guild_id, "entries": guild["queue"]}, ensure_ascii=False) + "\n")
+            if guild["player"] is not None:
+                file.write(json.dumps(guild["player"], ensure_ascii=False) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    compacted["size"] = os.path.getsize(path)
+    stats["compactions"] += 1
+
+
+# Blocking, run it in executor.
+def write(records: list):
+    path = Config.Music.snapshot_path()
+    with lock:
+        try:
+            if records:
+                with open(path, "a", encoding="utf-8") as file:
+                    file.write("\n".join(records) + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+                stats["writes"] += 1
+                stats["records"] += len(records)
+
+            if os.path.exists(path) and os.path.getsize(path) > max(Config.Music.snapshot_compact_size(), compacted["size"] * 2):
+                compact(path)
+        except OSError as error:
+            Logger.log("MUSIC", "ERROR", f"Failed to write players snapshot: {error}")
+
+
+def flush():
+    write(take_pending())
+
+
+async def run(bot: discord.Bot):
+    atexit.register(flush)
+    while not bot.is_closed():
+        await asyncio.sleep(Config.Music.snapshot_interval())
+        try:
+            capture(bot)
+            await bot.loop.run_in_executor(None, write, take_pending())
+        except Exception as error:
+            Logger.log("MUSIC", "ERROR", f"Failed to capture players snapshot: {error}")
+            Logger.log_traceback()
+
+
+# Rejoins voice channels from the snapshot and continues playback from the saved position.
+# {setup(player, message)} restores player message and its view
+async def restore(bot: discord.Bot, setup) -> int:
+    try:
+        guilds = await bot.loop.run_in_executor(None, load, Config.Music.snapshot_path())
+    except OSError as error:
+        Logger.log("MUSIC", "ERROR", f"Failed to load players snapshot: {error}")
+        return 0
+
+    restored = 0
+    for guild_id, saved in guilds.items():
+        state = saved["player"]
+        if state is None or time.time() - state["time"] > Config.Music.snapshot_max_age():
+            record(guild_id, "forget")
+            continue
+        try:
+            if await restore_player(bot, guild_id, state, saved["queue"], setup):
+                restored += 1
+                continue
+        except Exception as error:
+            Logger.log("MUSIC", "ERROR", f"Failed to restore player of guild {guild_id}: {error}", guild_id=guild_id)
+            Logger.log_traceback()
+            guild = bot.get_guild(guild_id)
+            if guild is not None and guild.voice_client is not None:
+                try:
+                    await guild.voice_client.disconnect(force=True)
+                except Exception:
+                    pass
+
+        # Player is gone for good, it's removed from the log with the next write
+        record(guild_id, "forget")
+
+    stats["restored"] += restored
+    Logger.log("MUSIC", "INFO", f"Restored {restored} players of {len(guilds)} from the snapshot.")
+    return restored
+
+
+async def restore_player(bot: discord.Bot, guild_id: int, state: dict, entries: list, setup) -> bool:
+    guild = bot.get_guild(guild_id)
+    channel = guild.get_channel(state["channel"]) if guild is not None else None
+    text_channel = guild.get_channel_or_thread(state["channel_id"]) if guild is not None and state["channel_id"] else None
+    if channel is None or text_channel is None or guild.voice_client is not None:
+        return False
+    if not any(not member.bot for member in channel.members):
+        return False
+
+    # Commands and events need the player message, so player isn't restored without it
+    try:
+        message = await text_channel.fetch_message(state["message_id"])
+    except discord.HTTPException:
+        return False
+
+    vc: wavelink.Player = await channel.connect(cls=Nodes.player())
+    await guild.change_voice_state(channel=channel, self_deaf=True, self_mute=False)
+    State.hydrate(guild_id, state)
+    for entry in entries:
+        vc.queue.put(Queue.Entry(*entry))
+
+    await setup(vc, message)
+    if state["track"] is not None:
+        track = Queue.Entry(*state["track"]).hydrate()
+        await vc.play(track, start=int(state["position"] * 1000), volume=state["volume"], pause=state["paused"])
+        if state["paused"]:
+            Timers.start("inactive", guild_id)
+    elif not vc.queue.is_empty:
+        await vc.play(Queue.hydrate(vc.queue.get()), volume=state["volume"])
+    else:
+        await vc.set_volume(state["volume"])
+    return True
+
+
+def get_stats() -> dict:
+    path = Config.Music.snapshot_path()
+    return {
+        **stats,
+        "players": len(states),
+        "pending": len(pending),
+        "size": os.path.getsize(path) if os.path.exists(path) else 0
+    }
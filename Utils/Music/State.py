@@ -0,0 +1,112 @@
+"""Player settings of every guild (loop, language, notifications, player message).
+Only IDs and plain values are kept, so nothing from Discord cache is held by the state.
+State is created with the player, evicted when the player is destroyed and guilds
+which stayed idle for Config.Music.state_idle_time are evicted by sweep()."""
+
+import discord, wavelink, time, Config
+
+
+class GuildPlayerState():
+    __slots__ = (
+        "guild_id", "channel_id", "message_id", "user_name",
+        "loop", "language", "notifications_level", "last_active"
+    )
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        # Text channel and ID of the player message
+        self.channel_id = None
+        self.message_id = None
+        # Name of the user who started the last track, shown in the player message
+        self.user_name = None
+        self.loop = False
+        self.language = None
+        self.notifications_level = 2
+        self.last_active = time.monotonic()
+
+    def set_message(self, message: discord.Message):
+        self.channel_id = message.channel.id
+        self.message_id = message.id
+
+    def has_message(self) -> bool:
+        return self.message_id is not None
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+
+# Guild ID -> GuildPlayerState
+states = {}
+
+stats = {
+    "created": 0,
+    "evicted": 0,
+    "idle_evicted": 0
+}
+
+
+# Returns state of the guild, new one is created with default values if there is no state yet
+def get(guild_id: int) -> GuildPlayerState:
+    state = states.get(guild_id)
+    if state is None:
+        state = states[guild_id] = GuildPlayerState(guild_id)
+        stats["created"] += 1
+    return state
+
+
+def of(player: wavelink.Player) -> GuildPlayerState:
+    return get(player.guild.id)
+
+
+# Fills state when the player is started by a command. Settings of existing state are kept
+def create(player: wavelink.Player, user_name: str, language: str) -> GuildPlayerState:
+    state = of(player)
+    state.user_name = user_name
+    if state.language is None:
+        state.language = language
+    state.touch()
+    return state
+
+
+# Fills state from saved values (players snapshot)
+def hydrate(guild_id: int, values: dict) -> GuildPlayerState:
+    state = get(guild_id)
+    for name in ("channel_id", "message_id", "user_name", "loop", "language", "notifications_level"):
+        if name in values:
+            setattr(state, name, values[name])
+    state.touch()
+    return state
+
+
+# Player message without fetching it, it can be edited right away. None if there is no message
+def message(player: wavelink.Player):
+    state = states.get(player.guild.id)
+    if state is None or state.message_id is None:
+        return None
+    channel = player.guild.get_channel_or_thread(state.channel_id)
+    if channel is None:
+        return None
+    return channel.get_partial_message(state.message_id)
+
+
+def evict(guild_id: int):
+    if states.pop(guild_id, None) is not None:
+        stats["evicted"] += 1
+
+
+# Evicts states of guilds which have no player and were not active for Config.Music.state_idle_time
+def sweep(bot: discord.Bot):
+    deadline = time.monotonic() - Config.Music.state_idle_time()
+    for guild_id, state in list(states.items()):
+        if state.last_active > deadline:
+            continue
+        guild = bot.get_guild(guild_id)
+        if guild is not None and guild.voice_client is not None:
+            state.touch()
+            continue
+        del states[guild_id]
+        stats["idle_evicted"] += 1
+
+
+def get_stats() -> dict:
+    return {**stats, "guilds": len(states)}
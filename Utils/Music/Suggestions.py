@@ -0,0 +1,84 @@
+"""Suggestions for the song option of /music play. Titles of recently resolved tracks
+and of tracks played in the guild are kept in a sorted prefix index, so suggestions are
+answered from memory without requests to Lavalink."""
+
+import discord, wavelink, bisect, collections, Config
+
+
+# Titles of recently resolved tracks by link (oldest first)
+titles = collections.OrderedDict()
+
+# Sorted (key, link) pairs. Every title has a key for each word it contains,
+# so a title can be found by the beginning of any of its words
+keys = []
+
+# Recently played tracks (link, title) by guild ID
+guilds = {}
+
+# Discord doesn't accept more choices and longer names and values
+MAX_CHOICES = 25
+MAX_LENGTH = 100
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def keys_of(title: str) -> set:
+    words = normalize(title).split()
+    return {" ".join(words[index:]) for index in range(len(words))}
+
+
+def add(track: wavelink.Track, guild_id: int = None):
+    uri, title = track.uri, track.title
+    if not uri or not title or len(uri) > MAX_LENGTH:
+        return
+
+    if uri in titles:
+        titles.move_to_end(uri)
+    else:
+        titles[uri] = title
+        for key in keys_of(title):
+            bisect.insort(keys, (key, uri))
+        if len(titles) > Config.Music.suggestions_size():
+            remove(*titles.popitem(last=False))
+
+    if guild_id is not None:
+        played = guilds.get(guild_id)
+        if played is None:
+            played = guilds[guild_id] = collections.deque(maxlen=Config.Music.history_size())
+        if (uri, title) in played:
+            played.remove((uri, title))
+        played.append((uri, title))
+
+
+def remove(uri: str, title: str):
+    for key in keys_of(title):
+        index = bisect.bisect_left(keys, (key, uri))
+        if index < len(keys) and keys[index] == (key, uri):
+            del keys[index]
+
+
+def matches(title: str, prefix: str) -> bool:
+    return any(key.startswith(prefix) for key in keys_of(title))
+
+
+# Tracks played in the guild go first (newest first), then other tracks in alphabetical order
+def suggest(guild_id: int, text: str) -> list:
+    prefix = normalize(text or "")
+    choices = {}
+
+    for uri, title in reversed(guilds.get(guild_id, ())):
+        if not prefix or matches(title, prefix):
+            choices.setdefault(uri, title)
+
+    index = bisect.bisect_left(keys, (prefix, ""))
+    while len(choices) < MAX_CHOICES and index < len(keys) and keys[index][0].startswith(prefix):
+        uri = keys[index][1]
+        choices.setdefault(uri, titles[uri])
+        index += 1
+
+    return [
+        discord.OptionChoice(name=title[:MAX_LENGTH], value=uri)
+        for uri, title in list(choices.items())[:MAX_CHOICES]
+    ]
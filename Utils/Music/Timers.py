@@ -0,0 +1,92 @@
+"""Deadlines of all guilds (idle player, empty voice channel, long pause) in one heap,
+driven by a single task. When a deadline is reached "music_timeout" event is dispatched
+with the kind of the deadline and guild ID. Deadlines can be cancelled or moved at any time."""
+
+import discord, asyncio, heapq, itertools, time, Config
+
+
+# Delay (in seconds) of every kind of deadline
+delays = {
+    "idle": lambda: Config.Music.idle_timeout(),
+    "empty": lambda: Config.Music.empty_channel_timeout(),
+    "inactive": lambda: Config.Music.inactivity_timeout(),
+    "sweep": lambda: Config.Music.state_sweep_interval()
+}
+
+# (deadline, sequence, kind, guild ID). Cancelled and moved deadlines stay here until popped
+heap = []
+# (kind, guild ID) -> sequence of the actual heap entry
+active = {}
+sequence = itertools.count()
+wakeup = asyncio.Event()
+
+stats = {
+    "started": 0,
+    "cancelled": 0,
+    "fired": 0
+}
+
+
+# Starts the deadline, or moves it if it's already started
+def start(kind: str, guild_id: int, delay: float = None):
+    deadline = time.monotonic() + (delays[kind]() if delay is None else delay)
+    number = next(sequence)
+    active[(kind, guild_id)] = number
+    heapq.heappush(heap, (deadline, number, kind, guild_id))
+    stats["started"] += 1
+
+    # Heap is rebuilt when most of it are cancelled deadlines
+    if len(heap) > 64 and len(heap) > len(active) * 4:
+        compact()
+    if heap[0][1] == number:
+        wakeup.set()
+
+
+def cancel(kind: str, guild_id: int) -> bool:
+    if active.pop((kind, guild_id), None) is None:
+        return False
+    stats["cancelled"] += 1
+    return True
+
+
+def forget(guild_id: int):
+    for kind in delays:
+        cancel(kind, guild_id)
+
+
+def compact():
+    global heap
+    heap = [entry for entry in heap if active.get((entry[2], entry[3])) == entry[1]]
+    heapq.heapify(heap)
+
+
+# Seconds left until the deadline, or None if it isn't started
+def remaining(kind: str, guild_id: int):
+    number = active.get((kind, guild_id))
+    if number is None:
+        return None
+    for deadline, entry_number, _, _ in heap:
+        if entry_number == number:
+            return max(0, deadline - time.monotonic())
+
+
+async def run(bot: discord.Bot):
+    while not bot.is_closed():
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            _, number, kind, guild_id = heapq.heappop(heap)
+            if active.get((kind, guild_id)) != number:
+                continue
+            del active[(kind, guild_id)]
+            stats["fired"] += 1
+            bot.dispatch("music_timeout", kind, guild_id)
+
+        wakeup.clear()
+        try:
+            await asyncio.wait_for(wakeup.wait(), heap[0][0] - now if heap else None)
+        except asyncio.TimeoutError:
+            pass
+
+
+def get_stats() -> dict:
+    return {**stats, "active": len(active), "heap": len(heap)}
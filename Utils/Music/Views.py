@@ -1,23 +1,39 @@
 """All Functions and modals for Music module."""
 
 import discord, wavelink
-from discord.ext import commands
 from discord.ui import InputText, Modal
 
 from Data.Localizations import Embeds
 from Utils.Bot import Logger, Functions
+from Utils.Music import Search, Prefetch, History, Bulk, Queue, State, Timers, Edits, Mailbox
 
 
 def action_log(r: discord.Interaction, action: str):
-    Logger.log("MUSIC", "INTERACTION", f'User {r.user.name} ({r.user.id}) {action}. Guild ID - {r.guild.id}')
+    Logger.log(
+        "MUSIC", "INTERACTION", f'User {r.user.name} ({r.user.id}) {action}. Guild ID - {r.guild.id}',
+        guild_id=r.guild.id, user_id=r.user.id, command=action, latency=Functions.get_latency(r.created_at)
+    )
+
+
+# Disconnects the player and forgets everything kept for its guild. Every stop of the player goes through it
+async def teardown(vc: wavelink.Player):
+    guild_id = vc.guild.id
+    vc.cleanup()
+    await vc.disconnect()
+    Prefetch.forget(guild_id)
+    History.forget(guild_id)
+    Timers.forget(guild_id)
+    State.evict(guild_id)
+    view = players.pop(guild_id, None)
+    if view is not None:
+        # Player.stop is the stop button, so View.stop is called directly
+        discord.ui.View.stop(view)
 
 
 class SongModal(Modal):
-    def __init__(self, bot, ctx: commands.Context, vc: wavelink.Player, msg: discord.Message, language: str) -> None:
+    def __init__(self, bot, vc: wavelink.Player, language: str) -> None:
         self.bot = bot
-        self.ctx = ctx
         self.vc = vc
-        self.msg = msg
         super().__init__(
             title="Добавить песню в очередь" if language == "ru" else "Add track to the queue"
         )
@@ -26,24 +42,40 @@ class SongModal(Modal):
             InputText(
                 label="Трек" if language == "ru" else "Song",
                 placeholder="Ссылка или название трека (YouTube)." if language == "ru" else "Song link or YouTube url.",
-                style=discord.InputTextStyle.short,
+                style=discord.InputTextStyle.long,
             )
         )
+    async def add_many(self, r: discord.Interaction, vc: wavelink.Player, query: str):
+        language = Functions.get_locale(self.bot, r)
+
+        async def start(track: wavelink.YouTubeTrack):
+            await vc.play(track)
+            Edits.edit(State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, track, State.of(vc).user_name))
+
+        message = await r.followup.send(
+            embed=Embeds.Music.import_progress(language, len(Bulk.split(query)), 0, 0, 0, 0), ephemeral=State.of(vc).notifications_level != 2, wait=True
+        )
+        await Bulk.run(vc, query, message, language, start)
+
     async def callback(self, r: discord.Interaction):
         try:
             vc: wavelink.Player = r.guild.voice_client
-            if vc.notifications_level == 2:
+            if State.of(vc).notifications_level == 2:
                 await r.response.defer()
             else:
                 await r.response.defer(ephemeral=True)
                 
-            if vc.queue.count > 24:
+            if Queue.is_full(vc):
                 return await r.followup.send(
-                    embed=Embeds.Music.premium_queue_is_full(Functions.get_locale(self.bot, r))
+                    embed=Embeds.Music.queue_is_full(Functions.get_locale(self.bot, r))
                 )
 
+            query = self.children[0].value
+            if Bulk.is_bulk(query):
+                return await self.add_many(r, vc, query)
+
             try:
-                song = await wavelink.YouTubeTrack.search(query=self.children[0].value, return_first=True)
+                song = await Search.search(query)
             except:
                 return await r.followup.send(
                     embed=Embeds.Music.song_not_found(Functions.get_locale(self.bot, r))
@@ -54,10 +86,18 @@ class SongModal(Modal):
                     embed=Embeds.Music.song_is_too_long(Functions.get_locale(self.bot, r))
                 )
 
-            if vc.queue.is_empty and not vc.is_playing():
-                await vc.play(song)
-                await self.msg.edit(embed=Embeds.Music.music_player_connected(vc.language, song, self.ctx))
-                if vc.notifications_level == 2:
+            # Track is searched outside of the guild mailbox, only the player change waits for its turn
+            async with Mailbox.hold(r.guild.id):
+                started = vc.queue.is_empty and not vc.is_playing()
+                if started:
+                    await vc.play(song)
+                else:
+                    await vc.queue.put_wait(song)
+                    Prefetch.schedule(vc)
+
+            if started:
+                Edits.edit(State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, State.of(vc).user_name))
+                if State.of(vc).notifications_level == 2:
                     return await r.followup.send(
                         embed=Embeds.Music.track_added_to_play(Functions.get_locale(self.bot, r), r, song)
                         )
@@ -66,8 +106,7 @@ class SongModal(Modal):
                         embed=Embeds.Music.self_track_added_to_play(Functions.get_locale(self.bot, r), r, song), ephemeral=True
                         )
             else:
-                await vc.queue.put_wait(song)
-                if vc.notifications_level == 2:
+                if State.of(vc).notifications_level == 2:
                     return await r.followup.send(
                         embed=Embeds.Music.track_added(Functions.get_locale(self.bot, r), r, song)
                         )
@@ -77,7 +116,7 @@ class SongModal(Modal):
                     )
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on track add (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on track add (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
             return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
@@ -85,9 +124,8 @@ class SongModal(Modal):
 
 
 class SoundModal(Modal):
-    def __init__(self, bot, ctx: commands.Context, vc: wavelink.Player, language: str) -> None:
+    def __init__(self, bot, vc: wavelink.Player, language: str) -> None:
         self.bot = bot
-        self.ctx = ctx
         self.vc = vc
         super().__init__(
             title="Изменить уровень громкости" if language == "ru" else "Change player volume"
@@ -100,108 +138,110 @@ class SoundModal(Modal):
                 style=discord.InputTextStyle.short,
             )
         )
+
     async def callback(self, r: discord.Interaction):
         try:
+            await r.response.defer()
             vc: wavelink.Player = r.guild.voice_client
             volume = self.children[0].value
 
             if volume.isdigit() is False:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.invalid_volume(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
 
             if 0 <= int(volume) <= 200:
-                await vc.set_volume(int(volume))
-                if vc.notifications_level == 2:
-                    return await r.response.send_message(
+                async with Mailbox.hold(r.guild.id):
+                    await vc.set_volume(int(volume))
+                if State.of(vc).notifications_level == 2:
+                    return await r.followup.send(
                         embed=Embeds.Music.volume_set(Functions.get_locale(self.bot, r), r, volume)
                     )
                 else:
-                    return await r.response.send_message(
+                    return await r.followup.send(
                         embed=Embeds.Music.self_volume_set(Functions.get_locale(self.bot, r), volume), ephemeral=True
                     )
             else:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.invalid_volume(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on volume change (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on volume change (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
-            return await r.response.send_message(
+            return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
 
+# Guild ID -> player view of the guild, stopped on teardown
+players = {}
+
+
+# Only the guild ID is kept: the player, its message and the user are taken from State.of(vc)
 class Player(discord.ui.View):
-    def __init__(self, bot, ctx: commands.Context, msg: discord.Message, player: wavelink.Player):
+    def __init__(self, bot, player: wavelink.Player):
         self.bot = bot
-        self.ctx: commands.Context = ctx
-        self.msg: discord.Message = msg
-        self.player: wavelink.Player = player
+        self.guild_id: int = player.guild.id
         super().__init__(timeout=None)
 
+        previous = players.get(self.guild_id)
+        if previous is not None:
+            discord.ui.View.stop(previous)
+        players[self.guild_id] = self
+
     @discord.ui.button(emoji="<:av_previous:1028326288424964208>", style=discord.ButtonStyle.gray, custom_id="av_previous", row=0)
     async def previous(self, button: discord.Button, r: discord.Interaction):
         action_log(r, "played previous song")
         try:
+            await r.response.defer()
             if not r.guild.voice_client:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.voice_client_not_connected(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             elif not getattr(r.user.voice, "channel", None):
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             else:
                 vc: wavelink.Player = r.guild.voice_client
             
-            if vc.previous_track is not None:
-                if vc.loop:
-                    vc.loop = False
-                    for b in self.children:
-                        if b.custom_id == "av_loop":
-                            b.style = discord.ButtonStyle.gray
-                            b.emoji = "<:av_loop:1028326291843338300>"
-
-                track = await wavelink.YouTubeTrack.search(query=vc.track.title, return_first=True)
-                previous_track = await wavelink.YouTubeTrack.search(query=vc.previous_track.title, return_first=True)
-
-                vc.queue.put_at_front(track)
-                vc.queue.put_at_front(previous_track)
-
-                vc.previous_track = None
-
-                postition = int(vc.track.length) * 10000
-                await vc.seek(position=postition)
-
-                if vc.notifications_level == 2:
-                    await self.msg.edit(
-                        embed=Embeds.Music.music_player_connected(vc.language, previous_track, self.ctx), view=self
-                    )
-                    await r.response.send_message(
-                        embed=Embeds.Music.returned(Functions.get_locale(self.bot, r), r, False)
-                    )
-                elif vc.notifications_level == 1:
-                    await self.msg.edit(
-                        embed=Embeds.Music.music_player_connected(vc.language, previous_track, self.ctx), view=self
-                    )
-                    await r.response.send_message(
-                        embed=Embeds.Music.returned(Functions.get_locale(self.bot, r), r, True), ephemeral=True
+            # Arguments of the reply, it is sent after the turn is released
+            answer = None
+            async with Mailbox.hold(r.guild.id):
+                if History.size(r.guild.id) > 0:
+                    if State.of(vc).loop:
+                        State.of(vc).loop = False
+                        for b in self.children:
+                            if b.custom_id == "av_loop":
+                                b.style = discord.ButtonStyle.gray
+                                b.emoji = "<:av_loop:1028326291843338300>"
+
+                    previous_track = await History.go_back(vc)
+
+                    if vc.track is not None:
+                        postition = int(vc.track.length) * 10000
+                        await vc.seek(position=postition)
+                    else:
+                        await vc.play(previous_track)
+
+                    Edits.edit(
+                        State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, previous_track, State.of(vc).user_name), view=self
                     )
+                    if State.of(vc).notifications_level == 2:
+                        answer = dict(embed=Embeds.Music.returned(Functions.get_locale(self.bot, r), r, False))
+                    elif State.of(vc).notifications_level == 1:
+                        answer = dict(embed=Embeds.Music.returned(Functions.get_locale(self.bot, r), r, True), ephemeral=True)
                 else:
-                    return await r.response.edit_message(
-                        embed=Embeds.Music.music_player_connected(vc.language, previous_track, self.ctx), view=self
-                    )
-            else:
-                return await r.response.send_message(
-                    embed=Embeds.Music.previous_track_is_none(Functions.get_locale(self.bot, r)), ephemeral=True
-                )
+                    answer = dict(embed=Embeds.Music.previous_track_is_none(Functions.get_locale(self.bot, r)), ephemeral=True)
+
+            if answer is not None:
+                return await r.followup.send(**answer)
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on previous track play (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on previous track play (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
-            return await r.response.send_message(
+            return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
@@ -209,58 +249,50 @@ class Player(discord.ui.View):
     async def pause(self, button: discord.Button, r: discord.Interaction):
         action_log(r, "paused player playback")
         try:
+            await r.response.defer()
             if not r.guild.voice_client:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             elif not getattr(r.user.voice, "channel", None):
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             else:
-                vc: wavelink.Player = self.ctx.voice_client
-
-            if vc.is_playing() is False: return await r.response.send_message(
-                embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, r)), ephemeral=True
-            )
+                vc: wavelink.Player = r.guild.voice_client
 
-            if vc.is_paused() == False:
-                button.emoji = "<:ari_paused:963563984181661696>"
-                button.style = discord.ButtonStyle.blurple
-                await vc.pause()
-                if vc.notifications_level == 2:
-                    await self.msg.edit(view=self)
-                    return await r.response.send_message(
-                        embed=Embeds.Music.paused(Functions.get_locale(self.bot, r), r, False), delete_after=10
-                    )
-                elif vc.notifications_level == 1:
-                    await self.msg.edit(view=self)
-                    return await r.response.send_message(
-                        embed=Embeds.Music.paused(Functions.get_locale(self.bot, r), r, True), ephemeral=True
-                    )
+            answer = None
+            async with Mailbox.hold(r.guild.id):
+                if vc.is_playing() is False:
+                    answer = dict(embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, r)), ephemeral=True)
+                elif vc.is_paused() == False:
+                    button.emoji = "<:ari_paused:963563984181661696>"
+                    button.style = discord.ButtonStyle.blurple
+                    await vc.pause()
+                    Timers.start("inactive", r.guild.id)
+                    Edits.edit(State.message(vc), view=self)
+                    if State.of(vc).notifications_level == 2:
+                        answer = dict(embed=Embeds.Music.paused(Functions.get_locale(self.bot, r), r, False), delete_after=10)
+                    elif State.of(vc).notifications_level == 1:
+                        answer = dict(embed=Embeds.Music.paused(Functions.get_locale(self.bot, r), r, True), ephemeral=True)
                 else:
-                    return await r.response.edit_message(view=self)
-            else:
-                button.emoji = "<:av_pause:1028328245227180142>"
-                button.style = discord.ButtonStyle.gray
-                await vc.resume()
-                if vc.notifications_level == 2:
-                    await self.msg.edit(view=self)
-                    return await r.response.send_message(
-                        embed=Embeds.Music.resumed(Functions.get_locale(self.bot, r), r, False), delete_after=10
-                    )
-                elif vc.notifications_level == 1:
-                    await self.msg.edit(view=self)
-                    return await r.response.send_message(
-                        embed=Embeds.Music.resumed(Functions.get_locale(self.bot, r), r, True), ephemeral=True
-                    )
-                else:
-                    return await r.response.edit_message(view=self)
+                    button.emoji = "<:av_pause:1028328245227180142>"
+                    button.style = discord.ButtonStyle.gray
+                    await vc.resume()
+                    Timers.cancel("inactive", r.guild.id)
+                    Edits.edit(State.message(vc), view=self)
+                    if State.of(vc).notifications_level == 2:
+                        answer = dict(embed=Embeds.Music.resumed(Functions.get_locale(self.bot, r), r, False), delete_after=10)
+                    elif State.of(vc).notifications_level == 1:
+                        answer = dict(embed=Embeds.Music.resumed(Functions.get_locale(self.bot, r), r, True), ephemeral=True)
+
+            if answer is not None:
+                return await r.followup.send(**answer)
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on track pause (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on track pause (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
-            return await r.response.send_message(
+            return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
@@ -268,59 +300,49 @@ class Player(discord.ui.View):
     async def next_song(self, button: discord.Button, r: discord.Interaction):
         action_log(r, "played next track")
         try:
+            await r.response.defer()
             if not r.guild.voice_client:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.voice_client_not_connected(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             elif not getattr(r.user.voice, "channel", None):
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             else:
                 vc: wavelink.Player = r.guild.voice_client
             
-            if vc.queue.is_empty:
-                return await r.response.send_message(
-                    embed=Embeds.Music.queue_is_empty(Functions.get_locale(self.bot, r)), ephemeral=True
-                )
-            
-            if vc.loop:
-                vc.loop = False
-                for b in self.children:
-                    if b.custom_id == "av_loop":
-                        b.style = discord.ButtonStyle.gray
-                        b.emoji = "<:av_loop:1028326291843338300>"
-
-            track = vc.track
-            vc.previous_track = track
-            
-            postition = int(vc.track.length) * 10000
-            await vc.seek(position=postition)
-            song = vc.track
+            answer = None
+            async with Mailbox.hold(r.guild.id):
+                if vc.queue.is_empty:
+                    answer = dict(embed=Embeds.Music.queue_is_empty(Functions.get_locale(self.bot, r)), ephemeral=True)
+                else:
+                    if State.of(vc).loop:
+                        State.of(vc).loop = False
+                        for b in self.children:
+                            if b.custom_id == "av_loop":
+                                b.style = discord.ButtonStyle.gray
+                                b.emoji = "<:av_loop:1028326291843338300>"
+
+                    postition = int(vc.track.length) * 10000
+                    await vc.seek(position=postition)
+                    song = vc.track
+
+                    Edits.edit(
+                        State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, State.of(vc).user_name), view=self
+                    )
+                    if State.of(vc).notifications_level == 2:
+                        answer = dict(embed=Embeds.Music.skipped(Functions.get_locale(self.bot, r), r, False))
+                    elif State.of(vc).notifications_level == 1:
+                        answer = dict(embed=Embeds.Music.skipped(Functions.get_locale(self.bot, r), r, True), ephemeral=True)
 
-            if vc.notifications_level == 2:
-                await self.msg.edit(
-                    embed=Embeds.Music.music_player_connected(vc.language, song, self.ctx), view=self
-                )
-                await r.response.send_message(
-                    embed=Embeds.Music.skipped(Functions.get_locale(self.bot, r), r, False)
-                )
-            elif vc.notifications_level == 1:
-                await self.msg.edit(
-                    embed=Embeds.Music.music_player_connected(vc.language, song, self.ctx), view=self
-                )
-                await r.response.send_message(
-                    embed=Embeds.Music.skipped(Functions.get_locale(self.bot, r), r, True), ephemeral=True
-                )
-            else:
-                return await r.response.edit_message(
-                    embed=Embeds.Music.music_player_connected(vc.language, song, self.ctx), view=self
-                )
+            if answer is not None:
+                return await r.followup.send(**answer)
         
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on track skip (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on track skip (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
-            return await r.response.send_message(
+            return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
@@ -328,22 +350,30 @@ class Player(discord.ui.View):
     async def stop(self, button: discord.Button, r: discord.Interaction):
         action_log(r, "stopped player")
         try:
+            await r.response.defer()
             if not r.guild.voice_client:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.stop_not_connected(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             elif not getattr(r.user.voice, "channel", None):
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             else:
                 vc: wavelink.Player = r.guild.voice_client
             
-            await vc.stop()
-            vc.cleanup()
-            await vc.disconnect()
+            async with Mailbox.hold(r.guild.id):
+                message = State.message(vc)
+                await vc.stop()
+                await teardown(vc)
 
-            mes = await self.ctx.fetch_message(self.msg.id)
+            # Channel of the player message is gone, there is nothing to disable
+            if message is None:
+                return await r.followup.send(
+                    embed=Embeds.Music.stopped(Functions.get_locale(self.bot, r), r)
+                )
+
+            mes = await message.fetch()
 
             for b in self.children:
                 b.disabled = True
@@ -355,15 +385,15 @@ class Player(discord.ui.View):
             embed_to_dict["color"] = 0xdd5f65
             embed = discord.Embed.from_dict(embed_to_dict)
 
-            await self.msg.edit(embed=embed, view=self)
-            return await r.response.send_message(
+            Edits.edit(message, embed=embed, view=self)
+            return await r.followup.send(
                 embed=Embeds.Music.stopped(Functions.get_locale(self.bot, r), r)
             )
         
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on player stop (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on player stop (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
-            return await r.response.send_message(
+            return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
@@ -382,10 +412,10 @@ class Player(discord.ui.View):
             else:
                 vc: wavelink.Player = r.guild.voice_client
 
-            await r.response.send_modal(SongModal(self.bot, self.ctx, vc, self.msg, Functions.get_locale(self.bot, r)))
+            await r.response.send_modal(SongModal(self.bot, vc, Functions.get_locale(self.bot, r)))
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on add track to the queue (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on add track to the queue (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
             return await r.response.send_message(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
@@ -395,34 +425,37 @@ class Player(discord.ui.View):
     async def replay(self, button: discord.Button, r: discord.Interaction):
         action_log(r, "replayed track")
         try:
+            await r.response.defer()
             if not r.guild.voice_client:
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             elif not getattr(r.user.voice, "channel", None):
-                return await r.response.send_message(
+                return await r.followup.send(
                     embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, r)), ephemeral=True
                 )
             else:
                 vc: wavelink.Player = r.guild.voice_client
 
-            if vc.is_playing() is False: return await r.response.send_message(embed=Embeds.Music.loop_nothing_playing(Functions.get_locale(self.bot, r)), ephemeral=True)
-            
-            await vc.seek(0)
-            if vc.notifications_level == 2:
-                return await r.response.send_message(
-                    embed=Embeds.Music.replay(Functions.get_locale(self.bot, r), r, False), delete_after=10
-                )
-            elif vc.notifications_level == 1:
-                return await r.response.send_message(
-                    embed=Embeds.Music.replay(Functions.get_locale(self.bot, r), r, True), ephemeral=True
-                )
-            else:
-                return await r.response.edit_message(view=self)
+            answer = None
+            async with Mailbox.hold(r.guild.id):
+                if vc.is_playing() is False:
+                    answer = dict(embed=Embeds.Music.loop_nothing_playing(Functions.get_locale(self.bot, r)), ephemeral=True)
+                else:
+                    await vc.seek(0)
+                    if State.of(vc).notifications_level == 2:
+                        answer = dict(embed=Embeds.Music.replay(Functions.get_locale(self.bot, r), r, False), delete_after=10)
+                    elif State.of(vc).notifications_level == 1:
+                        answer = dict(embed=Embeds.Music.replay(Functions.get_locale(self.bot, r), r, True), ephemeral=True)
+                    else:
+                        Edits.edit(State.message(vc), view=self)
+
+            if answer is not None:
+                return await r.followup.send(**answer)
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on track replay (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on track replay (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
-            return await r.response.send_message(
+            return await r.followup.send(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
@@ -445,36 +478,34 @@ class Player(discord.ui.View):
                 embed=Embeds.Music.loop_nothing_playing(Functions.get_locale(self.bot, r)), ephemeral=True
             )
 
-            if not hasattr(vc, "loop"):
-                setattr(vc, "loop", False)
 
-            if vc.loop == False:
-                vc.loop = True
+            if State.of(vc).loop == False:
+                State.of(vc).loop = True
                 button.emoji = "<:ari_loop_white:963565579749425202>"
                 button.style = discord.ButtonStyle.blurple
-                if vc.notifications_level == 2:
-                    await self.msg.edit(view=self)
+                if State.of(vc).notifications_level == 2:
+                    Edits.edit(State.message(vc), view=self)
                     return await r.response.send_message(
                         embed=Embeds.Music.loop_enabled(Functions.get_locale(self.bot, r), r, False), delete_after=10
                     )
-                elif vc.notifications_level == 1:
-                    await self.msg.edit(view=self)
+                elif State.of(vc).notifications_level == 1:
+                    Edits.edit(State.message(vc), view=self)
                     return await r.response.send_message(
                         embed=Embeds.Music.loop_enabled(Functions.get_locale(self.bot, r), r, True), ephemeral=True
                     )
                 else:
                     return await r.response.edit_message(view=self)
             else:
-                vc.loop = False
+                State.of(vc).loop = False
                 button.emoji = "<:av_loop:1028326291843338300>"
                 button.style = discord.ButtonStyle.gray
-                if vc.notifications_level == 2:
-                    await self.msg.edit(view=self)
+                if State.of(vc).notifications_level == 2:
+                    Edits.edit(State.message(vc), view=self)
                     await r.response.send_message(
                         embed=Embeds.Music.loop_disabled(Functions.get_locale(self.bot, r), r, False), delete_after=10
                     )
-                elif vc.notifications_level == 1:
-                    await self.msg.edit(view=self)
+                elif State.of(vc).notifications_level == 1:
+                    Edits.edit(State.message(vc), view=self)
                     await r.response.send_message(
                         embed=Embeds.Music.loop_disabled(Functions.get_locale(self.bot, r), r, True), ephemeral=True
                     )
@@ -482,7 +513,7 @@ class Player(discord.ui.View):
                     return await r.response.edit_message(view=self)
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on track loop (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on track loop (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
             return await r.response.send_message(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
@@ -513,7 +544,7 @@ class Player(discord.ui.View):
             )
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on track queue view (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on track queue view (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
             return await r.response.send_message(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
@@ -534,10 +565,10 @@ class Player(discord.ui.View):
             else:
                 vc: wavelink.Player = r.guild.voice_client
             
-            await r.response.send_modal(SoundModal(self.bot, self.ctx, vc, Functions.get_locale(self.bot, r)))
+            await r.response.send_modal(SoundModal(self.bot, vc, Functions.get_locale(self.bot, r)))
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on player volume change (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on player volume change (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
             return await r.response.send_message(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
@@ -558,36 +589,33 @@ class Player(discord.ui.View):
             else:
                 vc: wavelink.Player = r.guild.voice_client
 
-            if not hasattr(vc, "notifications_level"):
-                setattr(vc, "notifications_level", 2)
-
-            if vc.notifications_level == 2:
-                vc.notifications_level = 0
+            if State.of(vc).notifications_level == 2:
+                State.of(vc).notifications_level = 0
                 button.style = discord.ButtonStyle.red
                 button.emoji = "<:ari_notifications_off:964415669582069770>"
-                await self.msg.edit(view=self)
+                Edits.edit(State.message(vc), view=self)
                 await r.response.send_message(
                     embed=Embeds.Music.notifications(Functions.get_locale(self.bot, r), r, 0)
                 )
-            elif vc.notifications_level == 1:
-                vc.notifications_level = 2
+            elif State.of(vc).notifications_level == 1:
+                State.of(vc).notifications_level = 2
                 button.style = discord.ButtonStyle.gray
                 button.emoji = "<:av_notifications_on:1028326287091179612>"
-                await self.msg.edit(view=self)
+                Edits.edit(State.message(vc), view=self)
                 await r.response.send_message(
                     embed=Embeds.Music.notifications(Functions.get_locale(self.bot, r), r, 2)
                 )
             else:
-                vc.notifications_level = 1
+                State.of(vc).notifications_level = 1
                 button.style = discord.ButtonStyle.blurple
                 button.emoji = "<:ari_notifications_white:964415669816950794>"
-                await self.msg.edit(view=self)
+                Edits.edit(State.message(vc), view=self)
                 await r.response.send_message(
                     embed=Embeds.Music.notifications(Functions.get_locale(self.bot, r), r, 1)
                 )
 
         except Exception as error:
-            Logger.log("MUSIC", "ERROR", f"Error on player notifications level change (Modal): {error} | Guild ID: {r.guild.id}")
+            Logger.log("MUSIC", "ERROR", f"Error on player notifications level change (Modal): {error} | Guild ID: {r.guild.id}", guild_id=r.guild.id, user_id=r.user.id)
             Logger.log_traceback()
             return await r.response.send_message(
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, r)), ephemeral=True
@@ -1,6 +1,7 @@
 import asyncio
 import discord, os, Config
 from Utils.Bot import Logger
+from Utils.Bot.LocaleStore import LocaleStore
 from datetime import datetime
 from discord.ext import commands
 from cachetools import TTLCache
@@ -14,10 +15,12 @@ bot.remove_command("help")
 
 setattr(bot, "start_time", datetime.now())
 
+Logger.on_ready()
+
 if Config.Bot.language() == "auto":
     setattr(bot, "users_cache", TTLCache(maxsize=Config.Bot.max_cached_users(), ttl=Config.Bot.cache_time()))
-
-Logger.on_ready()
+    setattr(bot, "locale_store", LocaleStore(Config.Bot.locales_db()))
+    bot.loop.create_task(bot.locale_store.run(bot))
 
 for filename in os.listdir('./cogs'):
     if filename.endswith('.py'):
@@ -1,10 +1,13 @@
 """Commands for bot owner only."""
 
 from aioconsole import aexec
+from datetime import datetime
 from discord.ext import commands
-import discord, os, time, sys, io, Config
+import discord, os, time, sys, io, functools, Config
 
 from Utils.DevStuff import Views
+from Utils.Bot import Logger
+from Utils.Music import Search, Prefetch, Nodes, Snapshot, State, Timers, Edits, Mailbox
 
 
 class BotGuild(commands.Cog):
@@ -133,6 +136,216 @@ class BotGuild(commands.Cog):
 
         return await msg.edit(view=Views.EvalView(self.bot, ctx, msg, code_msg, stdout))
 
+    @commands.command(
+        aliases = ["logs"]
+    )
+    @commands.is_owner()
+    async def logs_(self, ctx: commands.Context, *filters: str):
+        if Config.Bot.logs_format() != "json":
+            return await ctx.reply(content="Logs search works only with `json` logs format.", mention_author=False)
+
+        # Filters are "key=value" pairs, since/until are minutes ago
+        values = {}
+        for item in filters:
+            key, _, value = item.partition("=")
+            if key not in ["guild", "user", "since", "until", "limit"] or not value.isdigit():
+                values = None
+                break
+            values[key] = int(value)
+        if not values or not set(values) - {"limit"}:
+            return await ctx.reply(
+                content=f"Usage: `{Config.Bot.prefix()}logs [guild=<id>] [user=<id>] [since=<minutes>] [until=<minutes>] [limit=<amount>]`",
+                mention_author=False
+            )
+
+        search = functools.partial(
+            Logger.search,
+            guild_id = values.get("guild"),
+            user_id = values.get("user"),
+            since = time.time() - values["since"] * 60 if "since" in values else None,
+            until = time.time() - values["until"] * 60 if "until" in values else None,
+            limit = min(max(values.get("limit", 10), 1), 50)
+        )
+
+        start = time.time()
+        found = await self.bot.loop.run_in_executor(None, search)
+
+        text = ""
+        for record in found:
+            line = f"[{datetime.fromtimestamp(record['time']).strftime('%m/%d/%Y, %H:%M:%S')}] [{record['module']}/{record['type']}]: {record['text']}\n"
+            if len(text) + len(line) > 3900:
+                break
+            text += line
+
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title=f"Logs: {' '.join(filters)}",
+            description="```" + (text if text else "Nothing found.") + "```"
+        )
+        embed.set_footer(
+            text=f"{len(found)} records, searched in {str(time.time() - start)[:5]}s"
+        )
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["errors"]
+    )
+    @commands.is_owner()
+    async def errors_(self, ctx: commands.Context, limit: int = 10):
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Top errors"
+        )
+        for fingerprint, entry in Logger.top_errors(min(max(limit, 1), 25)):
+            embed.add_field(
+                name=f"{entry['count']}x {entry['type']} ({fingerprint})",
+                value=f"```{entry['message'][:200] or 'No message.'}```Last: <t:{int(entry['last'])}:R>, first: <t:{int(entry['first'])}:R>",
+                inline=False
+            )
+        if not embed.fields:
+            embed.description = "No errors since the bot start."
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["searchcache"]
+    )
+    @commands.is_owner()
+    async def search_cache(self, ctx: commands.Context, action: str = None):
+        if action == "clear":
+            Search.clear()
+            return await ctx.reply(content="Search cache cleared.", mention_author=False)
+
+        stats = Search.get_stats()
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Search cache",
+            description=(
+                f"```Size: {stats['size']} / {stats['max_size']}\n"
+                f"Hits: {stats['hits']}\n"
+                f"Misses: {stats['misses']}\n"
+                f"Coalesced: {stats['coalesced']} (in flight: {stats['in_flight']})\n"
+                f"Direct loads: {stats['direct']}, text searches: {stats['text']}\n"
+                f"Hit rate: {stats['hit_rate']}%```"
+            )
+        )
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["transitions"]
+    )
+    @commands.is_owner()
+    async def prefetch(self, ctx: commands.Context):
+        stats = Prefetch.get_stats()
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Track transitions",
+            description=(
+                f"```Transitions: {stats['transitions']}\n"
+                f"Average: {stats['average_time']} ms\n"
+                f"Last: {stats['last_time']} ms\n"
+                f"Max: {stats['max_time']} ms\n"
+                f"Prefetched: {stats['prefetched']}\n"
+                f"Unplayable skipped: {stats['unplayable']}```"
+            )
+        )
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["players_log"]
+    )
+    @commands.is_owner()
+    async def snapshot(self, ctx: commands.Context):
+        stats = Snapshot.get_stats()
+        states = State.get_stats()
+        timers = Timers.get_stats()
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Players snapshot",
+            description=(
+                f"```Players: {stats['players']}\n"
+                f"Log size: {round(stats['size'] / 1024, 1)} KB\n"
+                f"Writes: {stats['writes']} ({stats['records']} records, {stats['pending']} pending)\n"
+                f"Compactions: {stats['compactions']}\n"
+                f"Restored on startup: {stats['restored']}\n"
+                f"Guild states: {states['guilds']} (evicted: {states['evicted']}, idle: {states['idle_evicted']})\n"
+                f"Deadlines: {timers['active']} (fired: {timers['fired']}, cancelled: {timers['cancelled']})```"
+            )
+        )
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["player_edits"]
+    )
+    @commands.is_owner()
+    async def edits(self, ctx: commands.Context):
+        stats = Edits.get_stats()
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Player message edits",
+            description=(
+                f"```Requested: {stats['requested']}\n"
+                f"Sent: {stats['sent']}\n"
+                f"Merged: {stats['merged']}\n"
+                f"Skipped (unchanged): {stats['skipped']}\n"
+                f"Failed: {stats['failed']}\n"
+                f"Pending: {stats['pending']}```"
+            )
+        )
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["player_mailbox"]
+    )
+    @commands.is_owner()
+    async def mailbox(self, ctx: commands.Context):
+        stats = Mailbox.get_stats()
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Player mailboxes",
+            description=(
+                f"```Active guilds: {stats['guilds']}\n"
+                f"Queued operations: {stats['queued']} (max depth: {stats['max_depth']})\n"
+                f"Processed: {stats['processed']} of {stats['submitted']} (cancelled: {stats['cancelled']})\n"
+                f"Wait time: {stats['average_wait']}ms average, {stats['max_wait']}ms max```"
+            )
+        )
+        return await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(
+        aliases = ["lavalink"]
+    )
+    @commands.is_owner()
+    async def nodes(self, ctx: commands.Context):
+        embed = discord.Embed(
+            color=discord.Color.embed_background("dark"),
+            title="Lavalink nodes"
+        )
+        for node in Nodes.get_metrics():
+            embed.add_field(
+                name=f"{node['identifier']} ({'connected' if node['connected'] else 'disconnected'})",
+                value=(
+                    f"```Players: {node['players']} (playing: {node['playing']})\n"
+                    f"CPU: {node['cpu']}%\n"
+                    f"Frames deficit: {node['frames_deficit']}, nulled: {node['frames_nulled']}\n"
+                    f"Penalty: {node['penalty']}```"
+                ),
+                inline=False
+            )
+        for recovery in Nodes.get_recoveries()[-5:]:
+            embed.add_field(
+                name=f"Recovery of {recovery['identifier']}",
+                value=(
+                    f"<t:{int(recovery['time'])}:R>"
+                    f"```Moved players: {recovery['migrated']}/{recovery['players']}\n"
+                    f"Migration: {recovery['migration_time']} ms\n"
+                    f"Reconnect: {recovery['reconnect_time']} s```"
+                ),
+                inline=False
+            )
+        if not Nodes.get_nodes():
+            embed.description = "No nodes configured."
+        return await ctx.reply(embed=embed, mention_author=False)
+
 
 def setup(bot):
     bot.add_cog(BotGuild(bot))
@@ -2,16 +2,22 @@ from discord.ext import commands
 import discord, wavelink, asyncio, Config
 from discord.commands import SlashCommandGroup, option
 
-from Utils.Music import Views
+from Utils.Music import Views, Search, Prefetch, History, Bulk, Suggestions, Nodes, Queue, Snapshot, State, Timers, Edits, Mailbox
 from Data.Localizations import Embeds
 from Utils.Bot import Logger, Functions
 
 
 def command_log(ctx: commands.Context, command: str):
-    Logger.log("MUSIC", "COMMAND", f'User {ctx.author.name} ({ctx.author.id}) used "{command}" command. Guild ID - {ctx.guild.id}')
+    Logger.log(
+        "MUSIC", "COMMAND", f'User {ctx.author.name} ({ctx.author.id}) used "{command}" command. Guild ID - {ctx.guild.id}',
+        guild_id=ctx.guild.id, user_id=ctx.author.id, command=command, latency=Functions.get_latency(ctx.message.created_at)
+    )
     
-def slash_command_log(ctx: commands.Context, command: str):
-    Logger.log("MUSIC", "SLASH-COMMAND", f'User {ctx.author.name} ({ctx.author.id}) used slash command "{command}". Guild ID - {ctx.guild.id}')
+def slash_command_log(ctx: discord.ApplicationContext, command: str):
+    Logger.log(
+        "MUSIC", "SLASH-COMMAND", f'User {ctx.author.name} ({ctx.author.id}) used slash command "{command}". Guild ID - {ctx.guild.id}',
+        guild_id=ctx.guild.id, user_id=ctx.author.id, command=command, latency=Functions.get_latency(ctx.interaction.created_at)
+    )
 
 def command_error_log(ctx: discord.ApplicationContext, error: str, command: str, cmd_type: str):
     if cmd_type == "default":
@@ -20,42 +26,60 @@ def command_error_log(ctx: discord.ApplicationContext, error: str, command: str,
         cmd = "slash command"
         
     if command == "play":
-        Logger.log("MUSIC", "ERROR", f"Error on track play ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on track play ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "replay":
-        Logger.log("MUSIC", "ERROR", f"Error on trach replay ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on trach replay ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "pause":
-        Logger.log("MUSIC", "ERROR", f"Error on player pause ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on player pause ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "resume":
-        Logger.log("MUSIC", "ERROR", f"Error on player resume ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on player resume ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "skip":
-        Logger.log("MUSIC", "ERROR", f"Error on track skip ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on track skip ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "stop":
-        Logger.log("MUSIC", "ERROR", f"Error on player stop ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on player stop ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "previous":
-        Logger.log("MUSIC", "ERROR", f"Error on previous track play ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on previous track play ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "queue":
-        Logger.log("MUSIC", "ERROR", f"Error in queue command ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error in queue command ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "loop":
-        Logger.log("MUSIC", "ERROR", f"Error on track loop ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on track loop ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
     elif command == "volume":
-        Logger.log("MUSIC", "ERROR", f"Error on player volume change ({cmd}): {error} (Guild ID: {ctx.guild.id})")
+        Logger.log("MUSIC", "ERROR", f"Error on player volume change ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
+    elif command == "remove":
+        Logger.log("MUSIC", "ERROR", f"Error on track remove ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
+    elif command == "move":
+        Logger.log("MUSIC", "ERROR", f"Error on track move ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
+    elif command == "jump":
+        Logger.log("MUSIC", "ERROR", f"Error on jump to track ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
+    elif command == "dedupe":
+        Logger.log("MUSIC", "ERROR", f"Error on queue dedupe ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
+    elif command == "shuffle":
+        Logger.log("MUSIC", "ERROR", f"Error on queue shuffle ({cmd}): {error} (Guild ID: {ctx.guild.id})", guild_id=ctx.guild.id, user_id=ctx.author.id, command=command)
+
+
+async def song_autocomplete(ctx: discord.AutocompleteContext):
+    return Suggestions.suggest(ctx.interaction.guild_id, ctx.value)
         
 
 class Music(commands.Cog):
 
     def __init__(self, bot: discord.Bot):
         self.bot = bot
+        bot.loop.create_task(Timers.run(bot))
         bot.loop.create_task(self.node_connect())
 
     async def node_connect(self):
         await self.bot.wait_until_ready()
-        await wavelink.NodePool.create_node(
-            bot = self.bot, 
-            host = Config.Lavalink.host(), 
-            port = Config.Lavalink.port(), 
-            password = Config.Lavalink.password(), 
-            https = True
-        )
+        await Nodes.connect(self.bot)
+        self.bot.loop.create_task(Nodes.monitor(self.bot))
+        await Snapshot.restore(self.bot, self.restore_message)
+        self.bot.loop.create_task(Snapshot.run(self.bot))
+        Timers.start("sweep", 0)
+
+    # Player message of the restored player gets its view back
+    async def restore_message(self, vc: wavelink.Player, msg: discord.Message):
+        State.of(vc).set_message(msg)
+        Edits.edit(msg, view=Views.Player(self.bot, vc))
 
     @commands.Cog.listener()
     async def on_wavelink_node_ready(self, node: wavelink.Node):
@@ -65,32 +89,84 @@ class Music(commands.Cog):
     async def on_wavelink_websocket_closed(self, player: wavelink.Player, reason, code):
         Logger.log("WAVELINK", "WARNING", f"Integration disconnected cause of server error ({code}). Reason: {reason}")
     
+    # Player is destroyed when there are no users in its channel for Config.Music.empty_channel_timeout,
+    # or right away when the bot itself is disconnected (kicked) from the channel
     @commands.Cog.listener()
+    @Mailbox.serial
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
-        try:
-            guild = after.channel.guild
-        except Exception:
-            guild = before.channel.guild
-
-        vc: wavelink.Player = guild.voice_client
-        if before.channel is not None and after.channel is None and guild.voice_client and len(before.channel.members) < 2:
-            vc.cleanup()
-            await vc.disconnect()
-                
-            Logger.log("MUSIC", "INFO", f"All users left VC of guild with ID {member.guild.id}. Bot disconnected.")
+        vc: wavelink.Player = member.guild.voice_client
+        if vc is None:
+            return
 
-            try:
-                await vc.message.edit(
-                    embed=Embeds.Music.channel_is_empty(vc.language or Functions.get_guild_locale(guild)), view=None
-                )
-            except Exception:
+        if member.id == self.bot.user.id:
+            if after.channel is None:
+                Logger.log("MUSIC", "INFO", f"Bot was disconnected from VC of guild with ID {member.guild.id}.", guild_id=member.guild.id)
+                language = State.of(vc).language or Functions.get_guild_locale(member.guild)
+                await self.destroy(vc, Embeds.Music.player_destroyed(language))
+            return
+
+        if member.bot or vc.channel not in (before.channel, after.channel):
+            return
+
+        if any(not user.bot for user in vc.channel.members):
+            Timers.cancel("empty", member.guild.id)
+        else:
+            Timers.start("empty", member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_music_timeout(self, kind: str, guild_id: int):
+        if kind == "sweep":
+            State.sweep(self.bot)
+            return Timers.start("sweep", 0)
+        await Mailbox.run(guild_id, self.timeout, kind, guild_id)
+
+    async def timeout(self, kind: str, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        vc: wavelink.Player = guild.voice_client if guild is not None else None
+        if vc is None:
+            return
+
+        try:
+            language = State.of(vc).language or Functions.get_guild_locale(guild)
+            if kind == "empty":
+                if any(not user.bot for user in vc.channel.members):
+                    return
+                Logger.log("MUSIC", "INFO", f"All users left VC of guild with ID {guild_id}. Bot disconnected.")
+                embed = Embeds.Music.channel_is_empty(language)
+            elif kind == "idle":
+                if not vc.queue.is_empty or vc.is_playing() is not False:
+                    return
+                embed = Embeds.Music.player_destroyed(language)
+            elif kind == "inactive":
+                if not vc.is_paused():
+                    return
+                embed = Embeds.Music.player_destroyed(language)
+            else:
                 return
+
+            await self.destroy(vc, embed)
+        except Exception as error:
+            Logger.log("MUSIC", "ERROR", f"Error on {kind} timeout: {error} (Guild ID: {guild_id})", guild_id=guild_id)
+            Logger.log_traceback()
+
+    async def destroy(self, vc: wavelink.Player, embed: discord.Embed):
+        message = State.message(vc)
+        await Views.teardown(vc)
+        Edits.edit(message, embed=embed, view=None)
             
     @commands.Cog.listener()
+    async def on_wavelink_track_start(self, player: wavelink.Player, track: wavelink.Track):
+        Timers.cancel("idle", player.guild.id)
+        Prefetch.transition_finished(player.guild.id)
+        Prefetch.schedule(player)
+        Suggestions.add(track, player.guild.id)
+
+    @commands.Cog.listener()
+    @Mailbox.serial
     async def on_wavelink_track_end(self, player: wavelink.Player, track: wavelink.Track, reason):
         try:
-            ctx = player.ctx
-            vc: wavelink.Player = ctx.guild.voice_client
+            guild = player.guild
+            vc: wavelink.Player = guild.voice_client
 
             if vc is None:
                 return
@@ -98,33 +174,50 @@ class Music(commands.Cog):
             if vc.is_playing() is True:
                 return
 
-            if vc.loop:
+            state = State.of(vc)
+            state.touch()
+            Prefetch.transition_started(guild.id)
+            if state.loop:
                 return await vc.play(track)
 
-            if vc.queue.is_empty:
-                await vc.message.edit(
-                    embed=Embeds.Music.player_waiting(vc.language or Functions.get_guild_locale(ctx.guild), ctx, Config.Bot.prefix(), self.bot)
-                )
-                await asyncio.sleep(30)
-                if not vc.queue.is_empty or vc.is_playing() is not False:
-                    return
+            History.push(guild.id, track)
+            next_song = None
+            while next_song is None and not vc.queue.is_empty:
+                next_song = Prefetch.take(vc, vc.queue.get())
 
-                await vc.message.edit(
-                    embed=Embeds.Music.player_destroyed(vc.language or Functions.get_guild_locale(ctx.guild)), view=None
+            if next_song is None:
+                Prefetch.forget(guild.id)
+                Timers.start("idle", guild.id)
+                return Edits.edit(
+                    State.message(vc), embed=Embeds.Music.player_waiting(state.language or Functions.get_guild_locale(guild), state.user_name, Config.Bot.prefix(), self.bot)
                 )
-                vc.cleanup()
-                return await vc.disconnect()
             
-            vc.previous_track = track
-            next_song = vc.queue.get()
-
             await vc.play(next_song)
-            await vc.message.edit(embed=Embeds.Music.music_player_connected(vc.language or Functions.get_guild_locale(ctx.guild), next_song, ctx))
+            Edits.edit(State.message(vc), embed=Embeds.Music.music_player_connected(state.language or Functions.get_guild_locale(guild), next_song, state.user_name))
 
         except Exception as error:
             Logger.log("WAVELINK", "ERROR", f"Error in on_wavelink_track_end event: {error}")
             Logger.log_traceback()
 
+    # Import of playlist or list of queries. {send} sends message to the channel of the command.
+    # It runs outside of the guild mailbox, only the inserts of found tracks wait for their turn
+    async def play_many(self, ctx: commands.Context, vc: wavelink.Player, song: str, send):
+        language = Functions.get_locale(self.bot, ctx)
+        state = State.create(vc, ctx.author.name, language)
+
+        async def start(track: wavelink.YouTubeTrack):
+            await vc.play(track)
+            if state.has_message():
+                return Edits.edit(State.message(vc), embed=Embeds.Music.music_player_connected(state.language, track, ctx.author.name))
+
+            msg = await send(embed=Embeds.Music.music_player_connected(language, track, ctx.author.name))
+            state.set_message(msg)
+            Edits.edit(msg, view=Views.Player(self.bot, vc))
+
+        message = await send(embed=Embeds.Music.import_progress(language, len(Bulk.split(song)), 0, 0, 0, 0))
+        await Bulk.run(vc, song, message, language, start)
+        await ctx.guild.change_voice_state(channel=ctx.author.voice.channel, self_deaf=True, self_mute=False)
+
     @commands.command(
         aliases=["play"]
     )
@@ -143,72 +236,68 @@ class Music(commands.Cog):
                 return await ctx.reply(
                     embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)), mention_author=False
                 )
-            elif not ctx.voice_client:
-                vc: wavelink.Player = await ctx.author.voice.channel.connect(cls=wavelink.Player)
-            else:
-                vc: wavelink.Player = ctx.voice_client
 
-            if vc.queue.count > 24:
+            async with Mailbox.hold(ctx.guild.id):
+                if not ctx.voice_client:
+                    vc: wavelink.Player = await ctx.author.voice.channel.connect(cls=Nodes.player())
+                else:
+                    vc: wavelink.Player = ctx.voice_client
+
+            State.create(vc, ctx.author.name, Functions.get_locale(self.bot, ctx))
+            if Queue.is_full(vc):
                 return await ctx.reply(
-                    embed=Embeds.Music.premium_queue_is_full(Functions.get_locale(self.bot, ctx)), mention_author=False
+                    embed=Embeds.Music.queue_is_full(Functions.get_locale(self.bot, ctx)), mention_author=False
                 )
 
-            if vc.queue.is_empty and not vc.is_playing():
-                if not hasattr(vc, "message_id") or not hasattr(vc, "message"):
-                    try:
-                        song = await wavelink.YouTubeTrack.search(query=song, return_first=True)
-                    except:
-                        return await ctx.reply(
-                            embed=Embeds.Music.song_not_found(Functions.get_locale(self.bot, ctx)), mention_author=False
-                        )
+            if Bulk.is_bulk(song):
+                return await self.play_many(
+                    ctx, vc, song, lambda **kwargs: ctx.reply(mention_author=False, **kwargs)
+                )
+
+            # Track is searched outside of the guild mailbox, only the player change waits for its turn
+            try:
+                song = await Search.search(song)
+            except:
+                return await ctx.reply(
+                    embed=Embeds.Music.song_not_found(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
 
-                    if int(song.duration) > 3600:
-                        return await ctx.send(embed=Embeds.Music.song_is_too_long(Functions.get_locale(self.bot, ctx)))
+            if int(song.duration) > 3600:
+                return await ctx.send(embed=Embeds.Music.song_is_too_long(Functions.get_locale(self.bot, ctx)))
 
+            async with Mailbox.hold(ctx.guild.id):
+                started = vc.queue.is_empty and not vc.is_playing()
+                if started:
                     await vc.play(song)
-                    msg = await ctx.reply(
-                        embed=Embeds.Music.music_player_connected(Functions.get_locale(self.bot, ctx), song, ctx),
-                        mention_author=False
-                    )
+                else:
+                    await vc.queue.put_wait(song)
+                    Prefetch.schedule(vc)
+
+            if not started:
+                return await ctx.reply(
+                    embed=Embeds.Music.track_added_ctx(Functions.get_locale(self.bot, ctx), ctx, song), mention_author=False
+                )
 
-                    setattr(vc, "message_id", msg.id)
-                    setattr(vc, "message", msg)
+            if not State.of(vc).has_message():
+                msg = await ctx.reply(
+                    embed=Embeds.Music.music_player_connected(Functions.get_locale(self.bot, ctx), song, ctx.author.name),
+                    mention_author=False
+                )
 
-                    await msg.edit(
-                        view=Views.Player(self.bot, ctx, msg, vc)
-                    )
-                else:
-                    try:
-                        song = await wavelink.YouTubeTrack.search(query=song, return_first=True)
-                        await vc.message.edit(
-                            embed=Embeds.Music.music_player_connected(vc.language, song, ctx)
-                        )
-                        await ctx.reply(
-                            embed=Embeds.Music.track_added_ctx(Functions.get_locale(self.bot, ctx), ctx, song), mention_author=False
-                        )
-                        await vc.play(song)
-                    except:
-                        return await ctx.reply(
-                            embed=Embeds.Music.song_not_found(Functions.get_locale(self.bot, ctx)), mention_author=False
-                        )
+                State.of(vc).set_message(msg)
 
-                await ctx.guild.change_voice_state(channel=ctx.author.voice.channel, self_deaf=True, self_mute=False)
+                Edits.edit(
+                    msg, view=Views.Player(self.bot, vc)
+                )
             else:
-                song = await wavelink.YouTubeTrack.search(query=song, return_first=True)
-                await vc.queue.put_wait(song)
+                Edits.edit(
+                    State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, ctx.author.name)
+                )
                 await ctx.reply(
                     embed=Embeds.Music.track_added_ctx(Functions.get_locale(self.bot, ctx), ctx, song), mention_author=False
                 )
 
-            vc.ctx = ctx
-            if not hasattr(vc, "loop"):
-                setattr(vc, "loop", False)
-            if not hasattr(vc, "language"):
-                setattr(vc, "language", Functions.get_locale(self.bot, ctx))
-            if not hasattr(vc, "notifications_level"):
-                setattr(vc, "notifications_level", 2)
-            if not hasattr(vc, "previous_track"):
-                setattr(vc, "previous_track", None)
+            await ctx.guild.change_voice_state(channel=ctx.author.voice.channel, self_deaf=True, self_mute=False)
 
         except Exception as error:
             command_error_log(ctx, error, "play", "default")
@@ -238,16 +327,18 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.is_playing() is False:
-                return await ctx.reply(
-                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
-            
-            await vc.seek(0)
-            if vc.notifications_level in [1, 2]:
-                return await ctx.reply(
-                    embed=Embeds.Music.replay_ctx(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            # Reply is sent after the turn of the guild is released
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.is_playing() is False:
+                    answer = Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                else:
+                    await vc.seek(0)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.replay_ctx(Functions.get_locale(self.bot, ctx))
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
             
         except Exception as error:
             command_error_log(ctx, error, "replay", "default")
@@ -277,21 +368,20 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.is_playing() is False: 
-                return await ctx.reply(
-                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.is_playing() is False:
+                    answer = Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                elif vc.is_paused() == False:
+                    await vc.pause()
+                    Timers.start("inactive", ctx.guild.id)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.paused_ctx(Functions.get_locale(self.bot, ctx), ctx, False)
+                else:
+                    answer = Embeds.Music.already_paused(Functions.get_locale(self.bot, ctx))
 
-            if vc.is_paused() == False:
-                await vc.pause()
-                if vc.notifications_level in [1, 2]:
-                    return await ctx.reply(
-                        embed=Embeds.Music.paused_ctx(Functions.get_locale(self.bot, ctx), ctx, False), mention_author=False
-                    )
-            else:
-                return await ctx.reply(
-                    embed=Embeds.Music.already_paused(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
         except Exception as error:
             command_error_log(ctx, error, "pause", "default")
             Logger.log_traceback()
@@ -320,21 +410,20 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.is_playing() is False:
-                return await ctx.reply(
-                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.is_playing() is False:
+                    answer = Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                elif vc.is_paused() == True:
+                    await vc.resume()
+                    Timers.cancel("inactive", ctx.guild.id)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.resumed_ctx(Functions.get_locale(self.bot, ctx), ctx, False)
+                else:
+                    answer = Embeds.Music.already_resumed(Functions.get_locale(self.bot, ctx))
 
-            if vc.is_paused() == True:
-                await vc.resume()
-                if vc.notifications_level in [1, 2]:
-                    return await ctx.reply(
-                        embed=Embeds.Music.resumed_ctx(Functions.get_locale(self.bot, ctx), ctx, False), mention_author=False
-                    )
-            else:
-                return await ctx.reply(
-                    embed=Embeds.Music.already_resumed(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
         except Exception as error:
             command_error_log(ctx, error, "resume", "default")
             Logger.log_traceback()
@@ -363,30 +452,25 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.queue.is_empty:
-                return await ctx.reply(
-                    embed=Embeds.Music.queue_is_empty(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
-            
-            if vc.loop:
-                return await ctx.reply(
-                    embed=Embeds.Music.looped(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
-            
-            track = vc.track
-            vc.previous_track = track
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty(Functions.get_locale(self.bot, ctx))
+                elif State.of(vc).loop:
+                    answer = Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
+                else:
+                    postition = int(vc.track.length) * 10000
+                    await vc.seek(position=postition)
+                    song = vc.track
 
-            postition = int(vc.track.length) * 10000
-            await vc.seek(position=postition)
-            song = vc.track
+                    Edits.edit(
+                        State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, ctx.author.name)
+                    )
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.ctx_skipped(Functions.get_locale(self.bot, ctx))
 
-            await vc.message.edit(
-                embed=Embeds.Music.music_player_connected(vc.language, song, ctx)
-            )
-            if vc.notifications_level in [1, 2]:
-                return await ctx.reply(
-                    embed=Embeds.Music.ctx_skipped(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
 
         except Exception as error:
             command_error_log(ctx, error, "skip", "default")
@@ -416,25 +500,25 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            await vc.stop()
-            vc.cleanup()
-            await vc.disconnect()
+            async with Mailbox.hold(ctx.guild.id):
+                message_id = State.of(vc).message_id
+                await vc.stop()
+                await Views.teardown(vc)
 
             try:
-                message = await ctx.fetch_message(vc.message_id)
+                message = await ctx.fetch_message(message_id)
                 embed_to_dict = message.embeds[0].to_dict()
                 embed_to_dict["color"] = 0xdd5f65
                 embed = discord.Embed.from_dict(embed_to_dict)
 
                 if embed_to_dict["title"] in ["Выберите площадку", "Choose platform"]:
-                    await message.edit(embed=embed, view=None)
+                    Edits.edit(message, embed=embed, view=None)
                 else:
-                    await message.edit(embed=embed, view=Views.DisabledPlayer())
+                    Edits.edit(message, embed=embed, view=Views.DisabledPlayer())
             except:
                 pass
-            return await ctx.reply(embed=Embeds.Music.ctx_stopped(
-                Functions.get_locale(self.bot, ctx), ctx), mention_author=False
-            )
+
+            return await ctx.reply(embed=Embeds.Music.ctx_stopped(Functions.get_locale(self.bot, ctx), ctx), mention_author=False)
 
         except Exception as error:
             command_error_log(ctx, error, "stop", "default")
@@ -447,7 +531,7 @@ class Music(commands.Cog):
         aliases=["previous"]
     )
     @commands.guild_only()
-    async def player_previous(self, ctx: commands.Context):
+    async def player_previous(self, ctx: commands.Context, count: int = 1):
         command_log(ctx, "previous")
         try:
             async with ctx.typing():
@@ -464,34 +548,29 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
                 
-            if vc.loop:
-                return await ctx.reply(
-                    embed=Embeds.Music.looped(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
-
-            if vc.previous_track is not None:
-                track = await wavelink.YouTubeTrack.search(query=vc.track.title, return_first=True)
-                previous_track = await wavelink.YouTubeTrack.search(query=vc.previous_track.title, return_first=True)
-
-                vc.queue.put_at_front(track)
-                vc.queue.put_at_front(previous_track)
-
-                vc.previous_track = None
-
-                postition = int(vc.track.length) * 10000
-                await vc.seek(position=postition)
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if State.of(vc).loop:
+                    answer = Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
+                else:
+                    previous_track = await History.go_back(vc, count)
+                    if previous_track is not None:
+                        if vc.track is not None:
+                            postition = int(vc.track.length) * 10000
+                            await vc.seek(position=postition)
+                        else:
+                            await vc.play(previous_track)
+
+                        Edits.edit(
+                            State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, previous_track, ctx.author.name)
+                        )
+                        if State.of(vc).notifications_level in [1, 2]:
+                            answer = Embeds.Music.returned_ctx(Functions.get_locale(self.bot, ctx))
+                    else:
+                        answer = Embeds.Music.previous_track_is_none(Functions.get_locale(self.bot, ctx))
 
-                await vc.message.edit(
-                    embed=Embeds.Music.music_player_connected(vc.language, previous_track, ctx)
-                )
-                if vc.notifications_level in [1, 2]:
-                    return await ctx.reply(
-                        embed=Embeds.Music.returned_ctx(Functions.get_locale(self.bot, ctx)), mention_author=False
-                    )
-            else:
-                return await ctx.reply(
-                    embed=Embeds.Music.previous_track_is_none(Functions.get_locale(self.bot, ctx)), mention_author=False
-                )
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
 
         except Exception as error:
             command_error_log(ctx, error, "previous", "default")
@@ -526,15 +605,15 @@ class Music(commands.Cog):
                     embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
                 )
 
-            if vc.loop:
-                vc.loop = False
-                if vc.notifications_level in [1, 2]:
+            if State.of(vc).loop:
+                State.of(vc).loop = False
+                if State.of(vc).notifications_level in [1, 2]:
                     return await ctx.reply(
                         embed=Embeds.Music.loop_disabled_ctx(Functions.get_locale(self.bot, ctx)), mention_author=False
                     )
             else:
-                vc.loop = True
-                if vc.notifications_level in [1, 2]:
+                State.of(vc).loop = True
+                if State.of(vc).notifications_level in [1, 2]:
                     return await ctx.reply(
                         embed=Embeds.Music.loop_enabled_ctx(Functions.get_locale(self.bot, ctx)), mention_author=False
                     )
@@ -585,15 +664,152 @@ class Music(commands.Cog):
             )
         
     @commands.command(
-        aliases=["volume"]
+        aliases=["remove"]
     )
     @commands.guild_only()
-    async def player_volume(self, ctx: commands.Context, volume: int = None):
-        command_log(ctx, "volume")
+    async def player_remove(self, ctx: commands.Context, *, track: str = None):
+        command_log(ctx, "remove")
         try:
             async with ctx.typing():
                 await asyncio.sleep(0.1)
-            
+
+            if not ctx.guild.voice_client:
+                return await ctx.reply(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.reply(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                index = vc.queue.find(track) if track else None
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                elif index is None:
+                    answer = Embeds.Music.track_not_in_queue(Functions.get_locale(self.bot, ctx))
+                else:
+                    song = vc.queue.remove(index)
+                    Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.track_removed(Functions.get_locale(self.bot, ctx), song)
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
+
+        except Exception as error:
+            command_error_log(ctx, error, "remove", "default")
+            Logger.log_traceback()
+            return await ctx.reply(
+                embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)), mention_author=False
+            )
+
+    @commands.command(
+        aliases=["move"]
+    )
+    @commands.guild_only()
+    async def player_move(self, ctx: commands.Context, position: int = None, new_position: int = None):
+        command_log(ctx, "move")
+        try:
+            async with ctx.typing():
+                await asyncio.sleep(0.1)
+
+            if not ctx.guild.voice_client:
+                return await ctx.reply(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.reply(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                elif position is None or new_position is None or not (1 <= position <= vc.queue.count) or not (1 <= new_position <= vc.queue.count):
+                    answer = Embeds.Music.invalid_position(Functions.get_locale(self.bot, ctx), vc.queue.count)
+                else:
+                    song = vc.queue.move(position - 1, new_position - 1)
+                    Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.track_moved(Functions.get_locale(self.bot, ctx), song, new_position)
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
+
+        except Exception as error:
+            command_error_log(ctx, error, "move", "default")
+            Logger.log_traceback()
+            return await ctx.reply(
+                embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)), mention_author=False
+            )
+
+    @commands.command(
+        aliases=["jump"]
+    )
+    @commands.guild_only()
+    async def player_jump(self, ctx: commands.Context, position: int = None):
+        command_log(ctx, "jump")
+        try:
+            async with ctx.typing():
+                await asyncio.sleep(0.1)
+
+            if not ctx.guild.voice_client:
+                return await ctx.reply(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.reply(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                elif State.of(vc).loop:
+                    answer = Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
+                elif position is None or not (1 <= position <= vc.queue.count):
+                    answer = Embeds.Music.invalid_position(Functions.get_locale(self.bot, ctx), vc.queue.count)
+                else:
+                    song = vc.queue.jump(position - 1)
+                    postition = int(vc.track.length) * 10000
+                    await vc.seek(position=postition)
+
+                    Edits.edit(
+                        State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, ctx.author.name)
+                    )
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.jumped(Functions.get_locale(self.bot, ctx), song, position - 1)
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
+
+        except Exception as error:
+            command_error_log(ctx, error, "jump", "default")
+            Logger.log_traceback()
+            return await ctx.reply(
+                embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)), mention_author=False
+            )
+
+    @commands.command(
+        aliases=["dedupe"]
+    )
+    @commands.guild_only()
+    async def player_dedupe(self, ctx: commands.Context):
+        command_log(ctx, "dedupe")
+        try:
+            async with ctx.typing():
+                await asyncio.sleep(0.1)
+
             if not ctx.guild.voice_client:
                 return await ctx.reply(
                     embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
@@ -605,16 +821,100 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if not(type(volume) == int) or not(0 <= volume <= 200) or (volume is None):
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                else:
+                    removed = vc.queue.dedupe()
+                    if removed:
+                        Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.queue_deduplicated(Functions.get_locale(self.bot, ctx), removed)
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
+
+        except Exception as error:
+            command_error_log(ctx, error, "dedupe", "default")
+            Logger.log_traceback()
+            return await ctx.reply(
+                embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)), mention_author=False
+            )
+
+    @commands.command(
+        aliases=["shuffle"]
+    )
+    @commands.guild_only()
+    async def player_shuffle(self, ctx: commands.Context):
+        command_log(ctx, "shuffle")
+        try:
+            async with ctx.typing():
+                await asyncio.sleep(0.1)
+
+            if not ctx.guild.voice_client:
+                return await ctx.reply(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
                 return await ctx.reply(
-                    embed=Embeds.Music.invalid_volume(Functions.get_locale(self.bot, ctx)), mention_author=False
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)), mention_author=False
                 )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                else:
+                    vc.queue.shuffle()
+                    Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.queue_shuffled(Functions.get_locale(self.bot, ctx), vc.queue.count)
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
+
+        except Exception as error:
+            command_error_log(ctx, error, "shuffle", "default")
+            Logger.log_traceback()
+            return await ctx.reply(
+                embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)), mention_author=False
+            )
 
-            await vc.set_volume(volume)
-            if vc.notifications_level in [1, 2]:
+    @commands.command(
+        aliases=["volume"]
+    )
+    @commands.guild_only()
+    async def player_volume(self, ctx: commands.Context, volume: int = None):
+        command_log(ctx, "volume")
+        try:
+            async with ctx.typing():
+                await asyncio.sleep(0.1)
+            
+            if not ctx.guild.voice_client:
+                return await ctx.reply(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx)), mention_author=False
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
                 return await ctx.reply(
-                    embed=Embeds.Music.volume_set_ctx(Functions.get_locale(self.bot, ctx), volume), mention_author=False
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)), mention_author=False
                 )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if not(type(volume) == int) or not(0 <= volume <= 200) or (volume is None):
+                    answer = Embeds.Music.invalid_volume(Functions.get_locale(self.bot, ctx))
+                else:
+                    await vc.set_volume(volume)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.volume_set_ctx(Functions.get_locale(self.bot, ctx), volume)
+
+            if answer is not None:
+                return await ctx.reply(embed=answer, mention_author=False)
         
         except Exception as error:
             command_error_log(ctx, error, "volume", "default")
@@ -646,15 +946,16 @@ class Music(commands.Cog):
     )
     @option(
         name="song",
-        description="Name or YouTube url of the song you want to play.",
+        description="Song name or YouTube url (track or playlist). Separate several songs with \";\".",
         name_localizations={
             "ru": "песня"
         },
         description_localizations={
-            "ru": "Название или ссылка (YouTube) на трек, который вы хотите включить."
+            "ru": "Название или ссылка (YouTube) на трек или плейлист. Несколько треков разделяются \";\"."
         },
         min_length=2,
-        max_length=50,
+        max_length=1000,
+        autocomplete=song_autocomplete,
         required=True
     )
     @commands.guild_only()
@@ -669,76 +970,75 @@ class Music(commands.Cog):
 
             if not getattr(ctx.author.voice, "channel", None):
                 return await ctx.followup.send(embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx)))
-            elif not ctx.voice_client:
-                vc: wavelink.Player = await ctx.author.voice.channel.connect(cls=wavelink.Player)
-            else:
-                vc: wavelink.Player = ctx.voice_client
 
-            if vc.queue.count > 24:
+            async with Mailbox.hold(ctx.guild.id):
+                if not ctx.voice_client:
+                    vc: wavelink.Player = await ctx.author.voice.channel.connect(cls=Nodes.player())
+                else:
+                    vc: wavelink.Player = ctx.voice_client
+
+            State.create(vc, ctx.author.name, Functions.get_locale(self.bot, ctx))
+            if Queue.is_full(vc):
                 return await ctx.followup.send(
-                    embed=Embeds.Music.premium_queue_is_full(Functions.get_locale(self.bot, ctx))
+                    embed=Embeds.Music.queue_is_full(Functions.get_locale(self.bot, ctx))
                 )
 
-            if vc.queue.is_empty and not vc.is_playing():
-                if not hasattr(vc, "message_id") and not hasattr(vc, "message"):
-                    try:
-                        song = await wavelink.YouTubeTrack.search(query=song, return_first=True)
-                    except:
-                        return await ctx.followup.send(
-                            embed=Embeds.Music.song_not_found(Functions.get_locale(self.bot, ctx))
-                        )
-
-                    if int(song.duration) > 3600:
-                        return await ctx.followup.send(
-                            embed=Embeds.Music.song_is_too_long(Functions.get_locale(self.bot, ctx))
-                        )
+            if Bulk.is_bulk(song):
+                return await self.play_many(
+                    ctx, vc, song, lambda **kwargs: ctx.followup.send(wait=True, **kwargs)
+                )
 
-                    await vc.play(song)
+            # Track is searched outside of the guild mailbox, only the player change waits for its turn
+            try:
+                song = await Search.search(song)
+            except:
+                if vc.queue.is_empty and not vc.is_playing() and State.of(vc).has_message():
                     msg = await ctx.followup.send(
-                        embed=Embeds.Music.music_player_connected(Functions.get_locale(self.bot, ctx), song, ctx), wait=True
+                        embed=Embeds.Music.choose_platform(Functions.get_locale(self.bot, ctx))
                     )
+                    Edits.edit(msg, view=Views.PlayersMenu(self.bot, ctx, msg, song))
+                    return State.of(vc).set_message(msg)
+                return await ctx.followup.send(
+                    embed=Embeds.Music.song_not_found(Functions.get_locale(self.bot, ctx))
+                )
 
-                    setattr(vc, "message_id", msg.id)
-                    setattr(vc, "message", msg)
+            if int(song.duration) > 3600:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.song_is_too_long(Functions.get_locale(self.bot, ctx))
+                )
 
-                    await msg.edit(
-                        view=Views.Player(self.bot, ctx, msg, vc)
-                    )
+            async with Mailbox.hold(ctx.guild.id):
+                started = vc.queue.is_empty and not vc.is_playing()
+                if started:
+                    await vc.play(song)
                 else:
-                    try:
-                        song = await wavelink.YouTubeTrack.search(query=song, return_first=True)
-                        await vc.message.edit(
-                            embed=Embeds.Music.music_player_connected(vc.language, song, ctx)
-                        )
-                        await ctx.followup.send(
-                            embed=Embeds.Music.track_added_ctx(Functions.get_locale(self.bot, ctx), ctx, song)
-                        )
-                        await vc.play(song)
-                    except:
-                        msg = await ctx.followup.send(
-                            embed=Embeds.Music.choose_platform(Functions.get_locale(self.bot, ctx))
-                        )
-                        await msg.edit(view=Views.PlayersMenu(self.bot, ctx, msg, song))
-                        setattr(vc, "message_id", msg.id)
-                        setattr(vc, "message", msg)
+                    await vc.queue.put_wait(song)
+                    Prefetch.schedule(vc)
+
+            if not started:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.track_added_ctx(Functions.get_locale(self.bot, ctx), ctx, song)
+                )
+
+            if not State.of(vc).has_message():
+                msg = await ctx.followup.send(
+                    embed=Embeds.Music.music_player_connected(Functions.get_locale(self.bot, ctx), song, ctx.author.name), wait=True
+                )
+
+                State.of(vc).set_message(msg)
 
-                await ctx.guild.change_voice_state(channel=ctx.author.voice.channel, self_deaf=True, self_mute=False)
+                Edits.edit(
+                    msg, view=Views.Player(self.bot, vc)
+                )
             else:
-                song = await wavelink.YouTubeTrack.search(query=song, return_first=True)
-                await vc.queue.put_wait(song)
+                Edits.edit(
+                    State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, ctx.author.name)
+                )
                 await ctx.followup.send(
                     embed=Embeds.Music.track_added_ctx(Functions.get_locale(self.bot, ctx), ctx, song)
                 )
 
-            vc.ctx = ctx
-            if not hasattr(vc, "loop"):
-                setattr(vc, "loop", False)
-            if not hasattr(vc, "language"):
-                setattr(vc, "language", Functions.get_locale(self.bot, ctx))
-            if not hasattr(vc, "notifications_level"):
-                setattr(vc, "notifications_level", 2)
-            if not hasattr(vc, "previous_track"):
-                setattr(vc, "previous_track", None)
+            await ctx.guild.change_voice_state(channel=ctx.author.voice.channel, self_deaf=True, self_mute=False)
 
         except Exception as error:
             command_error_log(ctx, error, "play", "slash")
@@ -773,21 +1073,20 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.is_playing() is False: 
-                return await ctx.followup.send(
-                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
-                )
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.is_playing() is False:
+                    answer = Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                elif vc.is_paused() == False:
+                    await vc.pause()
+                    Timers.start("inactive", ctx.guild.id)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.paused_ctx(Functions.get_locale(self.bot, ctx), ctx, False)
+                else:
+                    answer = Embeds.Music.already_paused(Functions.get_locale(self.bot, ctx))
 
-            if vc.is_paused() == False:
-                await vc.pause()
-                if vc.notifications_level in [1, 2]:
-                    return await ctx.followup.send(
-                        embed=Embeds.Music.paused_ctx(Functions.get_locale(self.bot, ctx), ctx, False)
-                    )
-            else:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.already_paused(Functions.get_locale(self.bot, ctx))
-                )
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
         except Exception as error:
             command_error_log(ctx, error, "pause", "slash")
             Logger.log_traceback()
@@ -821,21 +1120,20 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.is_playing() is False:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
-                )
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.is_playing() is False:
+                    answer = Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                elif vc.is_paused() == True:
+                    await vc.resume()
+                    Timers.cancel("inactive", ctx.guild.id)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.resumed_ctx(Functions.get_locale(self.bot, ctx), ctx, False)
+                else:
+                    answer = Embeds.Music.already_resumed(Functions.get_locale(self.bot, ctx))
 
-            if vc.is_paused() == True:
-                await vc.resume()
-                if vc.notifications_level in [1, 2]:
-                    return await ctx.followup.send(
-                        embed=Embeds.Music.resumed_ctx(Functions.get_locale(self.bot, ctx), ctx, False)
-                    )
-            else:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.already_resumed(Functions.get_locale(self.bot, ctx))
-                )
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
         except Exception as error:
             command_error_log(ctx, error, "resume", "slash")
             Logger.log_traceback()
@@ -869,30 +1167,25 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.queue.is_empty:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.queue_is_empty(Functions.get_locale(self.bot, ctx))
-                )
-            
-            if vc.loop:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
-                )
-
-            track = vc.track
-            vc.previous_track = track
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty(Functions.get_locale(self.bot, ctx))
+                elif State.of(vc).loop:
+                    answer = Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
+                else:
+                    postition = int(vc.track.length) * 10000
+                    await vc.seek(position=postition)
+                    song = vc.track
 
-            postition = int(vc.track.length) * 10000
-            await vc.seek(position=postition)
-            song = vc.track
+                    Edits.edit(
+                        State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, ctx.author.name)
+                    )
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.ctx_skipped(Functions.get_locale(self.bot, ctx))
 
-            await vc.message.edit(
-                embed=Embeds.Music.music_player_connected(vc.language, song, ctx)
-            )
-            if vc.notifications_level in [1, 2]:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.ctx_skipped(Functions.get_locale(self.bot, ctx))
-                )
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
 
         except Exception as error:
             command_error_log(ctx, error, "skip", "slash")
@@ -927,25 +1220,25 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            await vc.stop()
-            vc.cleanup()
-            await vc.disconnect()
+            async with Mailbox.hold(ctx.guild.id):
+                message_id = State.of(vc).message_id
+                await vc.stop()
+                await Views.teardown(vc)
 
             try:
-                message = await ctx.fetch_message(vc.message_id)
+                message = await ctx.fetch_message(message_id)
                 embed_to_dict = message.embeds[0].to_dict()
                 embed_to_dict["color"] = 0xdd5f65
                 embed = discord.Embed.from_dict(embed_to_dict)
 
                 if embed_to_dict["title"] in ["Выберите площадку", "Choose platform"]:
-                    await message.edit(embed=embed, view=None)
+                    Edits.edit(message, embed=embed, view=None)
                 else:
-                    await message.edit(embed=embed, view=Views.DisabledPlayer())
+                    Edits.edit(message, embed=embed, view=Views.DisabledPlayer())
             except:
                 pass
-            return await ctx.followup.send(
-                embed=Embeds.Music.ctx_stopped(Functions.get_locale(self.bot, ctx), ctx)
-            )
+
+            return await ctx.followup.send(embed=Embeds.Music.ctx_stopped(Functions.get_locale(self.bot, ctx), ctx))
 
         except Exception as error:
             command_error_log(ctx, error, "stop", "slash")
@@ -954,7 +1247,7 @@ class Music(commands.Cog):
         
     @music.command(
         name="previous",
-        description="Return to the previous track and play it.",
+        description="Return to the previous track (or several tracks back) and play it.",
         name_localizations={
             "ru": "предыдущий"
         },
@@ -962,8 +1255,21 @@ class Music(commands.Cog):
             "ru": "Включить предыдущий трек."
         }
     )
+    @option(
+        name="count",
+        description="How many tracks to go back.",
+        name_localizations={
+            "ru": "количество"
+        },
+        description_localizations={
+            "ru": "На сколько треков вернуться назад."
+        },
+        min_value=1,
+        max_value=Config.Music.history_size(),
+        required=False
+    )
     @commands.guild_only()
-    async def previous(self, ctx: discord.ApplicationContext):
+    async def previous(self, ctx: discord.ApplicationContext, count: int = 1):
         slash_command_log(ctx, "previous")
         await ctx.defer()
         try:
@@ -978,34 +1284,29 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
                 
-            if vc.loop:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
-                )
-
-            if vc.previous_track is not None:
-                track = await wavelink.YouTubeTrack.search(query=vc.track.title, return_first=True)
-                previous_track = await wavelink.YouTubeTrack.search(query=vc.previous_track.title, return_first=True)
-
-                vc.queue.put_at_front(track)
-                vc.queue.put_at_front(previous_track)
-
-                vc.previous_track = None
-
-                postition = int(vc.track.length) * 10000
-                await vc.seek(position=postition)
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if State.of(vc).loop:
+                    answer = Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
+                else:
+                    previous_track = await History.go_back(vc, count)
+                    if previous_track is not None:
+                        if vc.track is not None:
+                            postition = int(vc.track.length) * 10000
+                            await vc.seek(position=postition)
+                        else:
+                            await vc.play(previous_track)
+
+                        Edits.edit(
+                            State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, previous_track, ctx.author.name)
+                        )
+                        if State.of(vc).notifications_level in [1, 2]:
+                            answer = Embeds.Music.returned_ctx(Functions.get_locale(self.bot, ctx))
+                    else:
+                        answer = Embeds.Music.previous_track_is_none(Functions.get_locale(self.bot, ctx))
 
-                await vc.message.edit(
-                    embed=Embeds.Music.music_player_connected(vc.language, previous_track, ctx)
-                )
-                if vc.notifications_level in [1, 2]:
-                    return await ctx.followup.send(
-                        embed=Embeds.Music.returned_ctx(Functions.get_locale(self.bot, ctx))
-                    )
-            else:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.previous_track_is_none(Functions.get_locale(self.bot, ctx))
-                )
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
 
         except Exception as error:
             command_error_log(ctx, error, "previous", "slash")
@@ -1043,15 +1344,15 @@ class Music(commands.Cog):
                     embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
                 )
 
-            if vc.loop:
-                vc.loop = False
-                if vc.notifications_level in [1, 2]:
+            if State.of(vc).loop:
+                State.of(vc).loop = False
+                if State.of(vc).notifications_level in [1, 2]:
                     return await ctx.followup.send(
                         embed=Embeds.Music.loop_disabled_ctx(Functions.get_locale(self.bot, ctx))
                     )
             else:
-                vc.loop = True
-                if vc.notifications_level in [1, 2]:
+                State.of(vc).loop = True
+                if State.of(vc).notifications_level in [1, 2]:
                     return await ctx.followup.send(
                         embed=Embeds.Music.loop_enabled_ctx(Functions.get_locale(self.bot, ctx))
                     )
@@ -1104,6 +1405,289 @@ class Music(commands.Cog):
                 embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx))
             )
         
+    @music.command(
+        name="remove",
+        description="Remove track from the queue by its position or title.",
+        name_localizations={
+            "ru": "удалить"
+        },
+        description_localizations={
+            "ru": "Удалить трек из очереди по номеру или названию."
+        }
+    )
+    @option(
+        name="track",
+        description="Position of the track in the queue or part of its title.",
+        name_localizations={
+            "ru": "трек"
+        },
+        description_localizations={
+            "ru": "Номер трека в очереди или часть его названия."
+        },
+        max_length=100,
+        required=True
+    )
+    @commands.guild_only()
+    async def remove(self, ctx: discord.ApplicationContext, track: str):
+        slash_command_log(ctx, "remove")
+        await ctx.defer()
+        try:
+            if not ctx.guild.voice_client:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.followup.send(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx))
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                index = vc.queue.find(track) if track else None
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                elif index is None:
+                    answer = Embeds.Music.track_not_in_queue(Functions.get_locale(self.bot, ctx))
+                else:
+                    song = vc.queue.remove(index)
+                    Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.track_removed(Functions.get_locale(self.bot, ctx), song)
+
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
+
+        except Exception as error:
+            command_error_log(ctx, error, "remove", "slash")
+            Logger.log_traceback()
+            return await ctx.followup.send(embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)))
+
+    @music.command(
+        name="move",
+        description="Move track to another position in the queue.",
+        name_localizations={
+            "ru": "переместить"
+        },
+        description_localizations={
+            "ru": "Переместить трек на другую позицию в очереди."
+        }
+    )
+    @option(
+        name="position",
+        description="Current position of the track in the queue.",
+        name_localizations={
+            "ru": "позиция"
+        },
+        description_localizations={
+            "ru": "Текущая позиция трека в очереди."
+        },
+        min_value=1,
+        required=True
+    )
+    @option(
+        name="new_position",
+        description="New position of the track in the queue.",
+        name_localizations={
+            "ru": "новая_позиция"
+        },
+        description_localizations={
+            "ru": "Новая позиция трека в очереди."
+        },
+        min_value=1,
+        required=True
+    )
+    @commands.guild_only()
+    async def move(self, ctx: discord.ApplicationContext, position: int, new_position: int):
+        slash_command_log(ctx, "move")
+        await ctx.defer()
+        try:
+            if not ctx.guild.voice_client:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.followup.send(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx))
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                elif position is None or new_position is None or not (1 <= position <= vc.queue.count) or not (1 <= new_position <= vc.queue.count):
+                    answer = Embeds.Music.invalid_position(Functions.get_locale(self.bot, ctx), vc.queue.count)
+                else:
+                    song = vc.queue.move(position - 1, new_position - 1)
+                    Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.track_moved(Functions.get_locale(self.bot, ctx), song, new_position)
+
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
+
+        except Exception as error:
+            command_error_log(ctx, error, "move", "slash")
+            Logger.log_traceback()
+            return await ctx.followup.send(embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)))
+
+    @music.command(
+        name="jump",
+        description="Skip to the track from the queue.",
+        name_localizations={
+            "ru": "перейти"
+        },
+        description_localizations={
+            "ru": "Перейти к треку из очереди."
+        }
+    )
+    @option(
+        name="position",
+        description="Position of the track in the queue.",
+        name_localizations={
+            "ru": "позиция"
+        },
+        description_localizations={
+            "ru": "Позиция трека в очереди."
+        },
+        min_value=1,
+        required=True
+    )
+    @commands.guild_only()
+    async def jump(self, ctx: discord.ApplicationContext, position: int):
+        slash_command_log(ctx, "jump")
+        await ctx.defer()
+        try:
+            if not ctx.guild.voice_client:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.followup.send(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx))
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                elif State.of(vc).loop:
+                    answer = Embeds.Music.looped(Functions.get_locale(self.bot, ctx))
+                elif position is None or not (1 <= position <= vc.queue.count):
+                    answer = Embeds.Music.invalid_position(Functions.get_locale(self.bot, ctx), vc.queue.count)
+                else:
+                    song = vc.queue.jump(position - 1)
+                    postition = int(vc.track.length) * 10000
+                    await vc.seek(position=postition)
+
+                    Edits.edit(
+                        State.message(vc), embed=Embeds.Music.music_player_connected(State.of(vc).language, song, ctx.author.name)
+                    )
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.jumped(Functions.get_locale(self.bot, ctx), song, position - 1)
+
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
+
+        except Exception as error:
+            command_error_log(ctx, error, "jump", "slash")
+            Logger.log_traceback()
+            return await ctx.followup.send(embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)))
+
+    @music.command(
+        name="dedupe",
+        description="Remove repeated tracks from the queue.",
+        name_localizations={
+            "ru": "без_повторов"
+        },
+        description_localizations={
+            "ru": "Удалить повторяющиеся треки из очереди."
+        }
+    )
+    @commands.guild_only()
+    async def dedupe(self, ctx: discord.ApplicationContext):
+        slash_command_log(ctx, "dedupe")
+        await ctx.defer()
+        try:
+            if not ctx.guild.voice_client:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.followup.send(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx))
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                else:
+                    removed = vc.queue.dedupe()
+                    if removed:
+                        Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.queue_deduplicated(Functions.get_locale(self.bot, ctx), removed)
+
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
+
+        except Exception as error:
+            command_error_log(ctx, error, "dedupe", "slash")
+            Logger.log_traceback()
+            return await ctx.followup.send(embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)))
+
+    @music.command(
+        name="shuffle",
+        description="Shuffle the queue.",
+        name_localizations={
+            "ru": "перемешать"
+        },
+        description_localizations={
+            "ru": "Перемешать очередь."
+        }
+    )
+    @commands.guild_only()
+    async def shuffle(self, ctx: discord.ApplicationContext):
+        slash_command_log(ctx, "shuffle")
+        await ctx.defer()
+        try:
+            if not ctx.guild.voice_client:
+                return await ctx.followup.send(
+                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                )
+            elif not getattr(ctx.author.voice, "channel", None):
+                return await ctx.followup.send(
+                    embed=Embeds.Music.join_vc(Functions.get_locale(self.bot, ctx))
+                )
+            else:
+                vc: wavelink.Player = ctx.guild.voice_client
+
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.queue.is_empty:
+                    answer = Embeds.Music.queue_is_empty_(Functions.get_locale(self.bot, ctx))
+                else:
+                    vc.queue.shuffle()
+                    Prefetch.schedule(vc)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.queue_shuffled(Functions.get_locale(self.bot, ctx), vc.queue.count)
+
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
+
+        except Exception as error:
+            command_error_log(ctx, error, "shuffle", "slash")
+            Logger.log_traceback()
+            return await ctx.followup.send(embed=Embeds.Music.error(Functions.get_locale(self.bot, ctx)))
+        
     @music.command(
         name="volume",
         description="Set music player volume (0-200).",
@@ -1143,16 +1727,17 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if not(0 <= volume <= 200):
-                return await ctx.followup.send(
-                    embed=Embeds.Music.invalid_volume(Functions.get_locale(self.bot, ctx))
-                )
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if not(0 <= volume <= 200):
+                    answer = Embeds.Music.invalid_volume(Functions.get_locale(self.bot, ctx))
+                else:
+                    await vc.set_volume(volume)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.volume_set_ctx(Functions.get_locale(self.bot, ctx), volume)
 
-            await vc.set_volume(volume)
-            if vc.notifications_level in [1, 2]:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.volume_set_ctx(Functions.get_locale(self.bot, ctx), volume)
-                )
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
         
         except Exception as error:
             command_error_log(ctx, error, "volume", "slash")
@@ -1185,16 +1770,17 @@ class Music(commands.Cog):
             else:
                 vc: wavelink.Player = ctx.guild.voice_client
 
-            if vc.is_playing() is False:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
-                )
-            
-            await vc.seek(0)
-            if vc.notifications_level in [1, 2]:
-                return await ctx.followup.send(
-                    embed=Embeds.Music.replay_ctx(Functions.get_locale(self.bot, ctx))
-                )
+            answer = None
+            async with Mailbox.hold(ctx.guild.id):
+                if vc.is_playing() is False:
+                    answer = Embeds.Music.nothing_is_playing(Functions.get_locale(self.bot, ctx))
+                else:
+                    await vc.seek(0)
+                    if State.of(vc).notifications_level in [1, 2]:
+                        answer = Embeds.Music.replay_ctx(Functions.get_locale(self.bot, ctx))
+
+            if answer is not None:
+                return await ctx.followup.send(embed=answer)
             
         except Exception as error:
             command_error_log(ctx, error, "replay", "slash")